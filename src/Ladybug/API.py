@@ -36,36 +36,157 @@ __version__ = '0.1'
 #===============================================================================
 # IMPORT
 #===============================================================================
-from ctypes import CDLL, create_string_buffer, POINTER, c_char, c_int, byref, c_uint, c_double, string_at
+from ctypes import CDLL, create_string_buffer, POINTER, c_char, c_int, byref, c_uint, c_double, string_at, cast, c_ubyte
 from PIL import Image
+from numpy import zeros, uint8, uint16, float16, float32, frombuffer, dtype
 import os
+import threading
 from struct import unpack
 from structures import *
 from enums import *
 
 
 
-c = CDLL('ladybug')
+# THE PURE-PYTHON READERS (pgrfile) DO NOT NEED THE DLL
+try:
+    c = CDLL('ladybug')
+except OSError:
+    c = None
+
+# (dtype, channels) OF THE PIXEL FORMATS OF OFF-SCREEN IMAGES
+PROCESSED_PIXEL_FORMATS = {
+    LADYBUG_MONO8:      (uint8, 1),
+    LADYBUG_MONO16:     (uint16, 1),
+    LADYBUG_BGR:        (uint8, 3),
+    LADYBUG_BGRU:       (uint8, 4),
+    LADYBUG_BGR16:      (uint16, 3),
+    LADYBUG_BGRU16:     (uint16, 4),
+    LADYBUG_BGR16F:     (float16, 3),
+    LADYBUG_BGRU16F:    (float16, 4),
+    LADYBUG_BGR32F:     (float32, 3),
+    LADYBUG_BGRU32F:    (float32, 4) }
+
+# BYTES IN ONE FULL RESOLUTION CAMERA IMAGE (BGRU32)
+BGRU32_BUFFER_SIZE = 1616 * 1232 * 4
+
+class BGRU32Buffers:
+    '''(Not from API) One set of six BGRU32 camera image buffers.
+
+    The buffers are slices of one contiguous block, so the whole set can be
+    viewed as one ndarray. The image size and the converted cameras are
+    recorded by LadybugAPI.ConvertToMultipleBGRU32.
+    '''
+    def __init__(self):
+        # ZEROED BY THE OS. PAGES OF CAMERAS THAT ARE NEVER CONVERTED ARE NEVER
+        # TOUCHED AND DO NOT USE PHYSICAL MEMORY.
+        self.block = zeros((6, BGRU32_BUFFER_SIZE), uint8)
+        self.pointers = (POINTER(c_char) * 6)()
+        self.pointers[:] = [cast(self.block.ctypes.data + i*BGRU32_BUFFER_SIZE,
+                                 POINTER(c_char)) for i in xrange(6)]
+        self.imCols, self.imRows = 0, 0
+        self.cameras = () # CAMERAS IN THE LAST CONVERSION
+
+    def masked_pointers(self, cameras):
+        '''Buffer pointers with NULL for the cameras not in *cameras*.'''
+        pointers = (POINTER(c_char) * 6)()
+        for cam in cameras:
+            pointers[cam] = self.pointers[cam]
+        return pointers
+
+    def array(self):
+        '''(6, rows, cols, 4) uint8 view over the buffers (no copy).'''
+        return self.block[:, :self.imCols * self.imRows * 4].reshape(
+                                            6, self.imRows, self.imCols, 4)
+
+
+class BufferPool:
+    '''(Not from API) BGRU32Buffers sets shared by the streams of a process.
+
+    Streams and prefetch slots take a set when they first convert a frame and
+    return it when they are closed. Returned sets are handed to the next
+    stream instead of allocating another 48 MB. Arrays viewing a returned
+    set see the images of its next user.
+
+    :PARAMETERS:
+        **max_free** --- Number of returned sets kept for reuse. Sets returned
+            beyond this are released.
+    '''
+    def __init__(self, max_free=8):
+        self.max_free = max_free
+        self.free = []
+        self.lock = threading.Lock()
+        self.allocated = 0 # SETS IN USE OR FREE
+        self.in_use = 0
+        self.peak_allocated = 0
+        self.peak_in_use = 0
+
+    def acquire(self):
+        '''A buffer set with no converted cameras.'''
+        with self.lock:
+            if self.free:
+                buffers = self.free.pop()
+            else:
+                buffers = BGRU32Buffers()
+                self.allocated += 1
+                self.peak_allocated = max(self.peak_allocated, self.allocated)
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+        buffers.imCols, buffers.imRows = 0, 0
+        buffers.cameras = ()
+        return buffers
+
+    def release(self, buffers):
+        with self.lock:
+            self.in_use -= 1
+            if len(self.free) < self.max_free:
+                self.free.append(buffers)
+            else:
+                self.allocated -= 1
+
+    def stats(self):
+        '''Buffer sets in use and allocated, and their size in bytes now and
+        at the peak.'''
+        set_bytes = 6 * BGRU32_BUFFER_SIZE
+        with self.lock:
+            return dict(in_use=self.in_use, free=len(self.free),
+                        allocated=self.allocated,
+                        peak_in_use=self.peak_in_use,
+                        bytes=self.allocated * set_bytes,
+                        peak_bytes=self.peak_allocated * set_bytes)
+
+# SHARED BY ALL LadybugAPI INSTANCES UNLESS ONE IS GIVEN
+buffer_pool = BufferPool()
+
 
 class LadybugAPI:
     """Instantiate with a Ladybug3 stream file. This class maintains the local
-    variables"""
-    def __init__(self, stream_fname):
+    variables
+
+    Only the stream is opened (and its header read) here. The image buffers,
+    the color tile format, the configuration file and the output images are
+    set up when first needed.
+    """
+    def __init__(self, stream_fname, pool=None):
+        if c is None:
+            raise OSError, 'ladybug.dll not found. Use pgrfile.PGRFile without the SDK.'
         # STORE REFERENCE VARIABLES
         self.next_frame = None # INDEX OF NEXT FRAME TO READ
         self.isConfigFileLoaded = False
         self.dirname = os.path.dirname(stream_fname)
         self.ladybugImage = None
         self.total_frames = None
+        self.streamHeader = None
+        self.isColorTileFormatSet = False
+        self.configuredOutputs = 0 # LadybugOutputImage FLAGS
 
         # SET UP INTERNAL ctypes VARIABLES AND pointers
         self.context = c_int()
         self.readContext = create_string_buffer(4)
 
         self.pLadybugImage = create_string_buffer(188)
-        self.pLadybugProcessedImage = create_string_buffer(45)
-        self.arpBGRU32Images = (POINTER(c_char) * 6)()
-        self.arpBGRU32Images[:] = [create_string_buffer(1616 * 1232 * 4) for i in xrange(6)]
+        self.pLadybugProcessedImage = create_string_buffer(LADYBUG_PROCESSED_IMAGE_SIZE)
+        self.pool = pool or buffer_pool
+        self.buffers = None # TAKEN FROM THE POOL ON FIRST USE
         self.pszConfigFileName = os.path.join(self.dirname, 'config.txt')
 
         # RUN INITIAL METHODS FOR SETTING UP READING STREAM
@@ -73,16 +194,49 @@ class LadybugAPI:
         self.CreateStreamContext()
         self.InitializeStreamForReading( stream_fname )
         self.GetStreamNumOfImages()
-        self.SetColorTileFormat( self.GetStreamHeader().stippledFormat )
-        self.LoadConfig()
-        self.ConfigureOutputImages(LADYBUG_PANORAMIC) # MAY NEED TO ADD OTHER TYPES LATER
+        # READ HERE, IT RESETS THE READING POSITION TO THE FIRST IMAGE
+        self.streamHeader = self.GetStreamHeader()
 
     def __del__(self):
+        if c is None: return
+        self.ReleaseBuffers()
         self.StopStream()
         self.DestroyStreamContext()
         self.DestroyContext()
 
 
+    def AcquireBuffers(self):
+        '''(Not from API) The image buffers of this context, taken from the
+        buffer pool on first use.'''
+        if self.buffers is None:
+            self.buffers = self.pool.acquire()
+        return self.buffers
+
+
+    def ReleaseBuffers(self):
+        '''(Not from API) Return the image buffers to the buffer pool.'''
+        if self.buffers is not None:
+            self.pool.release( self.buffers )
+            self.buffers = None
+
+
+    def PrepareConversion(self):
+        '''(Not from API) Set the color tile format of the stream once before
+        the first conversion.'''
+        if self.isColorTileFormatSet: return
+        self.SetColorTileFormat( self.streamHeader.stippledFormat )
+        self.isColorTileFormatSet = True
+
+
+    def PrepareRendering(self, outputs=LADYBUG_PANORAMIC):
+        '''(Not from API) Load the configuration once, and configure the
+        output images before the first rendering call of each output type.'''
+        if self.configuredOutputs & outputs == outputs: return
+        self.LoadConfig()
+        self.configuredOutputs |= outputs
+        self.ConfigureOutputImages(self.configuredOutputs)
+
+
     def CreateContext(self):
         '''Creates a new context for accessing the camera-specific functions of
         the library.
@@ -243,6 +397,7 @@ class LadybugAPI:
         :PRECONDITION: Required calls before this method.
             - Call ladybugLoadConfig()
         '''
+        self.LoadConfig()
         e = c.ladybugSetRectifyResolution(self.context,
                                 c_uint(uiDestCols),
                                 c_uint(uiDestRows),
@@ -260,6 +415,7 @@ class LadybugAPI:
             - ladybugLoadConfig()
             - ladybugSetRectifyResolution()
         '''
+        self.LoadConfig()
         pdRectifiedRow = create_string_buffer(8)
         pdRectifiedCol = create_string_buffer(8)
         e = c.ladybugRectifyPixel(self.context, uiCamera,
@@ -279,6 +435,7 @@ class LadybugAPI:
             ladybugLoadConfig()
             ladybugSetRectifyResolution()
         '''
+        self.LoadConfig()
         pdDistortedRow = create_string_buffer(8)
         pdDistortedCol = create_string_buffer(8)
         e = c.ladybugUnrectifyPixel(self.context, uiCamera,
@@ -310,17 +467,35 @@ class LadybugAPI:
 
 
 
-    def ConvertToMultipleBGRU32(self):
+    def ConvertToMultipleBGRU32(self, buffers=None, cameras=None):
         '''Parses the 6 images in a LadybugImage into 6 BGRU32 buffers.
 
+        The API skips cameras whose destination buffer is NULL.
+
         :PRECONDITION: Required calls before this method.
             ladybugSetColorProcessingMethod() (OPTIONAL)
-        '''
+
+        :PARAMETERS:
+            **buffers** --- BGRU32Buffers to write to. Default is the buffer
+                set of this class.
+            **cameras** --- Camera units to convert. Default is all six.
+        '''
+        self.PrepareConversion()
+        if buffers is None:
+            buffers = self.AcquireBuffers()
+        if cameras is None:
+            cameras = range(6)
+            pointers = buffers.pointers
+        else:
+            cameras = sorted(set(cameras))
+            pointers = buffers.masked_pointers(cameras)
         e = c.ladybugConvertToMultipleBGRU32(self.context,
                                                 self.pLadybugImage,
-                                                self.arpBGRU32Images,
+                                                pointers,
                                                 None )
         check(e)
+        buffers.imCols, buffers.imRows = self.GetBufferImageSize()
+        buffers.cameras = tuple(cameras)
 
 
 
@@ -332,6 +507,7 @@ class LadybugAPI:
             *filenames* --- A list of six filenames to save each image in camera order.
             **saveformat** --- Save image format. Default is BMP.
         '''
+        self.PrepareConversion()
         arpszFilenames = (POINTER(c_char) * 6)()
         arpszFilenames[:] = [create_string_buffer(each) for each in filenames]
         e = c.ladybugExtractLadybugImageToFilesBGRU32(self.context,
@@ -426,9 +602,10 @@ class LadybugAPI:
 
         :PRECONDITION:
         '''
+        self.PrepareRendering()
         e = c.ladybugUpdateTextures(self.context,
                                        6, # NUMBER OF CAMERAS
-                                       self.arpBGRU32Images ) # POSSIBLE PROBLEM: REQUIRES BGRA
+                                       self.AcquireBuffers().pointers ) # POSSIBLE PROBLEM: REQUIRES BGRA
         check(e)
 
 
@@ -440,6 +617,7 @@ class LadybugAPI:
         :PRECONDITION:
             ladybugSetRectifyResolution()
         '''
+        self.PrepareRendering()
         e = c.ladybugInitializeAlphaMasks(self.context,
                                              self.ladybugImage.uiCols,
                                              self.ladybugImage.uiRows )
@@ -448,6 +626,7 @@ class LadybugAPI:
 
     def SetOffScreenImageSize(self, imageType=LADYBUG_PANORAMIC,
                               uiCols=2048, uiRows=1024 ):
+        self.PrepareRendering(imageType)
         e = c.ladybugSetOffScreenImageSize(self.context,
                                               imageType,
                                               uiCols,
@@ -455,7 +634,7 @@ class LadybugAPI:
         check(e)
 
 
-    def RenderOffScreenImage(self, LadybugOutputImage_selection):
+    def RenderOffScreenImage(self, LadybugOutputImage_selection, asarray=False):
         '''Renders an off-screen image and gets the image from the off-screen
         buffer.
 
@@ -465,17 +644,71 @@ class LadybugAPI:
         :PRECONDITION: Required calls before this method.
             ladybugConfigureOutputImages()
             ladybugSetOffScreenImageSize() (OPTIONAL)
+
+        :PARAMETERS:
+            *LadybugOutputImage_selection* --- One of OFFSCREEN_IMAGE_TYPES.
+            **asarray** --- (Not from API) Return the image as an ndarray
+                view over the rendered pixels (see GetProcessedImageArray).
         '''
+        assert LadybugOutputImage_selection in OFFSCREEN_IMAGE_TYPES, \
+                'render one off-screen image type at a time.'
+        self.PrepareRendering(LadybugOutputImage_selection)
         e = c.ladybugRenderOffScreenImage(self.context,
                                          LadybugOutputImage_selection,
                                          self.pLadybugProcessedImage ) # BUFFER
         check(e)
+        if asarray:
+            return self.GetProcessedImageArray()
+
+
+    def GetProcessedImageArray(self):
+        '''(Not from API) The last off-screen image as an ndarray view over
+        the pixel memory of the SDK (no copy).
+
+        The view is overwritten by the next RenderOffScreenImage call and must
+        not be used after the output images are configured again or the
+        context is destroyed. Copy it to keep it.
+
+        :PRECONDITION:
+            **ladybugRenderOffScreenImage** must be called first.
+
+        :RETURNS:
+            (rows, cols, channels) array in BGR or BGRU order, with the type
+            and channels of the image's pixelFormat (see
+            PROCESSED_PIXEL_FORMATS). Normally 8-bit BGRU.
+        '''
+        info = getLadybugProcessedImage( self.pLadybugProcessedImage )
+        assert info.pData, 'no off-screen image has been rendered.'
+        if info.pixelFormat not in PROCESSED_PIXEL_FORMATS:
+            raise ValueError, 'unsupported off-screen pixel format: 0x{0:X}'.format(info.pixelFormat)
+        pixel_type, channels = PROCESSED_PIXEL_FORMATS[info.pixelFormat]
+        nbytes = info.uiCols * info.uiRows * channels * dtype(pixel_type).itemsize
+        pixels = (c_ubyte * nbytes).from_address( info.pData )
+        # THE ARRAY KEEPS A REFERENCE TO THE ctypes ARRAY, NOT TO THE SDK MEMORY
+        return frombuffer(pixels, pixel_type).reshape(info.uiRows, info.uiCols, channels)
+
+
+    def GetProcessedImage(self):
+        '''(Not from API) Copy of the last off-screen image as a PIL image.
+
+        :PRECONDITION:
+            **ladybugRenderOffScreenImage** must be called first.
+
+        :RETURNS:
+            RGB PIL Image.
+        '''
+        arr = self.GetProcessedImageArray()
+        assert arr.dtype == uint8 and arr.shape[2] in (3, 4), \
+                'only 8-bit BGR and BGRU images convert to PIL.'
+        return Image.frombuffer('RGB', (arr.shape[1], arr.shape[0]), arr,
+                                'raw', 'BGRX' if arr.shape[2] == 4 else 'BGR', 0, 1)
 
 
     def GetImageRenderingInfo(self ):
         '''Returns information about the graphics card and OpenGL implementation.
 
         '''
+        self.PrepareRendering()
         pRenderingInfo = create_string_buffer(4964)
         e = c.ladybugGetImageRenderingInfo(self.context,
                                               pRenderingInfo )
@@ -496,6 +729,7 @@ class LadybugAPI:
 
     def GetCameraUnitExtrinsics(self, uiCamera ):
 
+        self.LoadConfig()
         ardEulerZYX = create_string_buffer(48)
 
         e = c.ladybugGetCameraUnitExtrinsics(self.context, uiCamera,
@@ -511,6 +745,7 @@ class LadybugAPI:
         '''Gets the focal length (in pixels) for the specified camera unit.
 
         '''
+        self.LoadConfig()
         pdFocalLength = create_string_buffer(8)
 
         e = c.ladybugGetCameraUnitFocalLength(self.context,
@@ -525,6 +760,7 @@ class LadybugAPI:
         '''Gets the rectified image center for the specified camera unit.
 
         '''
+        self.LoadConfig()
         pdCenterX = create_string_buffer(8)
         pdCenterY = create_string_buffer(8)
 
@@ -576,6 +812,7 @@ class LadybugAPI:
         uiGridRows = c_uint(24)
         uiSrcCols = c_uint(1616)
         uiSrcRows = c_uint(1232)
+        self.LoadConfig()
         pLadybugImage3d = create_string_buffer(1000)
         e = c.ladybugGet3dMap(self.context, uiCamera,
                                    uiGridCols,
@@ -588,7 +825,7 @@ class LadybugAPI:
         return getLadybugImage3d(pLadybugImage3d)
 
 
-    def GetImageFromBuffer(self, cam ):
+    def GetImageFromBuffer(self, cam, buffers=None ):
         '''(Not from API) Retrieve a single camera's image from the image buffer.
         
         The ladybug class manages the image buffer. Call ladybug.ConvertToMultipleBGRU32
@@ -603,17 +840,41 @@ class LadybugAPI:
         :RETURNS: (Image) A PIL Image class 4-band image.
         '''
         assert cam in range(6)
-        LadybugImage = getLadybugImage( self.pLadybugImage )
-        imCols, imRows = LadybugImage.uiCols, LadybugImage.uiRows
+        if buffers is None:
+            buffers = self.AcquireBuffers()
+
+        # RETURN A PIL IMAGE (ONE DECODE FROM BGRU TO RGBA)
+        return Image.frombuffer('RGBA', (buffers.imCols, buffers.imRows),
+                                buffers.array()[cam], 'raw', 'BGRA', 0, 1)
+
+
+
+    def GetImageArray(self, buffers=None):
+        '''(Not from API) The six camera images as one ndarray.
+
+        The array is a (6, rows, cols, 4) uint8 view over the image buffers in
+        BGRU channel order. Nothing is copied. The contents change with the next
+        call to ConvertToMultipleBGRU32.
+
+        :PRECONDITION:
+            **ladybugConvertToMultipleBGRU32** must be called first.
+        '''
+        if buffers is None:
+            buffers = self.AcquireBuffers()
+        return buffers.array()
+
+
+
+    def GetBufferImageSize(self):
+        '''(Not from API) Columns and rows of the images in the image buffers.
+
+        Images are half size with LADYBUG_DOWNSAMPLE4.
+        '''
+        imCols, imRows = self.ladybugImage.uiCols, self.ladybugImage.uiRows
         if self.GetColorProcessingMethod() == LADYBUG_DOWNSAMPLE4:
             imCols /= 2
             imRows /= 2
-
-        # RETURN A PIL IMAGE
-        b,g,r,a = Image.frombuffer('RGB', (imCols,imRows),
-                                self.arpBGRU32Images[cam][:imCols * imRows * 4],
-                                'raw', 'RGBX', 0, 1).split()
-        return Image.merge("RGBA", (r,g,b,a) )
+        return imCols, imRows
 
 
 
@@ -1,2 +1,4 @@
 from interface import Ladybug3stream
-
+from pgrfile import PGRFile
+from recording import Recording
+from asyncstream import AsyncStream
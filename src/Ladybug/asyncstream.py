@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Non-blocking access to a Ladybug3 stream.
+
+Every Ladybug3stream call blocks the calling thread, although most of the
+time is spent in ladybug.dll, where ctypes releases the GIL. AsyncStream runs
+the calls on one worker thread per stream. Calls return at once with an
+AsyncResult (get(timeout), ready(), wait()) and can also hand the result to a
+callback. The worker is the only thread that uses the stream's SDK context,
+so calls on one stream are serialized and run in the order they were made.
+A server can open one AsyncStream per recording and serve many clients from
+a few threads:
+
+    stream = AsyncStream(fname)
+    info = stream.gps(120)                      # RETURNS AT ONCE
+    stream.image(3, callback=send_to_client)    # RUNS AFTER gps()
+    print info.get()[0].lat
+    for frame, images in stream.frames(range(100, 200), cameras=[0]):
+        ...                                     # NEXT FRAMES ARE READ MEANWHILE
+
+Images are copied on the worker, because the image buffers are overwritten
+by the next load.
+
+:REQUIRES: ladybug.dll (not with backend='pgr')
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 19:10:36 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 19:10:36 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+from collections import deque
+from multiprocessing.pool import ThreadPool
+from interface import Ladybug3stream
+
+
+
+class AsyncStream:
+    '''Runs the calls to one Ladybug3stream on its own worker thread.
+
+    :PARAMETERS:
+        *stream* --- Stream file or recording folder (opened on the worker
+            thread), or an open Ladybug3stream that no other thread uses.
+        **backend** --- Backend for a stream opened by name.
+    '''
+    def __init__(self, stream, backend='sdk'):
+        self.executor = ThreadPool(1)
+        self.owner = isinstance(stream, basestring)
+        if self.owner:
+            stream = self.executor.apply(Ladybug3stream, (stream, backend))
+        self.stream = stream
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def submit(self, func, *args, **kwargs):
+        '''Run func(stream, *args, **kwargs) on the worker.
+
+        :PARAMETERS:
+            **callback** --- Called on the worker's result thread with the
+                return value.
+
+        :RETURNS:
+            AsyncResult of the return value. get() raises the exception of a
+            failed call.
+        '''
+        callback = kwargs.pop('callback', None)
+        return self.executor.apply_async(func, (self.stream,) + args, kwargs,
+                                         callback)
+
+
+    def load(self, frame, cameras=None, callback=None):
+        '''Load a frame (see Ladybug3stream.loadframe).'''
+        return self.submit(_load, frame, cameras, callback=callback)
+
+
+    def image(self, cam, callback=None):
+        '''PIL image of one camera of the loaded frame.'''
+        return self.submit(_image, cam, callback=callback)
+
+
+    def image_array(self, cam=None, rotate=True, order='RGB', callback=None):
+        '''Copy of Ladybug3stream.image_array of the loaded frame.'''
+        return self.submit(_image_array, cam, rotate, order, callback=callback)
+
+
+    def gps(self, frame, callback=None):
+        '''(frameInfo, GPGGA data) of a frame (see getFrameInfo). No images
+        are converted.'''
+        return self.submit(_gps, frame, callback=callback)
+
+
+    def frame(self, frame, cameras=range(6), rotate=True, order='RGB',
+              callback=None):
+        '''Load a frame and copy its images. Result is a dict of camera:
+        ndarray.'''
+        return self.submit(_frame, frame, cameras, rotate, order,
+                           callback=callback)
+
+
+    def frames(self, frames, cameras=range(6), rotate=True, order='RGB',
+               ahead=2):
+        '''Iterator of (frame, images) through *frames*. *ahead* frames are
+        read on the worker while the caller works on the current one.'''
+        pending = deque()
+        frames = iter(frames)
+        for n in frames:
+            pending.append( (n, self.frame(n, cameras, rotate, order)) )
+            if len(pending) > ahead:
+                break
+        while pending:
+            n, result = pending.popleft()
+            for following in frames:
+                pending.append( (following, self.frame(following, cameras,
+                                                       rotate, order)) )
+                break
+            yield n, result.get()
+
+
+    def close(self):
+        '''Finish the submitted calls and close a stream opened by name.'''
+        if self.executor is None:
+            return
+        if self.owner:
+            self.submit(_close).get()
+        self.executor.close()
+        self.executor.join()
+        self.executor = None
+
+
+
+def _close(stream):
+    stream.closeStream()
+
+
+def _load(stream, frame, cameras):
+    return stream.loadframe( frame, cameras=cameras )
+
+
+def _image(stream, cam):
+    return stream.image( cam )
+
+
+def _image_array(stream, cam, rotate, order):
+    return stream.image_array( cam, rotate, order ).copy()
+
+
+def _gps(stream, frame):
+    stream.loadframe( frame, cameras=[] )
+    return stream.getFrameInfo()
+
+
+def _frame(stream, frame, cameras, rotate, order):
+    stream.loadframe( frame, cameras=cameras )
+    return dict((cam, stream.image_array( cam, rotate, order ).copy())
+                for cam in cameras)
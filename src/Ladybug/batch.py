@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Multi-process frame processing for batch export jobs.
+
+Each worker process opens its own decoder (normally a Ladybug3stream with its
+own SDK context) once and then runs a job function on contiguous chunks of
+frames, so every worker reads its part of the stream in sequence order.
+Results come back in frame order.
+
+Job functions and decoder factories are sent to the workers by pickling, so
+they must be module level functions or instances of module level classes.
+
+A job function takes the worker's decoder and a frame number:
+
+    def job(stream, frame):
+        stream.loadframe( frame, 'SIFT' )
+        return frame
+
+:REQUIRES: ladybug.dll (for StreamOpener)
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 12:52:10 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 12:52:10 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+import os
+import sys
+import multiprocessing
+from ctypes import Structure, sizeof, byref, c_ulong, c_size_t, c_void_p, POINTER
+try:
+    import resource # NOT AVAILABLE ON WINDOWS
+except ImportError:
+    resource = None
+
+
+
+#===============================================================================
+# MEMORY OF THE WORKER PROCESS
+#===============================================================================
+class _ProcessMemoryCounters(Structure):
+    '''PROCESS_MEMORY_COUNTERS of psapi.dll.'''
+    _fields_ = [('cb', c_ulong), ('PageFaultCount', c_ulong),
+                ('PeakWorkingSetSize', c_size_t), ('WorkingSetSize', c_size_t),
+                ('QuotaPeakPagedPoolUsage', c_size_t),
+                ('QuotaPagedPoolUsage', c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', c_size_t),
+                ('QuotaNonPagedPoolUsage', c_size_t),
+                ('PagefileUsage', c_size_t), ('PeakPagefileUsage', c_size_t)]
+
+
+def memory_used():
+    '''Resident memory (working set) of this process in bytes, or None if
+    it can not be read on this platform.'''
+    if sys.platform == 'win32':
+        from ctypes import windll
+        counters = _ProcessMemoryCounters()
+        counters.cb = sizeof(counters)
+        windll.kernel32.GetCurrentProcess.restype = c_void_p
+        windll.psapi.GetProcessMemoryInfo.argtypes = [c_void_p,
+                                POINTER(_ProcessMemoryCounters), c_ulong]
+        if not windll.psapi.GetProcessMemoryInfo(windll.kernel32.GetCurrentProcess(),
+                                                 byref(counters), counters.cb):
+            return None
+        return counters.WorkingSetSize
+    if os.path.exists('/proc/self/statm'):
+        with open('/proc/self/statm') as rfile:
+            pages = int(rfile.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE')
+    return None
+
+
+
+#===============================================================================
+# WORKER PROCESS
+#===============================================================================
+_decoder = None # DECODER OF THIS WORKER PROCESS
+_init_error = None # EXCEPTION OF THE DECODER FACTORY
+_memory_limit = None # CHECKED AFTER EACH FRAME WITHOUT RLIMIT_AS
+
+
+def _init_worker(factory, memory_limit):
+    global _decoder, _init_error, _memory_limit
+    if memory_limit:
+        if resource is not None:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        else:
+            _memory_limit = memory_limit
+    # A FAILING INITIALIZER MAKES THE POOL START NEW WORKERS FOREVER. THE
+    # ERROR IS RAISED BY THE FIRST TASK INSTEAD.
+    try:
+        _decoder = factory()
+    except Exception, e:
+        _init_error = e
+
+
+def _run_chunk(args):
+    job, frames = args
+    if _init_error is not None:
+        raise _init_error
+    results = []
+    for frame in frames:
+        results.append( job(_decoder, frame) )
+        if _memory_limit and memory_used() > _memory_limit:
+            raise MemoryError, 'worker {0} is over the memory limit after frame {1}'.format(
+                                os.getpid(), frame)
+    return results
+
+
+
+#===============================================================================
+# DECODER FACTORY AND JOBS
+#===============================================================================
+class StreamOpener:
+    '''Picklable factory that opens a Ladybug3stream in a worker process.'''
+    def __init__(self, fname, backend='sdk'):
+        self.fname = fname
+        self.backend = backend
+
+    def __call__(self):
+        from interface import Ladybug3stream
+        return Ladybug3stream( self.fname, self.backend )
+
+
+def create_sift_images(stream, frame):
+    '''Job: save the *.SIFTpgm images of one frame for the external SIFT
+    program. Use featurestore.extract for FeatureMatcher features.'''
+    stream.loadframe( frame, 'SIFT' )
+    return frame
+
+
+def frame_header(stream, frame):
+    '''Job: the LadybugImage header of one frame as a dict.'''
+    stream.loadframe( frame )
+    if stream.ladybug is None:
+        return stream.ladybugImage._asdict()
+    return stream.ladybug.ladybugImage._asdict()
+
+
+
+#===============================================================================
+# EXECUTOR
+#===============================================================================
+class BatchExecutor:
+    '''Pool of worker processes that each hold one decoder.
+
+    :PARAMETERS:
+        *factory* --- Picklable callable that returns a decoder. Called once
+            in each worker process.
+        **processes** --- Number of worker processes. Default is the number
+            of cores.
+        **memory_limit** --- Memory limit in bytes for each worker. On POSIX
+            it is the address space limit. On Windows the worker checks its
+            working set after each frame. A worker that goes over it gets a
+            MemoryError, which is raised again by map(). An error of the
+            factory is also raised by map().
+        **chunksize** --- Number of consecutive frames per task.
+        **maxtasksperchild** --- Restart workers after this many tasks to
+            give back memory. Default keeps workers for the life of the pool.
+    '''
+    def __init__(self, factory, processes=None, memory_limit=None,
+                 chunksize=16, maxtasksperchild=None):
+        if memory_limit and resource is None and memory_used() is None:
+            raise ValueError, 'memory_limit is not supported on this platform'
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunksize = chunksize
+        self.pool = multiprocessing.Pool(self.processes, _init_worker,
+                                         (factory, memory_limit),
+                                         maxtasksperchild)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is not None:
+            # DO NOT WAIT FOR THE REST OF THE QUEUED CHUNKS
+            self.terminate()
+        else:
+            self.close()
+
+
+    def imap(self, job, frames):
+        '''Iterate over job(decoder, frame) results in frame order.'''
+        frames = list(frames)
+        chunks = [(job, frames[i:i+self.chunksize])
+                  for i in xrange(0, len(frames), self.chunksize)]
+        for results in self.pool.imap(_run_chunk, chunks):
+            for result in results:
+                yield result
+
+
+    def map(self, job, frames):
+        '''List of job(decoder, frame) results in frame order.'''
+        return list(self.imap(job, frames))
+
+
+    def close(self):
+        '''Wait for the submitted chunks and stop the workers.'''
+        self.pool.close()
+        self.pool.join()
+
+
+    def terminate(self):
+        '''Stop the workers without finishing the submitted chunks.'''
+        self.pool.terminate()
+        self.pool.join()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Bayer demosaicing in NumPy.
+
+Vectorized versions of some of the SDK color processing methods, for use
+without ladybug.dll (see pgrfile.py), for profiling, and for running on
+several cores:
+
+    LADYBUG_NEAREST_NEIGHBOR_FAST --- each 2x2 Bayer cell gets one color.
+    LADYBUG_DOWNSAMPLE4           --- half size image, one pixel per cell.
+    LADYBUG_HQLINEAR              --- bilinear interpolation (not the SDK's
+                                      gradient-corrected version).
+    LADYBUG_MONO                  --- luma from the bilinear image.
+
+The input is the raw stippled image of one camera (rows x cols, one value per
+pixel), or its four Bayer channel tiles as stored in a JPEG stream. The
+pattern is the stippledFormat of the stream header. Output arrays have the
+input dtype and the API (sideways) orientation.
+
+Run this module with a folder of raw images to benchmark the methods against
+images converted by the SDK. See benchmark().
+
+:REQUIRES: numpy, PIL (benchmark only)
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 14:10:02 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 14:10:02 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+import os
+import sys
+import glob
+import time
+from numpy import (empty, zeros, float32, uint8, pad, dot, asarray, clip,
+                   iinfo, issubdtype, integer, log10, random, mgrid, sin, cos)
+from enums import *
+
+# ASSUMED PATTERN FOR LADYBUG_DEFAULT
+DEFAULT_STIPPLED = LADYBUG_BGGR
+
+# (ROW, COL) OF R, G ON THE RED ROW, G ON THE BLUE ROW AND B IN A 2x2 CELL
+_PATTERNS = {
+    LADYBUG_BGGR: ((1, 1), (1, 0), (0, 1), (0, 0)),
+    LADYBUG_GBRG: ((1, 0), (1, 1), (0, 0), (0, 1)),
+    LADYBUG_GRBG: ((0, 1), (0, 0), (1, 1), (1, 0)),
+    LADYBUG_RGGB: ((0, 0), (0, 1), (1, 0), (1, 1)) }
+
+# ITU-R BT.601 LUMA WEIGHTS FOR R, G, B
+LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+
+METHODS = (LADYBUG_NEAREST_NEIGHBOR_FAST, LADYBUG_DOWNSAMPLE4,
+           LADYBUG_HQLINEAR, LADYBUG_MONO)
+
+
+
+#===============================================================================
+# BAYER LAYOUT
+#===============================================================================
+def pattern(stippled):
+    '''(row, col) in the 2x2 cell of R, Gr, Gb and B.'''
+    if stippled == LADYBUG_DEFAULT:
+        stippled = DEFAULT_STIPPLED
+    try:
+        return _PATTERNS[stippled]
+    except KeyError:
+        raise ValueError, 'unknown stippled format: {0}'.format(stippled)
+
+
+def channels(raw, stippled):
+    '''Views of the R, Gr, Gb and B samples (half size each, no copy).'''
+    return [raw[r::2, c::2] for r, c in pattern(stippled)]
+
+
+def from_tiles(tiles, stippled):
+    '''Interleave four Bayer channel tiles into one raw stippled image.
+
+    :PARAMETERS:
+        *tiles* --- Four (rows/2, cols/2) arrays in cell order: (0,0), (0,1),
+            (1,0), (1,1).
+    '''
+    rows, cols = tiles[0].shape
+    raw = empty((rows*2, cols*2), tiles[0].dtype)
+    raw[0::2, 0::2], raw[0::2, 1::2], raw[1::2, 0::2], raw[1::2, 1::2] = tiles
+    return raw
+
+
+
+#===============================================================================
+# COLOR PROCESSING METHODS
+#===============================================================================
+def downsample4(raw, stippled):
+    '''Half size RGB image. Green is the mean of the two green samples.'''
+    R, Gr, Gb, B = channels(raw, stippled)
+    rgb = empty(R.shape + (3,), raw.dtype)
+    rgb[..., 0] = R
+    rgb[..., 1] = _cast((Gr.astype(float32) + Gb) / 2, raw.dtype)
+    rgb[..., 2] = B
+    return rgb
+
+
+def nearest_fast(raw, stippled):
+    '''Full size RGB image. All four pixels of a cell get the cell's color.'''
+    half = downsample4(raw, stippled)
+    rows, cols = raw.shape
+    rgb = empty((rows, cols, 3), raw.dtype)
+    for r in (0, 1):
+        for c in (0, 1):
+            rgb[r::2, c::2] = half
+    return rgb
+
+
+def bilinear(raw, stippled):
+    '''Full size RGB image by bilinear interpolation of each channel.'''
+    rows, cols = raw.shape
+    sparse = zeros((3, rows, cols), float32)
+    for ch, (r, c) in zip((0, 1, 1, 2), pattern(stippled)):
+        sparse[ch, r::2, c::2] = raw[r::2, c::2]
+    # MIRRORED BORDER KEEPS THE BAYER PHASE
+    sparse = pad(sparse, ((0, 0), (1, 1), (1, 1)), 'reflect')
+    # SUMS OF THE EDGE AND CORNER NEIGHBOURS
+    edge = (sparse[:, :-2, 1:-1] + sparse[:, 2:, 1:-1] +
+            sparse[:, 1:-1, :-2] + sparse[:, 1:-1, 2:])
+    corner = (sparse[:, :-2, :-2] + sparse[:, :-2, 2:] +
+              sparse[:, 2:, :-2] + sparse[:, 2:, 2:])
+    center = sparse[:, 1:-1, 1:-1]
+    rgb = empty((rows, cols, 3), float32)
+    # KERNELS [[1,2,1],[2,4,2],[1,2,1]]/4 FOR R AND B, [[0,1,0],[1,4,1],[0,1,0]]/4 FOR G
+    rgb[..., 0] = center[0] + edge[0] / 2 + corner[0] / 4
+    rgb[..., 1] = center[1] + edge[1] / 4
+    rgb[..., 2] = center[2] + edge[2] / 2 + corner[2] / 4
+    return _cast(rgb, raw.dtype)
+
+
+def luma(rgb):
+    '''Luma (rows, cols) of an RGB image.'''
+    return _cast(dot(asarray(rgb, float32), asarray(LUMA_WEIGHTS, float32)),
+                 rgb.dtype)
+
+
+def demosaic(raw, stippled=DEFAULT_STIPPLED, method=LADYBUG_HQLINEAR):
+    '''Color process one raw stippled camera image.
+
+    :PARAMETERS:
+        *raw* --- (rows, cols) raw image, or a sequence of four Bayer tiles.
+        **stippled** --- LADYBUG_BGGR, LADYBUG_GBRG, LADYBUG_GRBG or
+            LADYBUG_RGGB (stippledFormat of the stream header).
+        **method** --- One of METHODS.
+
+    :RETURNS:
+        (rows, cols, 3) RGB array, (rows/2, cols/2, 3) for LADYBUG_DOWNSAMPLE4
+        or (rows, cols) luma for LADYBUG_MONO.
+    '''
+    if isinstance(raw, (list, tuple)):
+        raw = from_tiles(raw, stippled)
+    if method == LADYBUG_NEAREST_NEIGHBOR_FAST:
+        return nearest_fast(raw, stippled)
+    if method == LADYBUG_DOWNSAMPLE4:
+        return downsample4(raw, stippled)
+    if method == LADYBUG_HQLINEAR:
+        return bilinear(raw, stippled)
+    if method == LADYBUG_MONO:
+        return luma(bilinear(raw, stippled))
+    raise ValueError, 'color processing method {0} is not available'.format(method)
+
+
+def _cast(arr, dtype):
+    '''Round and clip float results to an integer dtype.'''
+    if issubdtype(dtype, integer):
+        info = iinfo(dtype)
+        return clip(arr + 0.5, info.min, info.max).astype(dtype)
+    return arr.astype(dtype)
+
+
+
+#===============================================================================
+# BENCHMARK
+#===============================================================================
+def psnr(a, b, peak=255.):
+    mse = ((asarray(a, float32) - asarray(b, float32))**2).mean()
+    return 10 * log10(peak**2 / mse) if mse else float('inf')
+
+
+def benchmark(dirname=None, stippled=DEFAULT_STIPPLED, repeat=3):
+    '''Time each method and compare it with the SDK output.
+
+    The folder holds raw stippled images (*.pgm, one camera each) and, with
+    the same base name, *.bmp images converted by the SDK with
+    ExtractLadybugImageToFilesBGRU32. Without a folder a synthetic image set
+    is used and compared with its known colors.
+
+    :RETURNS:
+        dict of method: (milliseconds per image, mean PSNR in dB).
+    '''
+    from PIL import Image
+    pairs = []
+    if dirname:
+        for fname in sorted(glob.glob(os.path.join(dirname, '*.pgm'))):
+            raw = asarray(Image.open(fname))
+            ref_fname = os.path.splitext(fname)[0] + '.bmp'
+            ref = (asarray(Image.open(ref_fname).convert('RGB'))
+                   if os.path.exists(ref_fname) else None)
+            pairs.append((raw, ref))
+    else:
+        for seed in xrange(3):
+            ref = synthetic_rgb(1232, 1616, seed)
+            pairs.append((mosaic(ref, stippled), ref))
+
+    results = {}
+    names = {LADYBUG_NEAREST_NEIGHBOR_FAST: 'NEAREST_NEIGHBOR_FAST',
+             LADYBUG_DOWNSAMPLE4: 'DOWNSAMPLE4',
+             LADYBUG_HQLINEAR: 'HQLINEAR (bilinear)',
+             LADYBUG_MONO: 'MONO'}
+    for method in METHODS:
+        t0 = time.time()
+        for i in xrange(repeat):
+            outs = [demosaic(raw, stippled, method) for raw, ref in pairs]
+        ms = (time.time() - t0) * 1000. / (repeat * len(pairs))
+        scores = []
+        for out, (raw, ref) in zip(outs, pairs):
+            if ref is None:
+                continue
+            if method == LADYBUG_DOWNSAMPLE4:
+                ref = ref[::2, ::2]
+            elif method == LADYBUG_MONO:
+                ref = luma(ref)
+            scores.append(psnr(out, ref))
+        score = sum(scores) / len(scores) if scores else None
+        results[method] = (ms, score)
+        print '{0:24} {1:8.1f} ms/image   PSNR {2}'.format(names[method], ms,
+                    '{0:.2f} dB'.format(score) if score is not None else '-')
+    return results
+
+
+def mosaic(rgb, stippled=DEFAULT_STIPPLED):
+    '''Raw stippled image sampled from an RGB image (for testing).'''
+    raw = empty(rgb.shape[:2], rgb.dtype)
+    for ch, (r, c) in zip((0, 1, 1, 2), pattern(stippled)):
+        raw[r::2, c::2] = rgb[r::2, c::2, ch]
+    return raw
+
+
+def synthetic_rgb(rows, cols, seed=0):
+    '''Smooth random color image (for testing).'''
+    rand = random.RandomState(seed)
+    y, x = mgrid[0:rows, 0:cols].astype(float32)
+    rgb = empty((rows, cols, 3), uint8)
+    for ch in xrange(3):
+        fy, fx, phase = rand.uniform(0.002, 0.03, 3)
+        rgb[..., ch] = 127.5 + 100 * sin(fy * y + phase) * cos(fx * x)
+    return rgb
+
+
+
+#===============================================================================
+# MAIN METHOD AND TESTING AREA
+#===============================================================================
+def main(dirname=None):
+    """Benchmark the demosaic methods."""
+    benchmark(dirname)
+
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
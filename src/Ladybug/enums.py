@@ -45,6 +45,18 @@ Enumerations (all-caps 'constant' values) for use in interacting with the Ladybu
 #    exec( n + ' = ' + str(v) )
 
 
+#--- enum LadybugStippledFormat
+# Bayer pattern of the raw (stippled) images. See stippledFormat in
+# LadybugStreamHeadInfo.
+(
+   LADYBUG_BGGR,
+   LADYBUG_GBRG,
+   LADYBUG_GRBG,
+   LADYBUG_RGGB,
+   LADYBUG_DEFAULT
+) = range(5)
+
+
 #--- enum LadybugIndependentProperty
 (
    LADYBUG_SUB_GAIN,
@@ -91,6 +103,31 @@ LADYBUG_ALL_CAMERAS_VIEW   = ( 0x1 << 15 )
 
 LADYBUG_ALL_OUTPUT_IMAGE   = 0x7FFFFFFF
 
+# SINGLE OUTPUT IMAGE TYPES FOR ladybugRenderOffScreenImage
+OFFSCREEN_IMAGE_TYPES = (
+    LADYBUG_RAW_CAM0, LADYBUG_RAW_CAM1, LADYBUG_RAW_CAM2,
+    LADYBUG_RAW_CAM3, LADYBUG_RAW_CAM4, LADYBUG_RAW_CAM5,
+    LADYBUG_RECTIFIED_CAM0, LADYBUG_RECTIFIED_CAM1, LADYBUG_RECTIFIED_CAM2,
+    LADYBUG_RECTIFIED_CAM3, LADYBUG_RECTIFIED_CAM4, LADYBUG_RECTIFIED_CAM5,
+    LADYBUG_PANORAMIC, LADYBUG_DOME, LADYBUG_SPHERICAL, LADYBUG_ALL_CAMERAS_VIEW)
+
+
+#--- enum LadybugPixelFormat
+# Pixel format of a LadybugProcessedImage.
+LADYBUG_MONO8     = 0x00000001
+LADYBUG_MONO16    = 0x00000002
+LADYBUG_RAW8      = 0x00000004
+LADYBUG_RAW16     = 0x00000008
+LADYBUG_BGR       = 0x00000010
+LADYBUG_BGRU      = 0x00000020
+LADYBUG_BGR16     = 0x00000040
+LADYBUG_BGRU16    = 0x00000080
+LADYBUG_BGR16F    = 0x00000100
+LADYBUG_BGRU16F   = 0x00000200
+LADYBUG_BGR32F    = 0x00000400
+LADYBUG_BGRU32F   = 0x00000800
+LADYBUG_UNSPECIFIED_PIXEL_FORMAT = 0x7FFFFFFF
+
 
 #--- enum LadybugGPSFileType
 (
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Batch panorama export.
+
+Ladybug3stream.save_panorama sets up rendering for every frame, saves the
+panorama with the SDK, then reopens it to wrap it horizontally and again to
+add the GPS tags. PanoramaExporter sets up rendering once for a range of
+frames. Each panorama is copied from the off-screen buffer, shifted in
+memory, and encoded once with the GPS EXIF tags. Encoding runs on a thread
+pool while the next frame is rendered.
+
+:REQUIRES: ladybug.dll, PIL, pexif
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 15:30:12 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 15:30:12 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+import os
+import time
+from collections import deque
+from cStringIO import StringIO
+from multiprocessing.pool import ThreadPool
+from PIL import ImageChops
+import pexif
+from enums import *
+
+
+
+def panorama_offset(width, carfront, heading=None):
+    '''Horizontal shift that puts the front of the car (pixel column
+    *carfront*) at the center, or north at 3/4 of the width if *heading* is
+    given.'''
+    if heading:
+        return int((3/4.)*width - carfront - heading*width/360.)
+    return width/2 - int(carfront)
+
+
+def encode_jpeg(image, quality=85, gps=None):
+    '''JPEG file data of a PIL image.
+
+    :PARAMETERS:
+        **gps** --- (latitude, longitude, altitude) to add as EXIF tags.
+    '''
+    out = StringIO()
+    image.save(out, 'JPEG', quality=quality)
+    data = out.getvalue()
+    if gps:
+        jpeg = pexif.JpegFile.fromString( data )
+        jpeg.set_geo( gps[0], gps[1] )
+        jpeg.exif.primary.GPS.GPSAltitude = [pexif.Rational(int(round(gps[2] * 10)), 10)]
+        data = jpeg.writeString()
+    return data
+
+
+
+class PanoramaExporter:
+    '''Renders and saves the panoramas of a range of frames.
+
+    :PARAMETERS:
+        *ladybug* --- LadybugAPI of the stream.
+        **outdir** --- Folder for the JPEG files (<prefix><frame>.jpg).
+        **carfront** --- Pixel column of the front of the car. None does not
+            shift the panoramas.
+        **heading** --- Vehicle heading in degrees, a number or a sequence
+            indexed by frame (see panorama_offset).
+        **addGPS** --- Add the frame's GPS position as EXIF tags.
+        **size** --- Panorama (cols, rows).
+        **quality** --- JPEG quality.
+        **threads** --- Number of encoding threads.
+    '''
+    def __init__(self, ladybug, outdir='', prefix='', carfront=None,
+                 heading=None, addGPS=True, size=(2048, 1024), quality=85,
+                 threads=4):
+        self.ladybug = ladybug
+        self.outdir = outdir
+        self.prefix = prefix
+        self.carfront = carfront
+        self.heading = heading
+        self.addGPS = addGPS
+        self.size = size
+        self.quality = quality
+        self.threads = threads
+        self.fps = None # THROUGHPUT OF THE LAST RUN
+
+
+    def setup(self, first_frame):
+        '''Set the rendering state once for all frames.'''
+        self.ladybug.GoToImage( first_frame )
+        self.ladybug.ReadImageFromStream() # ALPHA MASKS NEED THE IMAGE SIZE
+        self.ladybug.SetAlphaMasking(True)
+        self.ladybug.InitializeAlphaMasks()
+        self.ladybug.SetColorProcessingMethod(LADYBUG_RIGOROUS)
+        self.ladybug.SetOffScreenImageSize(LADYBUG_PANORAMIC, *self.size)
+        self.ladybug.GoToImage( first_frame )
+
+
+    def render(self, frame):
+        '''Read and render one frame. Returns a copy of the panorama.'''
+        if self.ladybug.next_frame != frame:
+            self.ladybug.GoToImage( frame )
+        self.ladybug.ReadImageFromStream()
+        self.ladybug.ConvertToMultipleBGRU32()
+        self.ladybug.UpdateTextures()
+        self.ladybug.RenderOffScreenImage(LADYBUG_PANORAMIC)
+        return self.ladybug.GetProcessedImage()
+
+
+    def save(self, frame, image, gps):
+        '''Shift, encode and write one panorama (runs on the thread pool).'''
+        if self.carfront:
+            heading = self.heading
+            if hasattr(heading, '__getitem__'):
+                heading = heading[frame]
+            image = ImageChops.offset(image, panorama_offset(image.size[0],
+                                               self.carfront, heading), 0)
+        savename = os.path.join(self.outdir, '{0}{1}.jpg'.format(self.prefix, frame))
+        with open(savename, 'wb') as wfile:
+            wfile.write( encode_jpeg(image, self.quality, gps) )
+        return savename
+
+
+    def run(self, frames):
+        '''Export the panoramas of *frames* (in increasing order).
+
+        :RETURNS:
+            List of saved file names in frame order.
+        '''
+        frames = list(frames)
+        if not frames:
+            return []
+        self.setup(frames[0])
+        pool = ThreadPool(self.threads)
+        pending = deque()
+        saved = []
+        t0 = time.time()
+        try:
+            for frame in frames:
+                image = self.render(frame)
+                LImage = self.ladybug.ladybugImage
+                gps = ((LImage.dGPSLatitude, LImage.dGPSLongitude,
+                        LImage.dGPSAltitude) if self.addGPS else None)
+                pending.append( pool.apply_async(self.save, (frame, image, gps)) )
+                # LIMIT THE NUMBER OF PANORAMAS WAITING IN MEMORY
+                while len(pending) > 2 * self.threads:
+                    saved.append( pending.popleft().get() )
+            while pending:
+                saved.append( pending.popleft().get() )
+        finally:
+            pool.close()
+            pool.join()
+        elapsed = time.time() - t0
+        self.fps = len(saved) / max(elapsed, 1e-9)
+        print 'Exported', len(saved), 'panoramas in {0:.1f} s ({1:.2f} fps)'.format(
+                                        elapsed, self.fps)
+        return saved
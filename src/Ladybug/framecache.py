@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Memory-bounded cache of decoded camera images.
+
+Ladybug3stream keeps the images it returns in a FrameCache keyed by
+(frame, camera, color processing method, rotation, channel order). Frames
+that were viewed recently are returned from the cache without converting
+the frame again. The least recently used images are dropped when the cache
+is over its byte budget.
+
+:REQUIRES: numpy
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 14:48:19 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 14:48:19 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+from collections import OrderedDict
+from numpy import ascontiguousarray
+
+
+
+class FrameCache:
+    '''LRU cache of ndarrays with a byte budget.
+
+    Keys are tuples that start with the frame number. Stored arrays are
+    read-only copies.
+
+    :PARAMETERS:
+        **max_bytes** --- Byte budget. Arrays larger than this are not stored.
+    '''
+    def __init__(self, max_bytes=512 * 2**20):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict() # LEAST RECENTLY USED FIRST
+        self.frames = {} # NUMBER OF ENTRIES OF EACH FRAME
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+
+    def get(self, key):
+        '''Cached array for *key*, or None.'''
+        arr = self.entries.pop(key, None)
+        if arr is None:
+            self.misses += 1
+            return None
+        self.entries[key] = arr # MOST RECENTLY USED
+        self.hits += 1
+        return arr
+
+
+    def put(self, key, arr):
+        '''Store a read-only copy of *arr*. Returns the stored array.'''
+        arr = ascontiguousarray(arr).copy()
+        arr.flags.writeable = False
+        if arr.nbytes > self.max_bytes:
+            return arr
+        self._remove(key)
+        self.entries[key] = arr
+        self.frames[key[0]] = self.frames.get(key[0], 0) + 1
+        self.nbytes += arr.nbytes
+        while self.nbytes > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+        return arr
+
+
+    def has_frame(self, frame):
+        '''True if any image of *frame* is cached.'''
+        return frame in self.frames
+
+
+    def invalidate(self, frame=None):
+        '''Drop the images of one frame, or all images.'''
+        if frame is None:
+            self.entries.clear()
+            self.frames.clear()
+            self.nbytes = 0
+            return
+        for key in [k for k in self.entries if k[0] == frame]:
+            self._remove(key)
+
+
+    def stats(self):
+        '''Hit and miss counters, hit rate and memory use.'''
+        total = self.hits + self.misses
+        return dict(hits=self.hits, misses=self.misses,
+                    evictions=self.evictions, entries=len(self.entries),
+                    bytes=self.nbytes, max_bytes=self.max_bytes,
+                    hit_rate=float(self.hits) / total if total else 0.)
+
+
+    def _remove(self, key):
+        arr = self.entries.pop(key, None)
+        if arr is None:
+            return
+        self.nbytes -= arr.nbytes
+        self.frames[key[0]] -= 1
+        if not self.frames[key[0]]:
+            del self.frames[key[0]]
@@ -0,0 +1,376 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Sidecar index of the frame metadata of one stream file.
+
+The index is a folder next to the stream file (<name>.pgr.index) with one
+.npy file per column, so each column can be memory-mapped on its own:
+
+    frame, seqid, skipped           --- frame number, ulSequenceId and the
+                                        number of sequence ids lost before
+                                        the frame.
+    imageUTC                        --- ulTimeSeconds/ulTimeMicroSeconds as
+                                        datetime64[us].
+    lat, lon, alt                   --- GPS position in the frame header.
+    gpsUTC, valid                   --- time and status of the last GPRMC fix
+                                        at or before the image time (NaT
+                                        without a GPS section, see gpslog.py).
+    gps_quality, satellites, hdop   --- fix quality, satellites in use and
+                                        HDOP of the last GPGGA sentence at or
+                                        before the image time.
+    shutter, gain                   --- per camera ulShutter and
+                                        arulGainAdjust (low bytes).
+
+The frame headers are read without decoding images (see pgrfile.py). When
+the stream file changes, frames that are already indexed are kept if they
+are unchanged, and only new frames are read. The GPS columns are recomputed
+from the time column when the GPS section changes.
+
+RecordingIndex joins the indexes of the files of a recording split over
+several stream files, with recording frame numbers.
+
+:REQUIRES: numpy
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 17:21:08 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 17:21:08 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+import os
+import re
+import json
+from datetime import datetime, timedelta
+from numpy import (array, empty, zeros, full, concatenate, searchsorted,
+                   datetime64, int64, save, load, nan)
+from pgrfile import PGRFile
+from gpslog import parse_gprmc
+
+# COLUMNS READ FROM THE FRAME HEADERS: (name, dtype, shape per frame)
+HEADER_COLUMNS = [('frame', 'i4', ()), ('seqid', 'u4', ()), ('skipped', 'i4', ()),
+                  ('imageUTC', 'M8[us]', ()),
+                  ('lat', 'f8', ()), ('lon', 'f8', ()), ('alt', 'f8', ()),
+                  ('shutter', 'u1', (5,)), ('gain', 'u1', (6,))]
+# COLUMNS FROM THE GPS SECTION
+GPS_COLUMNS = [('gpsUTC', 'M8[us]', ()), ('valid', '?', ()),
+               ('gps_quality', 'u1', ()), ('satellites', 'u1', ()),
+               ('hdop', 'f4', ())]
+COLUMNS = HEADER_COLUMNS + GPS_COLUMNS
+
+_NMEA = re.compile(r'\$(GPRMC|GPGGA),([^*\r\n]*)')
+
+NaT = datetime64('NaT', 'us')
+
+
+
+#===============================================================================
+# NMEA SENTENCES
+#===============================================================================
+def nmea_tables(pgrfile):
+    '''GPRMC and GPGGA records in the GPS section of a stream file.
+
+    GPGGA sentences have no date. They take the date of the last GPRMC
+    sentence and are skipped before the first one.
+
+    :RETURNS:
+        (rmc, gga) sorted by time. rmc is a list of (datetime, valid), gga a
+        list of (datetime, quality, satellites, hdop).
+    '''
+    start = pgrfile.header.ulGPSDataOffset
+    size = pgrfile.header.ulGPSDataSize
+    rmc, gga = [], []
+    if not start or not size:
+        return rmc, gga
+    for m in _NMEA.finditer(pgrfile._mm[start:start+size]):
+        if m.group(1) == 'GPRMC':
+            fix = parse_gprmc(m.group(2))
+            if fix:
+                rmc.append(fix)
+            continue
+        if not rmc:
+            continue
+        f = m.group(2).split(',')
+        try:
+            hms, second = f[0], float(f[0][4:])
+            utc = rmc[-1][0].replace(hour=int(hms[0:2]), minute=int(hms[2:4]),
+                                     second=int(second),
+                                     microsecond=int(round((second % 1) * 1e6)) % 1000000)
+            quality, sats = int(f[5] or 0), int(f[6] or 0)
+            hdop = float(f[7]) if f[7] else nan
+        except (IndexError, ValueError):
+            continue
+        # PAST MIDNIGHT
+        if utc < rmc[-1][0] - timedelta(hours=12):
+            utc += timedelta(days=1)
+        gga.append( (utc, quality, sats, hdop) )
+    return sorted(rmc), sorted(gga)
+
+
+def _datetime64(times):
+    return array(times, 'M8[us]') if times else empty(0, 'M8[us]')
+
+
+
+#===============================================================================
+# INDEX
+#===============================================================================
+class FrameIndex:
+    '''Columns of frame metadata for one stream file.
+
+    Columns are read-only memory maps, e.g. index['lat'] or index.lat.
+
+    :PARAMETERS:
+        *fname* --- Stream file name.
+        **dirname** --- Index folder. Defaults to <fname>.index.
+        **update** --- Bring the index up to date with the stream file.
+    '''
+    def __init__(self, fname, dirname=None, update=True):
+        self.fname = fname
+        self.dirname = dirname or fname + '.index'
+        self.columns = {}
+        self.source = {}
+        if update:
+            self.update()
+        else:
+            self.load()
+
+    def __len__(self):
+        return len(self.columns.get('frame', ()))
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['columns'][name]
+        except KeyError:
+            raise AttributeError, name
+
+
+    def load(self):
+        '''Open the saved columns. Returns False if there is no index.'''
+        fname = os.path.join(self.dirname, 'source.json')
+        if not os.path.exists(fname):
+            return False
+        with open(fname) as rfile:
+            self.source = json.load(rfile)
+        self.columns = dict((name, load(self._column_fname(name), mmap_mode='r'))
+                            for name, dtype, shape in COLUMNS)
+        return True
+
+
+    def update(self):
+        '''Index the frames added to the stream file since the last update.
+
+        :RETURNS:
+            Number of frame headers read.
+        '''
+        self.load()
+        stat = os.stat(self.fname)
+        if (self.source.get('size') == stat.st_size and
+            self.source.get('mtime') == stat.st_mtime):
+            return 0
+
+        pgr = PGRFile( self.fname )
+        try:
+            old = self._unchanged_frames(pgr)
+            header = self._read_headers(pgr, old)
+            gps_section = [pgr.header.ulGPSDataOffset, pgr.header.ulGPSDataSize]
+            if old == len(header['frame']) and self.source.get('gps') == gps_section:
+                gps = dict((name, array(self.columns[name]))
+                           for name, dtype, shape in GPS_COLUMNS)
+            else:
+                gps = self._gps_columns(pgr, header)
+        finally:
+            pgr.close()
+
+        columns = dict(header, **gps)
+        if not os.path.isdir(self.dirname):
+            os.makedirs(self.dirname)
+        for name, dtype, shape in COLUMNS:
+            fname = self._column_fname(name)
+            with open(fname + '.tmp', 'wb') as wfile:
+                save(wfile, columns[name])
+            self.columns.pop(name, None) # CLOSE THE MEMORY MAP BEFORE REPLACING
+            if os.path.exists(fname):
+                os.remove(fname)
+            os.rename(fname + '.tmp', fname)
+        # THE SOURCE IS WRITTEN LAST. AN INTERRUPTED UPDATE IS DONE AGAIN.
+        n = len(columns['frame'])
+        self.source = dict(size=stat.st_size, mtime=stat.st_mtime, frames=n,
+                           gps=gps_section,
+                           last_seqid=int(columns['seqid'][-1]) if n else None,
+                           last_time=str(columns['imageUTC'][-1]) if n else None)
+        with open(os.path.join(self.dirname, 'source.json'), 'w') as wfile:
+            json.dump(self.source, wfile)
+        self.load()
+        return n - old
+
+
+    def seek_time(self, utc):
+        '''Frame number of the last frame taken at or before *utc* (datetime
+        or datetime64), or None if *utc* is before the first frame.'''
+        i = searchsorted(self.columns['imageUTC'], datetime64(utc, 'us'), 'right') - 1
+        return int(self.columns['frame'][i]) if i >= 0 else None
+
+
+    def seek_seqid(self, seqid):
+        '''Frame number of the frame with sequence id *seqid*, or of the last
+        frame before it if *seqid* was skipped. None if *seqid* is before the
+        first frame.'''
+        i = searchsorted(self.columns['seqid'], seqid, 'right') - 1
+        return int(self.columns['frame'][i]) if i >= 0 else None
+
+
+    def table(self, names=None):
+        '''Structured array (one row per frame) of the named columns.
+
+        The valid and gpsUTC columns come from the nearest GPRMC fix of the
+        GPS section, not the frame's own GPRMC data as in the SDK GPS log
+        (interface.get_frame_gps_log), and gpsUTC is a datetime64.
+        '''
+        names = names or [name for name, dtype, shape in COLUMNS]
+        shapes = dict((name, (dtype, shape)) for name, dtype, shape in COLUMNS)
+        table = empty(len(self), [(name,) + shapes[name] for name in names])
+        for name in names:
+            table[name] = self.columns[name]
+        return table
+
+
+    def _column_fname(self, name):
+        return os.path.join(self.dirname, name + '.npy')
+
+
+    def _unchanged_frames(self, pgr):
+        '''Number of indexed frames that are still the same in the stream.'''
+        n = self.source.get('frames', 0)
+        if not n or n > pgr.total_frames:
+            return 0
+        info = pgr.imageinfo(n - 1)
+        utc = datetime64(datetime.utcfromtimestamp(info.ulTimeSeconds).replace(
+                                microsecond=info.ulTimeMicroSeconds), 'us')
+        if (info.ulSequenceId != self.source.get('last_seqid') or
+            str(utc) != self.source.get('last_time')):
+            return 0
+        return n
+
+
+    def _read_headers(self, pgr, first):
+        '''Header columns of frames *first* and after, appended to the
+        indexed frames before *first*.'''
+        n = pgr.total_frames - first
+        new = dict((name, zeros((n,) + shape, dtype))
+                   for name, dtype, shape in HEADER_COLUMNS)
+        micros = zeros(n, int64)
+        last_seq = int(self.columns['seqid'][first-1]) if first else -1
+        for i in xrange(n):
+            info = pgr.imageinfo(first + i)
+            new['frame'][i] = first + i
+            new['seqid'][i] = info.ulSequenceId
+            new['skipped'][i] = 0 if last_seq == -1 else info.ulSequenceId - last_seq - 1
+            last_seq = info.ulSequenceId
+            micros[i] = info.ulTimeSeconds * 1000000 + info.ulTimeMicroSeconds
+            new['lat'][i] = info.dGPSLatitude
+            new['lon'][i] = info.dGPSLongitude
+            new['alt'][i] = info.dGPSAltitude
+            new['shutter'][i] = info.ulShutter
+            new['gain'][i] = info.arulGainAdjust
+        new['imageUTC'] = micros.astype('M8[us]')
+        if not first:
+            return new
+        return dict((name, concatenate([self.columns[name][:first], new[name]]))
+                    for name, dtype, shape in HEADER_COLUMNS)
+
+
+    def _gps_columns(self, pgr, header):
+        '''GPS columns of all frames from the image times.'''
+        n = len(header['frame'])
+        gps = dict((name, zeros(n, dtype)) for name, dtype, shape in GPS_COLUMNS)
+        rmc, gga = nmea_tables(pgr)
+        times = header['imageUTC']
+
+        k = searchsorted(_datetime64([t for t, valid in rmc]), times, 'right') - 1
+        found = k >= 0
+        gps['gpsUTC'] = full(n, NaT)
+        gps['gpsUTC'][found] = _datetime64([t for t, valid in rmc])[k[found]]
+        gps['valid'][found] = array([valid for t, valid in rmc], bool)[k[found]]
+        if not rmc:
+            # NO GPS SECTION: VALID IF THE HEADER HAS A POSITION
+            gps['valid'] = (header['lat'] != 0) | (header['lon'] != 0)
+
+        k = searchsorted(_datetime64([g[0] for g in gga]), times, 'right') - 1
+        found = k >= 0
+        gps['hdop'][:] = nan
+        if gga:
+            quality, sats, hdop = [array(col) for col in zip(*gga)[1:]]
+            gps['gps_quality'][found] = quality[k[found]]
+            gps['satellites'][found] = sats[k[found]]
+            gps['hdop'][found] = hdop[k[found]]
+        return gps
+
+
+
+class RecordingIndex(FrameIndex):
+    '''Frame metadata of all stream files of a recording, with recording
+    frame numbers. Columns are the FrameIndex columns of the files joined
+    in file order (in memory, not memory maps).
+
+    :PARAMETERS:
+        *indexes* --- FrameIndex of each file, in file order.
+        *starts* --- Recording frame number of the first frame of each file
+            (see recording.Recording.starts).
+    '''
+    def __init__(self, indexes, starts):
+        self.indexes = indexes
+        self.starts = starts
+        self.columns = {}
+        self.load()
+
+
+    def load(self):
+        '''Join the columns of the files. Returns False if a file has no
+        index.'''
+        if not all(len(index.source) for index in self.indexes):
+            self.columns = {}
+            return False
+        self.columns = dict((name, concatenate([index[name] for index in self.indexes]))
+                            for name, dtype, shape in COLUMNS)
+        self.columns['frame'] += concatenate([full(len(index), start, 'i4')
+                for index, start in zip(self.indexes, self.starts)])
+        # SEQUENCE IDS LOST BETWEEN THE FILES
+        first = 0
+        for previous, index in zip(self.indexes[:-1], self.indexes[1:]):
+            first += len(previous)
+            if len(previous) and len(index):
+                lost = int(index['seqid'][0]) - int(previous['seqid'][-1]) - 1
+                self.columns['skipped'][first] = max(lost, 0) # 0 IF THE IDS RESTART
+        return True
+
+
+    def update(self):
+        '''Update the index of each file. Returns the number of frame
+        headers read.'''
+        n = sum(index.update() for index in self.indexes)
+        if n or not self.columns:
+            self.load()
+        return n
+
+
+
+def update_frame_index(fname, first_frame=0):
+    '''Job: update the index of one stream file (see recording.Recording.scan).
+    Returns the number of frame headers read.'''
+    return FrameIndex( fname, update=False ).update()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+GPS trajectory of a recording without decoding any image data.
+
+Ladybug3stream.get_frame_gps_log reads every frame through the SDK decoder
+to get a handful of header fields. This module builds the same table from
+the LadybugImageInfo block at the start of each frame (see pgrfile.py).
+Only the frame headers of the memory-mapped file are read. The compressed
+tiles are never read.
+
+The GPS time and fix status come from the GPRMC sentences in the GPS
+section of the stream file (ulGPSDataOffset, ulGPSDataSize), when the stream
+has one. Each frame gets the last fix at or before its image time. Without
+the GPS section, gpsUTC is datetime.min and a frame is valid if its header
+has a position.
+
+A recording split over several *.pgr files can be scanned with one process
+per file.
+
+:REQUIRES: numpy
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 13:25:37 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 13:25:37 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+import re
+import glob
+import multiprocessing
+from datetime import datetime
+from bisect import bisect_right
+from numpy import zeros, concatenate
+from pgrfile import PGRFile
+
+# SAME FIELDS AS Ladybug3stream.get_frame_gps_log
+GPS_LOG_DTYPE = [('frame', int), ('seqid', int), ('skipped', int),
+                 ('valid', bool),
+                 ('lat', float), ('lon', float), ('alt', float),
+                 ('gpsUTC', datetime), ('imageUTC', datetime)]
+
+_RMC = re.compile(r'\$GPRMC,([^*\r\n]*)')
+
+
+#===============================================================================
+# NMEA SENTENCES
+#===============================================================================
+def parse_gprmc(fields):
+    '''Time and status of one GPRMC sentence (the text after "$GPRMC,").
+
+    :RETURNS:
+        (datetime, valid) or None if the sentence has no date or time.
+    '''
+    f = fields.split(',')
+    try:
+        hms, date = f[0], f[8]
+        second = float(hms[4:])
+        return (datetime(2000 + int(date[4:6]), int(date[2:4]), int(date[0:2]),
+                         int(hms[0:2]), int(hms[2:4]), int(second),
+                         int(round((second % 1) * 1e6)) % 1000000),
+                f[1] == 'A')
+    except (IndexError, ValueError):
+        return None
+
+
+def gps_fixes(pgrfile):
+    '''Sorted list of (datetime, valid) GPRMC fixes in the GPS section of a
+    stream file. Empty if the stream has no GPS section.'''
+    start = pgrfile.header.ulGPSDataOffset
+    size = pgrfile.header.ulGPSDataSize
+    if not start or not size:
+        return []
+    text = pgrfile._mm[start:start+size]
+    fixes = [parse_gprmc(m.group(1)) for m in _RMC.finditer(text)]
+    return sorted(fix for fix in fixes if fix)
+
+
+
+#===============================================================================
+# GPS LOG TABLES
+#===============================================================================
+def stream_gps_log(pgrfile, first_frame=0):
+    '''GPS log table of one stream file.
+
+    :PARAMETERS:
+        *pgrfile* --- PGRFile or a file name.
+        **first_frame** --- Frame number of the first frame in this file.
+
+    :RETURNS:
+        Structured array with the fields of GPS_LOG_DTYPE. skipped is 0 for
+        the first frame.
+    '''
+    if not isinstance(pgrfile, PGRFile):
+        pgrfile = PGRFile( pgrfile )
+    table = zeros(pgrfile.total_frames, dtype=GPS_LOG_DTYPE)
+    fixes = gps_fixes(pgrfile)
+    fix_times = [fix[0] for fix in fixes]
+
+    last_seq = -1
+    for i in xrange(pgrfile.total_frames):
+        info = pgrfile.imageinfo(i)
+        skipped = 0 if last_seq == -1 else info.ulSequenceId - last_seq - 1
+        last_seq = info.ulSequenceId
+        imageUTC = datetime.utcfromtimestamp(info.ulTimeSeconds).replace(
+                                        microsecond=info.ulTimeMicroSeconds)
+        k = bisect_right(fix_times, imageUTC) - 1
+        if k >= 0:
+            gpsUTC, valid = fixes[k]
+        else:
+            gpsUTC = datetime.min
+            valid = not fixes and (info.dGPSLatitude != 0 or info.dGPSLongitude != 0)
+        table[i] = (first_frame + i,
+                    info.ulSequenceId,
+                    skipped,
+                    valid,
+                    info.dGPSLatitude,
+                    info.dGPSLongitude,
+                    info.dGPSAltitude,
+                    gpsUTC,
+                    imageUTC)
+    return table
+
+
+def stream_files(fname):
+    '''All files of the recording that *fname* belongs to, in order.
+
+    Recordings are split into files named <name>-000000.pgr, <name>-000001.pgr,
+    etc. A file name that does not follow this pattern is returned alone.
+    '''
+    match = re.match(r'(.*)-\d{6}\.pgr$', fname, re.IGNORECASE)
+    if not match:
+        return [fname]
+    return sorted(f for f in glob.glob(match.group(1) + '-*.pgr')
+                  if re.match(r'.*-\d{6}\.pgr$', f, re.IGNORECASE))
+
+
+def recording_gps_log(fnames, processes=None):
+    '''GPS log table of a recording split over several stream files.
+
+    :PARAMETERS:
+        *fnames* --- Stream file names in recording order (see stream_files).
+        **processes** --- Number of worker processes. 1 scans in this process.
+
+    :RETURNS:
+        One structured array, numbered through all files. skipped also counts
+        the frames lost between two files.
+    '''
+    if processes == 1 or len(fnames) == 1:
+        tables = map(stream_gps_log, fnames)
+    else:
+        pool = multiprocessing.Pool(processes or min(len(fnames),
+                                                     multiprocessing.cpu_count()))
+        try:
+            tables = pool.map(stream_gps_log, fnames)
+        finally:
+            pool.close()
+            pool.join()
+
+    first = 0
+    for prev, table in zip([None] + tables[:-1], tables):
+        table['frame'] += first
+        first += len(table)
+        if prev is not None and len(prev) and len(table):
+            table['skipped'][0] = table['seqid'][0] - prev['seqid'][-1] - 1
+    return concatenate(tables) if tables else zeros(0, dtype=GPS_LOG_DTYPE)
@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Opt-in timing of ladybug.dll calls and of the hot stream methods.
+
+When enabled, the module level DLL handle of API.py (API.c) is replaced by a
+proxy that times every c.ladybug* call, and the hot LadybugAPI and
+Ladybug3stream methods are replaced by timed copies. Time spent in a method
+but not in its DLL calls is our own Python. disable() puts the original DLL
+handle and methods back, so there is no overhead when instrumentation is off.
+
+For each call name the report has the call count, errors (non-zero
+LadybugError codes and exceptions), total, mean, min and max time,
+percentiles of the most recent calls, and the bytes moved where known
+(frame data read, images converted or rendered, files saved).
+
+    from Ladybug import instrument
+    instrument.enable()
+    instrument.start_log(30)        # ONE LOG LINE EVERY 30 SECONDS
+    ... export panoramas ...
+    print instrument.log_line()
+    instrument.save('export_timing.json')
+
+:REQUIRES: numpy
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 19:37:52 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 19:37:52 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+import os
+import json
+import time
+import threading
+from collections import deque
+from numpy import percentile
+import API
+from API import LadybugAPI
+from interface import Ladybug3stream
+from structures import getLadybugProcessedImage
+
+# DLL FUNCTIONS THAT DO NOT RETURN A LadybugError
+NO_ERROR_CODE = ('ladybugErrorToString',)
+
+PERCENTILES = (50, 90, 99)
+
+
+
+#===============================================================================
+# BYTES MOVED BY THE HOT METHODS: nbytes(self, args, kwargs, result)
+#===============================================================================
+def _read_bytes(api, args, kwargs, result):
+    return api.ladybugImage.uiDataSizeBytes
+
+
+def _converted_bytes(api, args, kwargs, result):
+    buffers = (args[0] if args else kwargs.get('buffers')) or api.buffers
+    return buffers.imCols * buffers.imRows * 4 * len(buffers.cameras)
+
+
+def _rendered_bytes(api, args, kwargs, result):
+    info = getLadybugProcessedImage( api.pLadybugProcessedImage )
+    return info.uiCols * info.uiRows * 4
+
+
+def _saved_bytes(api, args, kwargs, result):
+    path = args[0] if args else kwargs.get('pszPath')
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def _array_bytes(stream, args, kwargs, result):
+    return result.nbytes
+
+
+# (class, method, nbytes)
+HOT_METHODS = [
+    (LadybugAPI, 'GoToImage', None),
+    (LadybugAPI, 'ReadImageFromStream', _read_bytes),
+    (LadybugAPI, 'ConvertToMultipleBGRU32', _converted_bytes),
+    (LadybugAPI, 'UpdateTextures', None),
+    (LadybugAPI, 'RenderOffScreenImage', _rendered_bytes),
+    (LadybugAPI, 'GetProcessedImage', _rendered_bytes),
+    (LadybugAPI, 'SaveImage', _saved_bytes),
+    (Ladybug3stream, 'loadframe', None),
+    (Ladybug3stream, 'image', None),
+    (Ladybug3stream, 'image_array', _array_bytes),
+    (Ladybug3stream, 'getFrameInfo', None),
+    (Ladybug3stream, 'save_panorama', None),
+    (Ladybug3stream, 'export_panoramas', None),
+    ]
+
+
+
+#===============================================================================
+# STATISTICS
+#===============================================================================
+class CallStats:
+    '''Timing of one call name. Percentiles are of the last *samples* calls.'''
+    def __init__(self, samples=4096):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.
+        self.min = None
+        self.max = 0.
+        self.bytes = 0
+        self.recent = deque(maxlen=samples)
+
+    def add(self, seconds, nbytes=0, error=False):
+        self.count += 1
+        self.errors += bool(error)
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.bytes += nbytes
+        self.recent.append(seconds)
+
+    def summary(self):
+        '''Dict of the statistics. Times are in seconds.'''
+        summary = dict(count=self.count, errors=self.errors, total=self.total,
+                       mean=self.total / self.count if self.count else 0.,
+                       min=self.min or 0., max=self.max, bytes=self.bytes)
+        values = percentile(list(self.recent), PERCENTILES) if self.recent else [0.] * len(PERCENTILES)
+        for p, value in zip(PERCENTILES, values):
+            summary['p{0}'.format(p)] = float(value)
+        return summary
+
+
+
+class Instrumentation:
+    '''Call statistics keyed by call name ('ladybugReadImageFromStream',
+    'LadybugAPI.ReadImageFromStream', 'Ladybug3stream.loadframe', ...).
+
+    :PARAMETERS:
+        **samples** --- Number of recent calls kept per name for percentiles.
+    '''
+    def __init__(self, samples=4096):
+        self.samples = samples
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.enabled = False
+        self.saved = [] # ORIGINAL (owner, name, value) TO RESTORE
+        self.started = time.time()
+        self.timer = None
+
+
+    def record(self, name, seconds, nbytes=0, error=False):
+        with self.lock:
+            stats = self.calls.get(name)
+            if stats is None:
+                stats = self.calls[name] = CallStats(self.samples)
+            stats.add(seconds, nbytes, error)
+
+
+    def reset(self):
+        with self.lock:
+            self.calls = {}
+            self.started = time.time()
+
+
+    def enable(self, methods=HOT_METHODS):
+        '''Time the DLL calls and *methods* from now on.'''
+        if self.enabled:
+            return
+        if API.c is not None:
+            self.saved.append( (API, 'c', API.c) )
+            API.c = InstrumentedDLL(API.c, self)
+        for cls, name, nbytes in methods:
+            func = cls.__dict__[name]
+            self.saved.append( (cls, name, func) )
+            setattr(cls, name, timed(func, cls.__name__ + '.' + name, self, nbytes))
+        self.enabled = True
+
+
+    def disable(self):
+        '''Restore the DLL handle and methods. The statistics are kept.'''
+        self.stop_log()
+        while self.saved:
+            owner, name, value = self.saved.pop()
+            setattr(owner, name, value)
+        self.enabled = False
+
+
+    def report(self):
+        '''Dict of call name: statistics (see CallStats.summary).'''
+        with self.lock:
+            return dict((name, stats.summary()) for name, stats in self.calls.items())
+
+
+    def save(self, fname=None):
+        '''JSON report. Written to *fname* if given.'''
+        text = json.dumps(dict(elapsed=time.time() - self.started,
+                               calls=self.report()), indent=1, sort_keys=True)
+        if fname:
+            with open(fname, 'w') as wfile:
+                wfile.write(text)
+        return text
+
+
+    def log_line(self, top=6):
+        '''One line with the *top* calls by total time.'''
+        report = sorted(self.report().items(), key=lambda item: -item[1]['total'])
+        parts = ['{0} {1}x {2:.1f}s p90 {3:.1f}ms'.format(name, s['count'],
+                                s['total'], s['p90'] * 1000)
+                 for name, s in report[:top]]
+        return '[{0:.0f}s] '.format(time.time() - self.started) + ' | '.join(parts)
+
+
+    def start_log(self, interval=10., log=None):
+        '''Call *log* (default print) with log_line() every *interval* seconds
+        on a daemon thread.'''
+        self.stop_log()
+        def tick():
+            if log is None:
+                print self.log_line()
+            else:
+                log( self.log_line() )
+            self.start_log(interval, log)
+        self.timer = threading.Timer(interval, tick)
+        self.timer.daemon = True
+        self.timer.start()
+
+
+    def stop_log(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+
+
+#===============================================================================
+# WRAPPERS
+#===============================================================================
+class InstrumentedDLL:
+    '''Proxy of the ladybug.dll handle that times every function call.'''
+    def __init__(self, dll, stats):
+        self.dll = dll
+        self.stats = stats
+
+    def __getattr__(self, name):
+        func = getattr(self.dll, name)
+        stats = self.stats
+        check_error = name not in NO_ERROR_CODE
+        def call(*args):
+            t0 = time.time()
+            e = func(*args)
+            stats.record(name, time.time() - t0,
+                         error=check_error and isinstance(e, (int, long)) and e != 0)
+            return e
+        setattr(self, name, call) # NEXT LOOKUPS DO NOT COME HERE
+        return call
+
+
+def timed(func, name, stats, nbytes=None):
+    '''Timed copy of method *func*. *nbytes(self, args, kwargs, result)*
+    returns the bytes moved by a call.'''
+    def method(self, *args, **kwargs):
+        t0 = time.time()
+        try:
+            result = func(self, *args, **kwargs)
+        except:
+            stats.record(name, time.time() - t0, error=True)
+            raise
+        seconds = time.time() - t0
+        try:
+            moved = nbytes(self, args, kwargs, result) if nbytes else 0
+        except Exception:
+            moved = 0
+        stats.record(name, seconds, moved)
+        return result
+    method.__name__ = func.__name__
+    method.__doc__ = func.__doc__
+    return method
+
+
+
+# INSTRUMENTATION SHARED BY ALL STREAMS OF THE PROCESS
+instrumentation = Instrumentation()
+enable = instrumentation.enable
+disable = instrumentation.disable
+reset = instrumentation.reset
+report = instrumentation.report
+save = instrumentation.save
+log_line = instrumentation.log_line
+start_log = instrumentation.start_log
+stop_log = instrumentation.stop_log
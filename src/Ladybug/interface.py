@@ -38,8 +38,18 @@ from datetime import datetime
 from PIL import Image, ImageChops
 from collections import namedtuple
 import pexif
-from numpy import array, zeros
+from numpy import array, zeros, rot90
 from API import LadybugAPI
+from recording import Recording
+from prefetch import FramePrefetcher
+from batch import BatchExecutor, StreamOpener
+from gpslog import recording_gps_log
+from framecache import FrameCache
+from export import PanoramaExporter, panorama_offset, encode_jpeg
+from rectify import RectifyMaps
+from panorama import PanoramaRenderer, calibration_from_api, load_calibration
+from demosaic import demosaic
+from frameindex import FrameIndex, RecordingIndex, update_frame_index
 from enums import *  # LADYBUG_EDGE_SENSING, LADYBUG_RIGOROUS, etc.
 
 #===============================================================================
@@ -63,11 +73,40 @@ class Ladybug3stream:
     next_frame = 0
 
 
-    def __init__(self, ladybug_PGR_fname):
-        self.ladybug = LadybugAPI( ladybug_PGR_fname )
+    def __init__(self, ladybug_PGR_fname, backend='sdk'):
+        '''Open a stream with the Ladybug SDK (backend='sdk') or with the
+        pure-Python reader (backend='pgr').
+
+        The 'pgr' backend reads frame headers and raw frame data without
+        ladybug.dll. Methods that need the SDK are not available.
+
+        The stream can be a recording folder or any file of a recording split
+        into <name>-000000.pgr, <name>-000001.pgr, etc. Frames are numbered
+        through all files (see recording.py).
+        '''
+        self.recording = Recording( ladybug_PGR_fname )
+        self.fname = self.recording.fnames[0] # THE SDK OPENS THE OTHER FILES
+        self.pgrfile = None
+        self.ladybug = None
+        self.rectify_maps = None
+        self.prefetcher = None
+        self.cache = None
+        self.color_method = None # COLOR PROCESSING OF THE LOADED IMAGES
+        self.buffers = None # BUFFER SET OF THE LOADED FRAME (None FOR THE API SET)
+        self.gps = None # GPS SENTENCES OF A PREFETCHED FRAME
+        self.gps_error = None # SDK ERROR OF A PREFETCHED FRAME WITHOUT GPS
+        self.panorama = None # SOFTWARE PANORAMA RENDERER
+        self.index = None # SIDECAR FRAME METADATA INDEX
+        if backend == 'pgr':
+            self.pgrfile = self.recording
+            self.ladybugImage = None
+        else:
+            self.ladybug = LadybugAPI( self.fname )
 
     def __del__(self):
+        self.set_prefetch(0)
         del self.ladybug
+        del self.pgrfile
 
 
 
@@ -79,16 +118,46 @@ class Ladybug3stream:
         'SIFT' as a second argument
 
         @arg goto: (int) The position to move to in the stream file.
-            If the string 'SIFT' is in arg list, creates *.SIFTpgm images.
+            If the string 'SIFT' is in arg list, creates *.SIFTpgm images
+            for the external SIFT program (see create_SIFT_image_set).
+        @kwarg cameras: (list) Only convert these camera units. Other cameras
+            are converted when first asked for with image() or image_array().
         @return: (bool) True if successful, False if there was an error.
         '''
+        cameras = kwargs.get('cameras')
+        # PURE-PYTHON BACKEND: READ THE FRAME HEADER ONLY
+        if self.ladybug is None:
+            assert 0 <= goto < self.pgrfile.total_frames, 'frame out of bounds.'
+            self.ladybugImage = self.pgrfile.image_header( goto )
+            self.next_frame = goto + 1
+            return True
+
+        # A FRAME WITH IMAGES IN THE CACHE IS READ BUT NOT CONVERTED
+        cached = (self.cache is not None and 'SIFT' not in args and
+                  self.cache.has_frame(goto))
+
+        # TAKE THE FRAME FROM THE PREFETCH RING IF NOT MAKING SIFT IMAGES
+        if (self.prefetcher and not cached and 'SIFT' not in args and
+            set(cameras or range(6)) <= set(self.prefetcher.cameras)):
+            slot = self.prefetcher.get( goto )
+            self.buffers = slot.buffers
+            self.gps = slot.gps
+            self.gps_error = slot.gps_error
+            self.ladybug.ladybugImage = slot.header
+            self.color_method = self.prefetcher.color_processing
+            self.next_frame = goto + 1
+            return True
+        self.buffers = None
+        self.gps = None
+        self.gps_error = None
+
         # CHECK IF ALREADY POINTING TO DESIRED FRAME. ELSE MOVE POINTER.
-        if goto != self.next_frame:
+        if goto != self.ladybug.next_frame:
             assert goto >= 0, 'frame is not a positive integer.'
             assert goto < self.ladybug.total_frames, 'frame out of bounds.'
             # MOVE TO NEW POSITION
             self.ladybug.GoToImage( goto )
-            self.next_frame = goto
+        self.next_frame = goto
 
         # READ ONE FRAME FROM STREAM
         self.ladybug.ReadImageFromStream()
@@ -100,9 +169,12 @@ class Ladybug3stream:
         if 'SIFT' in args:
             okay = self.create_SIFT_image_set()
             if not okay:
-                self.create_display_image_set()
+                self.create_display_image_set( cameras )
+        elif cached:
+            # CONVERTED ON A CACHE MISS IN image_array
+            self.create_display_image_set( [] )
         else:
-            self.create_display_image_set()
+            self.create_display_image_set( cameras )
 
 
 
@@ -111,11 +183,15 @@ class Ladybug3stream:
         return True
 
 
-    def create_display_image_set(self):
+    def create_display_image_set(self, cameras=None):
         # SET COLOR PROCESSING METHOD
         self.ladybug.SetColorProcessingMethod( self.DISP_COLOR_PROCESSING )
+        self.color_method = self.DISP_COLOR_PROCESSING
+        if cameras is not None and len(cameras) == 0:
+            self.ladybug.AcquireBuffers().cameras = ()
+            return
         # CONVERT THE IMAGE TO BRGU FORMAT TEXTURE BUFFERS
-        self.ladybug.ConvertToMultipleBGRU32()
+        self.ladybug.ConvertToMultipleBGRU32( cameras=cameras )
 
 
     def create_SIFT_image_set(self):
@@ -123,6 +199,11 @@ class Ladybug3stream:
 
         Checks if *.key or *.SIFTpgm files have been created. Returns False
         if they are already completed.
+
+        The images are the input of the external SIFT program, which writes
+        the *.key files next to them, so they stay one file per camera in the
+        working folder. Features computed in Python with FeatureMatcher are
+        kept in a feature store instead (see SFM/featurestore.py extract).
         '''
         # GET IMAGE INFORMATION
         imCols = self.ladybug.ladybugImage.uiCols
@@ -141,9 +222,10 @@ class Ladybug3stream:
 
         # SET COLOR PROCESSING METHOD FOR SIFT IMAGES
         self.ladybug.SetColorProcessingMethod( self.SIFT_COLOR_PROCESSING )
+        self.color_method = self.SIFT_COLOR_PROCESSING
 
-        # TRANSFER FRAME FROM STREAM TO IMAGE BUFFERS
-        self.ladybug.ConvertToMultipleBGRU32()
+        # TRANSFER FRAME FROM STREAM TO IMAGE BUFFERS (ONLY THE CAMERAS NEEDED)
+        self.ladybug.ConvertToMultipleBGRU32( cameras=create_these )
 
         # RETRIEVE AND SAVE IMAGE SET
         for cam in create_these:
@@ -162,9 +244,58 @@ class Ladybug3stream:
         set from stream file and place into image buffers.
 
         @arg cam: (int) The camera position that recorded the image.
-        @return: (Image) A PIL Image class 3-band image.
+        @return: (Image) A PIL Image class 3-band image, upright on the
+            canvas of the unrotated image (e.g. 1616x1232), as the
+            original PIL rotate(-90): 192 rows are cut at the top and bottom
+            and 192 black columns are added at each side. Key points, the
+            saved view settings and *.SIFTpgm files use this geometry.
+        '''
+        return Image.fromarray( unrotated_canvas( self.image_array(cam) ) )
+
+
+    def image_array(self, cam=None, rotate=True, order='RGB'):
+        '''Camera images as ndarray views over the image buffers (no copy).
+
+        @PRECONDITION: run the load() method to retrieve image
+        set from stream file and place into image buffers.
+
+        @arg cam: (int) Camera position, or None for all six cameras.
+        @kwarg rotate: (bool) Rotate to upright. Rotated views are not
+            contiguous and have the full rotated size (e.g. 1232 cols by
+            1616 rows), unlike image(), which keeps the unrotated canvas.
+        @kwarg order: (str) 'RGB', 'BGR' or 'BGRU' channel order. Unrotated
+            'BGRU' views are contiguous and can be passed to OpenCV as is,
+            e.g. cv2.cvtColor(arr, cv2.COLOR_BGRA2GRAY).
+        @return: (ndarray) (rows, cols, channels) or (6, rows, cols, channels)
+            uint8 array. Overwritten when the next frame is loaded. With the
+            cache on (see set_cache), single camera images are read-only
+            copies that are not overwritten.
         '''
-        return self.ladybug.GetImageFromBuffer(cam).rotate(-90).convert('RGB')
+        if self.cache is None or cam is None:
+            return self._buffer_array(cam, rotate, order)
+        key = (self.next_frame-1, cam, self.color_method, rotate, order)
+        arr = self.cache.get( key )
+        if arr is None:
+            arr = self.cache.put( key, self._buffer_array(cam, rotate, order) )
+        return arr
+
+
+    def _buffer_array(self, cam, rotate, order):
+        buffers = self.buffers or self.ladybug.AcquireBuffers()
+        # CONVERT CAMERAS SKIPPED BY loadframe(cameras=...)
+        missing = set(range(6) if cam is None else [cam]) - set(buffers.cameras)
+        if missing:
+            assert self.buffers is None, 'camera not converted by the prefetch worker.'
+            converted = buffers.cameras
+            self.ladybug.ConvertToMultipleBGRU32( cameras=missing )
+            buffers.cameras = tuple(sorted(set(converted) | missing))
+        arr = channel_order( self.ladybug.GetImageArray( buffers ), order )
+        if rotate:
+            # CLOCKWISE. PIL rotate(-90) ALSO KEPT THE CANVAS SIZE, SEE image()
+            arr = rot90(arr, -1, axes=(1,2))
+        if cam is not None:
+            return arr[cam]
+        return arr
 
 
     def getGPSdata(self):
@@ -173,6 +304,15 @@ class Ladybug3stream:
         Return the GPS data for the frame currently loaded into
         image buffers.
         '''
+        if self.gps:
+            gpsdata = {}
+            for sentence in ["GPRMC", "GPGGA", "GPGSA"]:
+                gpsdata.update( self.gps[sentence]._asdict() )
+            return gpsdata
+        # A PREFETCHED FRAME WITHOUT GPS. THE SDK IMAGE IS ANOTHER FRAME.
+        if self.gps_error is not None:
+            raise self.gps_error
+
         # Use GPRMC data (Time and coordinates)
         gpsdata = self.ladybug.GetGPSNMEADataFromImage("GPRMC")._asdict()
 
@@ -186,23 +326,40 @@ class Ladybug3stream:
 
 
     def getNumberOfFrames(self):
+        if self.ladybug is None:
+            return self.pgrfile.total_frames
         return self.ladybug.total_frames
 
 
     def getFrameInfo(self):
+        '''Frame information and GPGGA data of the loaded frame.
+
+        GPGGA data is None with the 'pgr' backend.
+        '''
         frameInfo = namedtuple('frameInfo', 'frame seqid lat lon alt time microsec' )
+        if self.ladybug is None:
+            LImage, gpsdata = self.ladybugImage, None
+        else:
+            LImage = self.ladybug.ladybugImage
+            if self.gps:
+                gpsdata = self.gps["GPGGA"]
+            elif self.gps_error is not None:
+                raise self.gps_error
+            else:
+                gpsdata = self.ladybug.GetGPSNMEADataFromImage()
         return frameInfo(self.next_frame-1,
-                         self.ladybug.ladybugImage.ulSequenceId,
-                         self.ladybug.ladybugImage.dGPSLatitude,
-                         self.ladybug.ladybugImage.dGPSLongitude,
-                         self.ladybug.ladybugImage.dGPSAltitude,
-                         time.ctime(self.ladybug.ladybugImage.ulTimeSeconds),
-                         self.ladybug.ladybugImage.ulTimeMicroSeconds ), \
-               self.ladybug.GetGPSNMEADataFromImage()
-
-
-    def getVideoGPSlog(self):
-        log = self.get_frame_gps_log()
+                         LImage.ulSequenceId,
+                         LImage.dGPSLatitude,
+                         LImage.dGPSLongitude,
+                         LImage.dGPSAltitude,
+                         time.ctime(LImage.ulTimeSeconds),
+                         LImage.ulTimeMicroSeconds ), gpsdata
+
+
+    def getVideoGPSlog(self, fast=False):
+        log = self.get_frame_gps_log(fast)
+        if fast or self.ladybug is None:
+            return log
         # MOVE POINTER BACK TO PREVIOUS POSITION AND RELOAD
         self.ladybug.GoToImage( self.next_frame - 1 )
         self.ladybug.ReadImageFromStream()
@@ -229,37 +386,248 @@ class Ladybug3stream:
         self.ladybug.ConvertToMultipleBGRU32()
         self.ladybug.UpdateTextures()
         self.ladybug.RenderOffScreenImage(LADYBUG_PANORAMIC)
-
-        # SAVE IMAGE
-        savename += str(self.next_frame-1) + '.jpg'
-        self.ladybug.SaveImage(savename, LADYBUG_FILEFORMAT_JPG)
+        im = self.ladybug.GetProcessedImage()
 
         # OFFSET IMAGE HORIZONTALLY (WRAPS AROUND)
         if carfront:
-            im = Image.open(savename)
-            sizex = im.size[0]
-            if heading:
-                xoffset = int((3/4.)*sizex - carfront - heading*sizex/360.)
-            else:
-                xoffset = sizex/2 - int(carfront)
-            im = ImageChops.offset(im, xoffset, 0 )
-            im.save(savename, "JPEG")
+            im = ImageChops.offset(im, panorama_offset(im.size[0], carfront, heading), 0 )
 
-        # ADD GPS DATA TO IMAGE FILE
-        if addGPS:
-            self.addGPStoJPEG(savename )
+        # SAVE IMAGE ONCE, WITH THE GPS DATA
+        LImage = self.ladybug.ladybugImage
+        gps = ((LImage.dGPSLatitude, LImage.dGPSLongitude, LImage.dGPSAltitude)
+               if addGPS else None)
+        savename += str(self.next_frame-1) + '.jpg'
+        with open(savename, 'wb') as wfile:
+            wfile.write( encode_jpeg(im, gps=gps) )
 
         return savename
 
 
+    def render_offscreen(self, output=LADYBUG_PANORAMIC, size=None, order='RGB'):
+        '''Render the loaded frame with the SDK and return the image without
+        writing a file.
+
+        @kwarg output: One LadybugOutputImage type (enums.OFFSCREEN_IMAGE_TYPES),
+            e.g. LADYBUG_PANORAMIC, LADYBUG_DOME or LADYBUG_RECTIFIED_CAM2.
+        @kwarg size: (tuple) Image (cols, rows). Default is the last size set.
+        @kwarg order: (str) 'RGB', 'BGR' or 'BGRU' channel order.
+        @return: (ndarray) (rows, cols, channels) view over the SDK's
+            off-screen image (no copy), normally uint8 (see
+            API.GetProcessedImageArray). Overwritten by the next rendering.
+        '''
+        # THE PREFETCH WORKER OR THE CACHE MAY HAVE LOADED THE FRAME
+        if self.ladybug.next_frame != self.next_frame:
+            self.ladybug.GoToImage( self.next_frame - 1 )
+            self.ladybug.ReadImageFromStream()
+        if size is not None:
+            self.ladybug.SetOffScreenImageSize( output, *size )
+        self.ladybug.ConvertToMultipleBGRU32()
+        self.ladybug.UpdateTextures()
+        arr = self.ladybug.RenderOffScreenImage( output, asarray=True )
+        return channel_order( arr, order )
+
+
+    def export_panoramas(self, frames, outdir='', carfront=None, heading=None,
+                         addGPS=True, threads=4, **kwargs):
+        '''Save the panoramas of many frames (see export.PanoramaExporter).
+
+        Rendering is set up once. Shifting and JPEG encoding run on a pool of
+        *threads* threads. Prints the throughput in frames per second.
+
+        @arg frames: Frame numbers in increasing order.
+        @kwarg outdir: (str) Folder for the <frame>.jpg files.
+        @kwarg heading: Heading in degrees, or a sequence indexed by frame.
+        @return: (list) Saved file names.
+        '''
+        exporter = PanoramaExporter(self.ladybug, outdir, carfront=carfront,
+                                    heading=heading, addGPS=addGPS,
+                                    threads=threads, **kwargs)
+        saved = exporter.run( frames )
+        # MOVE POINTER BACK TO PREVIOUS POSITION AND RELOAD
+        if self.next_frame > 0:
+            self.ladybug.GoToImage( self.next_frame - 1 )
+            self.ladybug.ReadImageFromStream()
+        return saved
+
+
+
+    def render_panorama(self, size=(2048, 1024), threads=4, calibration=None,
+                        method=LADYBUG_HQLINEAR):
+        '''Software panorama of the loaded frame (see panorama.py). Does not
+        need an OpenGL context. The remap tables of each size are built once.
+
+        With the 'pgr' backend the camera images are demosaiced from the
+        stream's JPEG tiles (see demosaic.py). The calibration file and the
+        rectify maps are saved once on a machine with the SDK:
+
+            stream = Ladybug3stream( fname )
+            save_calibration( 'rig/calibration.npz',
+                              calibration_from_api(stream.ladybug) )
+            stream.load_rectify_maps().save( 'rig' )
+
+        and used on machines without it:
+
+            stream = Ladybug3stream( fname, backend='pgr' )
+            stream.loadframe( 10 )
+            pano = stream.render_panorama( calibration='rig/calibration.npz' )
+
+        @kwarg size: (tuple) Panorama (cols, rows).
+        @kwarg threads: (int) Rendering threads, set on first use.
+        @kwarg calibration: (str) Calibration file (see
+            panorama.save_calibration) with the rectify maps in its folder.
+            Needed with the 'pgr' backend.
+        @kwarg method: (int) Demosaic method of the 'pgr' backend.
+        @return: (ndarray) (rows, cols, 3) uint8 RGB panorama.
+        '''
+        if self.ladybug is not None:
+            if self.panorama is None:
+                self.ladybug.LoadConfig()
+                maps = self.rectify_maps or self.load_rectify_maps( report=False )
+                self.panorama = PanoramaRenderer( calibration_from_api(self.ladybug),
+                                                  maps, threads=threads )
+            return self.panorama.render( self.image_array(rotate=False), size )
+
+        # PURE-PYTHON BACKEND: RAW TILES OF THE LOADED FRAME
+        stippled = self.pgrfile.file(0).header.stippledFormat
+        images = [demosaic( self.pgrfile.camera_tiles( self.next_frame - 1, cam ),
+                            stippled, method ) for cam in range(6)]
+        if self.panorama is None:
+            assert calibration, 'a calibration file is needed without the SDK'
+            maps = RectifyMaps( images[0].shape[0], images[0].shape[1] )
+            if not maps.load( os.path.dirname(calibration) ):
+                raise IOError, 'no rectify maps next to {0}'.format(calibration)
+            self.panorama = PanoramaRenderer( load_calibration(calibration), maps,
+                                              image_size=images[0].shape[1::-1],
+                                              threads=threads )
+        return self.panorama.render( images, size )
+
+
 
     def closeStream(self):
+        self.set_prefetch(0)
+        if self.ladybug is not None:
+            self.ladybug.ReleaseBuffers()
         del self.ladybug
 
 
+    def set_prefetch(self, depth=4, cameras=range(6)):
+        '''Convert frames ahead of loadframe() on a worker thread.
+
+        The worker opens a second SDK context on the stream and converts the
+        next *depth* frames with DISP_COLOR_PROCESSING. loadframe() returns at
+        once when the frame is ready. 'SIFT' loads do not use the worker.
+
+        @kwarg depth: (int) Number of frames to convert ahead. 0 stops the
+            worker.
+        @kwarg cameras: (list) Camera units to convert. Loads that ask for
+            other cameras do not use the worker.
+        '''
+        if self.prefetcher:
+            self.prefetcher.close()
+            self.prefetcher = None
+            self.buffers = None
+            self.gps = None
+            self.gps_error = None
+        if depth > 0 and self.ladybug is not None:
+            self.prefetcher = FramePrefetcher( LadybugAPI( self.fname ), depth,
+                                               self.DISP_COLOR_PROCESSING,
+                                               cameras=cameras )
+
+
+    def batch(self, job, frames=None, processes=None, memory_limit=None,
+              chunksize=16):
+        '''Run a job on many frames in worker processes.
+
+        Each worker opens its own stream context. See batch.py for jobs.
+
+        @arg job: Module level function job(stream, frame).
+        @kwarg frames: Frame numbers, e.g. a keep-list (load_keep_list in
+            SFM/frameselect.py). Default is all frames.
+        @kwarg processes: (int) Number of worker processes. Default is the
+            number of cores.
+        @kwarg memory_limit: (int) Memory limit in bytes per worker (see
+            batch.BatchExecutor).
+        @kwarg chunksize: (int) Consecutive frames per task.
+        @return: (list) Job results in frame order.
+        '''
+        if frames is None:
+            frames = xrange( self.getNumberOfFrames() )
+        backend = 'sdk' if self.ladybug else 'pgr'
+        with BatchExecutor(StreamOpener( self.fname, backend ), processes,
+                           memory_limit, chunksize) as executor:
+            return executor.map( job, frames )
+
+
+    def set_cache(self, max_bytes=512 * 2**20):
+        '''Keep recently returned camera images in memory.
+
+        Images are cached by (frame, camera, color processing method,
+        rotation, channel order). Loading a frame that has cached images
+        reads the frame header but converts nothing until an image that is
+        not cached is asked for.
+
+        @kwarg max_bytes: (int) Memory budget. 0 turns the cache off.
+        '''
+        if max_bytes > 0:
+            self.cache = FrameCache( max_bytes )
+        else:
+            self.cache = None
+
+
+    def invalidate_cache(self, frame=None):
+        '''Drop the cached images of one frame, or of all frames.'''
+        if self.cache is not None:
+            self.cache.invalidate( frame )
+
+
+    def cache_stats(self):
+        '''Hit and miss counters and memory use of the image cache (or None).'''
+        if self.cache is not None:
+            return self.cache.stats()
+
+
+    def buffer_stats(self):
+        '''Image buffer sets of the pool shared by the open streams, with the
+        current and peak memory in bytes (see API.BufferPool).'''
+        return self.ladybug.pool.stats()
+
+
+    def prefetch_stats(self):
+        '''Hit, wait and miss counters of the prefetch worker (or None).'''
+        if self.prefetcher:
+            return self.prefetcher.stats()
+
+
+    def load_rectify_maps(self, step=8, report=True):
+        '''Use cached rectification lookup tables for rectifyPixel and
+        unrectifyPixel. Samples the API and saves the tables next to
+        config.txt the first time.
+
+        @kwarg step: (int) Grid spacing in pixels.
+        @kwarg report: (bool) Print the interpolation error against the
+            per-point API methods.
+        @return: The RectifyMaps object.
+        '''
+        maps = RectifyMaps(step=step)
+        if not maps.load(self.ladybug.dirname, self.ladybug.pszConfigFileName):
+            self.ladybug.LoadConfig()
+            maps.build(self.ladybug)
+            maps.save(self.ladybug.dirname)
+        if report:
+            for cam in sorted(maps.forward):
+                acc = maps.accuracy(self.ladybug, cam)
+                for name in ['rectify', 'unrectify']:
+                    print 'Camera', cam, name, 'error (px): mean {mean:.4f} rms {rms:.4f} max {max:.4f}'.format(**acc[name])
+        self.rectify_maps = maps
+        return maps
+
+
     def rectifyPixel(self, cam, x_arr, y_arr):
         '''Retrieves the rectified pixel position in an upright image.
         (API is sideways. This will handle the rotation.)
+
+        Uses the lookup tables from load_rectify_maps() when loaded. They
+        return float positions and nan for points that cannot be mapped.
         '''
         if isinstance(x_arr, (int,list)):
             x_arr = array(list(x_arr))
@@ -268,6 +636,9 @@ class Ladybug3stream:
         if len(x_arr) != len(y_arr):
             print 'Array lengths are not equal'
             return
+        if self.rectify_maps:
+            rx, ry = self.rectify_maps.rectify( cam, 1231 - x_arr, y_arr )
+            return 1231 - rx, ry
         rx = 1231 - x_arr.copy().astype(int) # AXIS ROTATED IN API
         ry = y_arr.copy().astype(int)
 #        if isConfigLoaded() == False:
@@ -285,6 +656,9 @@ class Ladybug3stream:
         '''Retrieves the rectified pixel position in an upright image.
         (API is sideways. This will handle the rotation.)
         '''
+        if self.rectify_maps:
+            rx, ry = self.rectify_maps.unrectify( cam, 1231 - array(xx), yy )
+            return 1231 - rx, ry
         try:
             rx = 1231 - xx.copy().astype(int) # AXIS ROTATED IN API
             ry = yy.copy().astype(int)
@@ -313,7 +687,59 @@ class Ladybug3stream:
         print repr(edata)
 
 
-    def get_frame_gps_log(self):
+    def frame_index(self):
+        '''Sidecar metadata index of all files of the recording (see
+        frameindex.py). Built the first time and updated when a stream file
+        changes.
+
+        @return: (RecordingIndex) Columns with recording frame numbers, with
+            seek_time() and seek_seqid() lookups.
+        '''
+        if self.index is None:
+            self.index = RecordingIndex( [FrameIndex( fname, update=False )
+                                          for fname in self.recording.fnames],
+                                         self.recording.starts )
+        self.index.update()
+        return self.index
+
+
+    def scan_files(self, job, processes=None):
+        '''Run a metadata job on each file of the recording in worker
+        processes (see recording.Recording.scan).
+
+        @arg job: Module level function job(fname, first_frame).
+        @return: (list) Job results in file order.
+        '''
+        return self.recording.scan( job, processes )
+
+
+    def frame_indexes(self, processes=None):
+        '''Sidecar metadata indexes of all files of the recording, updated
+        with one process per file.
+
+        @return: (list) FrameIndex of each file. Frame numbers are local to
+            the file. Add recording.starts[i] for recording frame numbers.
+        '''
+        self.scan_files( update_frame_index, processes )
+        return [FrameIndex( fname, update=False ) for fname in self.recording.fnames]
+
+
+    def get_frame_gps_log(self, fast=False, processes=None):
+        '''GPS log table of every frame in the recording.
+
+        @kwarg fast: (bool) Read the frame headers and the GPS section of the
+            stream files directly (see gpslog.py) instead of reading every
+            frame through the SDK. Always used with the 'pgr' backend. The
+            gpsUTC and valid columns then come from the nearest GPRMC fix of
+            the GPS section, not the frame's own GPRMC data.
+        @kwarg processes: (int) Worker processes for the fast scan of a
+            recording split over several files.
+        @return: (ndarray) Structured array of frame, seqid, skipped, valid,
+            lat, lon, alt, gpsUTC, imageUTC.
+        '''
+        if fast or self.ladybug is None:
+            return recording_gps_log( self.recording.fnames, processes )
+
         dt = [('frame', int), ('seqid', int), ('skipped', int),
               ('valid', bool),
               ('lat', float), ('lon', float), ('alt', float),
@@ -403,4 +829,31 @@ class Ladybug3stream:
         flen = self.ladybug.GetCameraUnitFocalLength
         imcen = self.ladybug.GetCameraUnitImageCenter
         print flen(0), flen(1), flen(2), flen(3), flen(4), flen(5)
-        print imcen(0), imcen(1), imcen(2), imcen(3), imcen(4), imcen(5)
\ No newline at end of file
+        print imcen(0), imcen(1), imcen(2), imcen(3), imcen(4), imcen(5)
+
+
+
+def unrotated_canvas(arr):
+    '''Upright (rows, cols, ...) image centered on a (cols, rows) canvas,
+    cropped and padded with black, like PIL Image.rotate(-90) without
+    expand on the unrotated image.'''
+    rows, cols = arr.shape[:2]
+    canvas = zeros((cols, rows) + arr.shape[2:], arr.dtype)
+    if rows >= cols:
+        d = (rows - cols) // 2
+        canvas[:, d:d+cols] = arr[d:d+cols]
+    else:
+        d = (cols - rows) // 2
+        canvas[d:d+rows] = arr[:, d:d+rows]
+    return canvas
+
+
+
+def channel_order(arr, order):
+    '''View of a BGRU image array in 'RGB', 'BGR' or 'BGRU' channel order.'''
+    if order == 'RGB':
+        return arr[..., 2::-1]
+    if order == 'BGR':
+        return arr[..., :3]
+    assert order == 'BGRU', 'order must be RGB, BGR or BGRU.'
+    return arr
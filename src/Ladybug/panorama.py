@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Software equirectangular panorama renderer.
+
+RenderOffScreenImage(LADYBUG_PANORAMIC) needs ladybug.dll and an OpenGL
+context. PanoramaRenderer makes the same kind of panorama from the six camera
+images with NumPy and OpenCV, so it also runs on headless machines.
+
+For each output size a remap table is built once from the rig calibration:
+every panorama pixel is a direction on a sphere around the camera, projected
+into each camera unit and mapped to the distorted image with the
+rectification lookup tables (see rectify.py). Cameras are blended with
+feathered alpha weights that fall off towards the image edges and sum to one.
+The tables are split into bands of rows that are rendered on a thread pool.
+
+Calibration is a list of (K, H) for the camera units, in the upright image
+convention of LadybugProjectionAssistant (Ladybug_SfM.py): K is the 3x3
+intrinsic matrix of the upright rectified image, H the 4x4 transformation from
+camera to Ladybug coordinates. calibration_from_api() reads it from the SDK.
+save_calibration() and load_calibration() keep a copy for machines without
+the SDK.
+
+Camera images are in the API (sideways) orientation, e.g.
+Ladybug3stream.image_array(rotate=False). The panorama is upright, with the
+front of camera 0 at the center column and camera 1 to its right.
+
+:REQUIRES: numpy, cv2 (optional, faster sampling)
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 16:52:37 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 16:52:37 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+from multiprocessing.pool import ThreadPool
+from numpy import (array, arange, zeros, empty, full, dot, sin, cos, pi,
+                   clip, minimum, floor, isfinite, flatnonzero, float32,
+                   int32, uint8, ascontiguousarray, savez, load)
+try:
+    import cv2
+except ImportError:
+    cv2 = None # SAMPLED WITH NUMPY
+
+# cv2.remap MAPS ARE LIMITED TO SHRT_MAX COLUMNS, TABLES ARE CUT INTO ROWS
+REMAP_COLS = 1024
+
+
+
+#===============================================================================
+# CALIBRATION
+#===============================================================================
+def euler_zyx_H(Rx, Ry, Rz, Tx, Ty, Tz):
+    '''Camera to Ladybug transformation from the SDK's Euler ZYX extrinsics,
+    corrected to the upright image orientation.'''
+    c, s = cos, sin
+    H = array(
+[[c(Rz)*c(Ry), c(Rz)*s(Ry)*s(Rx)-s(Rz)*c(Rx), c(Rz)*s(Ry)*c(Rx)+s(Rz)*s(Rx), Tx],
+ [s(Rz)*c(Ry), s(Rz)*s(Ry)*s(Rx)+c(Rz)*c(Rx), s(Rz)*s(Ry)*c(Rx)-c(Rz)*s(Rx), Ty],
+ [-s(Ry),      c(Ry)*s(Rx),                   c(Ry)*c(Rx),                   Tz],
+ [0,0,0,1]])
+    # ROTATE -90 DEGREES ABOUT THE OPTICAL AXIS (image right side up)
+    H[:3,:3] = dot(H[:3,:3], array([[0.,1.,0.], [-1.,0.,0.], [0.,0.,1.]]))
+    return H
+
+
+def calibration_from_api(ladybug, cams=range(6), rows=1232):
+    '''(K, H) of each camera unit from the loaded SDK configuration.
+
+    :PARAMETERS:
+        *ladybug* --- LadybugAPI with the configuration loaded.
+        **rows** --- Rows of the API (sideways) rectified image.
+    '''
+    calibration = []
+    for cam in cams:
+        e = ladybug.GetCameraUnitExtrinsics( cam )
+        f = ladybug.GetCameraUnitFocalLength( cam )
+        X, Y = ladybug.GetCameraUnitImageCenter( cam )
+        # API CENTER IS (col, row) OF THE SIDEWAYS IMAGE
+        K = array([[f, 0., rows - 1 - Y], [0., f, X], [0., 0., 1.]])
+        H = euler_zyx_H(*[e[name] for name in ('Rx','Ry','Rz','Tx','Ty','Tz')])
+        calibration.append( (K, H) )
+    return calibration
+
+
+def save_calibration(fname, calibration):
+    savez(fname, K=array([K for K, H in calibration]),
+                 H=array([H for K, H in calibration]))
+
+
+def load_calibration(fname):
+    data = load(fname)
+    return zip(data['K'], data['H'])
+
+
+
+#===============================================================================
+# RENDERER
+#===============================================================================
+class PanoramaRenderer:
+    '''Blends camera images into equirectangular panoramas.
+
+    :PARAMETERS:
+        *calibration* --- List of (K, H) for each camera unit.
+        **rectify_maps** --- RectifyMaps of the camera units. None if the
+            images are already rectified.
+        **image_size** --- (cols, rows) of the API (sideways) camera images.
+        **radius** --- Radius in meters of the sphere the cameras are
+            projected on. Objects at this distance are stitched exactly.
+        **feather** --- Width in pixels of the alpha ramp at the image edges.
+        **band_rows** --- Panorama rows per band.
+        **threads** --- Number of rendering threads.
+    '''
+    def __init__(self, calibration, rectify_maps=None, image_size=(1616, 1232),
+                 radius=20., feather=100., band_rows=64, threads=4):
+        self.calibration = list(calibration)
+        self.rectify_maps = rectify_maps
+        self.image_size = image_size
+        self.radius = radius
+        self.feather = feather
+        self.band_rows = band_rows
+        self.pool = ThreadPool(threads)
+        self.tables = {} # size: list of bands
+
+
+    def __del__(self):
+        self.pool.terminate()
+
+
+    def table(self, size):
+        '''Remap table of one panorama (cols, rows) size. Built on first use.
+
+        :RETURNS:
+            List of (start, stop, parts) bands, where start and stop are flat
+            pixel indices and parts is a list of (cam, index, map_x, map_y,
+            weight) arrays for the pixels of the band that the camera sees.
+        '''
+        size = tuple(size)
+        if size not in self.tables:
+            width, height = size
+            bands = [(r, min(r + self.band_rows, height))
+                     for r in xrange(0, height, self.band_rows)]
+            self.tables[size] = self.pool.map(
+                        lambda band: self._build_band(size, *band), bands)
+        return self.tables[size]
+
+
+    def render(self, images, size=(2048, 1024), out=None):
+        '''Panorama of one frame.
+
+        :PARAMETERS:
+            *images* --- Camera images (rows, cols, channels) in the API
+                orientation, indexed by camera unit.
+            **size** --- Panorama (cols, rows).
+            **out** --- (rows, cols, channels) uint8 array to render into.
+
+        :RETURNS:
+            (rows, cols, channels) uint8 panorama with the channel order of
+            the images.
+        '''
+        width, height = size
+        bands = self.table(size)
+        # cv2 NEEDS CONTIGUOUS IMAGES, FLIPPED CHANNEL VIEWS ARE COPIED ONCE
+        images = dict((cam, ascontiguousarray(images[cam]))
+                      for cam in xrange(len(self.calibration)))
+        channels = images[0].shape[2]
+        if out is None:
+            out = empty((height, width, channels), uint8)
+        flat = out.reshape(-1, channels)
+        self.pool.map(lambda band: self._render_band(band, images, flat), bands)
+        return out
+
+
+    def _render_band(self, band, images, flat):
+        start, stop, parts = band
+        acc = zeros((stop - start, flat.shape[1]), float32)
+        for cam, index, map_x, map_y, weight in parts:
+            acc[index] += weight[:, None] * remap(images[cam], map_x, map_y)[:len(index)]
+        acc += 0.5
+        flat[start:stop] = clip(acc, 0, 255, acc)
+
+
+    def _build_band(self, size, row0, row1):
+        width, height = size
+        cols, rows = self.image_size
+        # PANORAMA PIXEL DIRECTIONS IN LADYBUG COORDINATES (Z UP, X FORWARD)
+        r, c = divmod(arange(row0 * width, row1 * width), width)
+        lat = pi/2 - pi * (r + 0.5) / height
+        lon = 2*pi * (c + 0.5) / width - pi
+        X = self.radius * array([cos(lat) * cos(lon), -cos(lat) * sin(lon), sin(lat)])
+
+        parts = []
+        total = zeros(X.shape[1])
+        for cam, (K, H) in enumerate(self.calibration):
+            # UPRIGHT RECTIFIED IMAGE POSITIONS (u ACROSS, v DOWN)
+            x = dot(H[:3,:3].T, X - H[:3,3:4])
+            with_z = x[2] > 1e-6
+            x[2][~with_z] = 1.
+            u = (K[0,0] * x[0] + K[0,1] * x[1]) / x[2] + K[0,2]
+            v = K[1,1] * x[1] / x[2] + K[1,2]
+            edge = minimum(minimum(u, rows - 1 - u), minimum(v, cols - 1 - v))
+            weight = clip(edge / self.feather, 0, 1)
+            weight[~with_z] = 0
+            index = flatnonzero(weight > 0)
+            # API (SIDEWAYS) ROW AND COLUMN
+            api_row, api_col = rows - 1 - u[index], v[index]
+            if self.rectify_maps is not None:
+                api_row, api_col = self.rectify_maps.unrectify(cam, api_row, api_col)
+                seen = isfinite(api_row) & isfinite(api_col)
+                index, api_row, api_col = index[seen], api_row[seen], api_col[seen]
+            if not len(index):
+                continue
+            total[index] += weight[index]
+            parts.append( [cam, index, api_col, api_row, weight[index]] )
+
+        # NORMALIZE WEIGHTS AND PAD MAPS TO FULL REMAP ROWS
+        for part in parts:
+            cam, index, map_x, map_y, weight = part
+            npad = -len(index) % REMAP_COLS
+            part[1] = index.astype(int32)
+            part[2] = _padded(map_x, npad).reshape(-1, REMAP_COLS)
+            part[3] = _padded(map_y, npad).reshape(-1, REMAP_COLS)
+            part[4] = (weight / total[index]).astype(float32)
+        return row0 * width, row1 * width, [tuple(part) for part in parts]
+
+
+
+def _padded(arr, npad):
+    '''float32 copy of *arr* with *npad* positions outside of any image.'''
+    out = full(len(arr) + npad, -2., float32)
+    out[:len(arr)] = arr
+    return out
+
+
+def remap(image, map_x, map_y):
+    '''Bilinear samples (N, channels) float32 of an image at the positions
+    of two (rows, REMAP_COLS) maps. Positions outside the image are black.'''
+    channels = image.shape[2]
+    if cv2 is not None:
+        out = cv2.remap(image, map_x, map_y, cv2.INTER_LINEAR,
+                        borderMode=cv2.BORDER_CONSTANT)
+        return out.reshape(-1, channels).astype(float32)
+    x, y = map_x.ravel(), map_y.ravel()
+    x0, y0 = floor(x), floor(y)
+    tx, ty = (x - x0)[:, None], (y - y0)[:, None]
+    x0, y0 = x0.astype(int32), y0.astype(int32)
+    out = zeros((len(x), channels), float32)
+    rows, cols = image.shape[:2]
+    for dy, wy in ((0, 1 - ty), (1, ty)):
+        for dx, wx in ((0, 1 - tx), (1, tx)):
+            yy, xx = y0 + dy, x0 + dx
+            inside = (yy >= 0) & (yy < rows) & (xx >= 0) & (xx < cols)
+            out[inside] += (wy * wx)[inside] * image[yy[inside], xx[inside]]
+    return out
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Pure-Python reader for Ladybug3 *.pgr stream files.
+
+Memory-maps a stream file and indexes the frames with the key offset table
+in the stream header (LadybugStreamHeadInfo). Raw frame data and the
+per-frame image header are read without ladybug.dll, so recordings can be
+indexed and read on machines without the Ladybug SDK.
+
+Frame layout of a (JPEG compressed) Ladybug3 stream:
+    - ulOffsetTable[k] is the file position of frame k * ulIncrement.
+    - Each frame starts with a 1024 byte image header. The LadybugImageInfo
+      block is at the start of this header.
+    - Bytes 0x340 to 0x3FF of the header hold 24 big-endian (offset, size)
+      pairs for the compressed Bayer tiles (6 cameras x 4 channels). Offsets
+      are relative to the start of the frame.
+    - Frames are padded to a multiple of ulPaddingSize.
+Frames between two key offsets are found by stepping over the frame sizes.
+Each key block is indexed the first time one of its frames is requested, or
+all at once with build_index().
+
+:REQUIRES: numpy
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 10:12:41 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 10:12:41 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+import mmap
+from cStringIO import StringIO
+from struct import unpack_from
+from numpy import zeros, int64, asarray
+from PIL import Image
+from structures import getLadybugStreamHeadInfo, getLadybugImageInfo
+
+#===============================================================================
+# STREAM FILE LAYOUT
+#===============================================================================
+STREAM_HEADER_SIZE = 3056
+FRAME_HEADER_SIZE = 1024
+IMAGE_INFO_SIZE = 120
+TILE_TABLE_OFFSET = 0x340
+NUMBER_OF_TILES = 24 # 6 CAMERAS x 4 BAYER CHANNELS
+FINGERPRINT = 0xCAFEBABE
+IMAGE_COLS, IMAGE_ROWS = 1616, 1232
+
+
+class PGRFile:
+    '''Memory-mapped, read-only access to the frames of one *.pgr file.
+
+    Frame data is returned as a buffer over the mapped file (no copy).
+    Frame numbers are local to this file (see header.ulNumberOfImages).
+    '''
+    def __init__(self, fname):
+        self.fname = fname
+        self._file = open(fname, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.header = getLadybugStreamHeadInfo( self._mm[:STREAM_HEADER_SIZE] )
+        self.total_frames = self.header.ulNumberOfImages
+        self.increment = max(self.header.ulIncrement, 1)
+
+        # FRAME OFFSETS AND SIZES. -1 UNTIL THE KEY BLOCK IS INDEXED
+        self.offsets = zeros(self.total_frames, int64) - 1
+        self.sizes = zeros(self.total_frames, int64) - 1
+        self.nkeys = min(self.header.ulNumberOfKeyIndex,
+                         len(self.header.ulOffsetTable),
+                         (self.total_frames + self.increment - 1) // self.increment)
+        for k in xrange(self.nkeys):
+            self.offsets[k * self.increment] = self.header.ulOffsetTable[k]
+
+        # THE CAMERA WRITES LadybugImageInfo BIG-ENDIAN. CHECK THE FINGERPRINT.
+        self.byteorder = '>'
+        if self.total_frames and self.nkeys:
+            if unpack_from('>L', self._mm, int(self.offsets[0]))[0] != FINGERPRINT:
+                self.byteorder = '<'
+
+    def __del__(self):
+        self.close()
+
+    def __len__(self):
+        return self.total_frames
+
+
+    def close(self):
+        '''Release the memory map and file handle.'''
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+
+
+    def frame_offset(self, n):
+        '''File position of frame *n*.'''
+        if self.offsets[n] < 0:
+            self._index_block(n)
+        return int(self.offsets[n])
+
+
+    def frame_size(self, n):
+        '''Size of frame *n* in bytes, including padding.'''
+        if self.sizes[n] < 0:
+            self._index_block(n)
+        return int(self.sizes[n])
+
+
+    def frame(self, n):
+        '''Returns a read-only buffer over the raw data of frame *n*.'''
+        return buffer(self._mm, self.frame_offset(n), self.frame_size(n))
+
+
+    def tile_table(self, n):
+        '''Returns the 24 (offset, size) pairs of the compressed tiles of frame
+        *n*. Offsets are relative to the start of the frame.'''
+        table = unpack_from('>%dL' % (2*NUMBER_OF_TILES), self._mm,
+                            self.frame_offset(n) + TILE_TABLE_OFFSET)
+        return zip(table[0::2], table[1::2])
+
+
+    def camera_tiles(self, n, cam):
+        '''Returns the four decoded Bayer channel tiles of camera *cam* in
+        frame *n* as (rows/2, cols/2) uint8 arrays, in tile table order.
+
+        See demosaic.from_tiles and demosaic.demosaic.
+        '''
+        base = self.frame_offset(n)
+        tiles = []
+        for offset, size in self.tile_table(n)[cam*4:cam*4+4]:
+            jpeg = self._mm[base+offset:base+offset+size]
+            tiles.append( asarray(Image.open(StringIO(jpeg)).convert('L')) )
+        return tiles
+
+
+    def imageinfo(self, n):
+        '''Returns the LadybugImageInfo stored with frame *n*.'''
+        offset = self.frame_offset(n)
+        return getLadybugImageInfo( self._mm[offset:offset+IMAGE_INFO_SIZE],
+                                    self.byteorder )
+
+
+    def image_header(self, n):
+        '''Returns the LadybugImage fields for frame *n*.
+
+        Same attribute names as structures.getLadybugImage. Fields that only
+        exist in SDK memory (pData, timeStamp) are None.
+        '''
+        LImage = self.imageinfo(n)
+        LImage._extend([
+            ('uiCols',          IMAGE_COLS),
+            ('uiRows',          IMAGE_ROWS),
+            ('dataFormat',      self.header.dataFormat),
+            ('resolution',      self.header.resolution),
+            ('timeStamp',       None),
+            ('pData',           None),
+            ('bStippled',       True),
+            ('uiDataSizeBytes', self.frame_size(n)),
+            ('uiSeqNum',        n),
+            ('uiBufferIndex',   0) ])
+        return LImage
+
+
+    def read(self, n):
+        '''Returns the image header and the raw data buffer of frame *n*.'''
+        return self.image_header(n), self.frame(n)
+
+
+    def build_index(self):
+        '''Index every frame in the file. Returns the array of frame offsets.'''
+        for start in xrange(0, self.total_frames, self.increment):
+            if self.sizes[start] < 0:
+                self._index_block(start)
+        return self.offsets
+
+
+    def _index_block(self, n):
+        '''Step through the frames of the key block containing frame *n*.'''
+        assert 0 <= n < self.total_frames, 'frame out of bounds.'
+        i = min(n // self.increment, self.nkeys - 1) * self.increment
+        # FRAMES PAST THE LAST KEY ARE STEPPED TO FROM THE LAST KEY
+        stop = max(min(i + self.increment, self.total_frames), n + 1)
+        while i < stop:
+            if self.offsets[i] < 0:
+                self.offsets[i] = self.offsets[i-1] + self.sizes[i-1]
+            if self.sizes[i] < 0:
+                self.sizes[i] = self._record_size( int(self.offsets[i]) )
+            i += 1
+
+
+    def _record_size(self, offset):
+        '''Frame size from the tile table in the frame header.'''
+        table = unpack_from('>%dL' % (2*NUMBER_OF_TILES), self._mm,
+                            offset + TILE_TABLE_OFFSET)
+        end = max([FRAME_HEADER_SIZE] +
+                  [o + s for o, s in zip(table[0::2], table[1::2]) if s])
+        pad = self.header.ulPaddingSize
+        if pad:
+            end = ((end + pad - 1) // pad) * pad
+        return end
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Background frame reader for a Ladybug3 stream.
+
+A worker thread reads and converts the frames that follow the last requested
+frame into a ring of preallocated BGRU32 buffer sets. When frames are requested
+in sequence order the next frame is usually converted already and is returned
+without waiting. Any other request repositions the worker.
+
+The worker needs its own LadybugAPI context. It is the only thread that uses
+that context.
+
+:REQUIRES: ladybug.dll
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 12:20:44 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 12:20:44 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+import threading
+from API import buffer_pool
+
+
+
+class FrameSlot:
+    '''One converted frame: the buffer set, the LadybugImage header and the
+    GPS sentences keyed by NMEA sentence ID (None if the frame has no GPS,
+    and gps_error is the SDK error).'''
+    def __init__(self, buffers):
+        self.buffers = buffers
+        self.frame = None
+        self.header = None
+        self.gps = None
+        self.gps_error = None
+        self.error = None
+
+
+
+class FramePrefetcher:
+    '''Reads frames ahead of the caller on a worker thread.
+
+    *depth* frames are converted ahead. One more buffer set is held by the
+    caller (the slot returned by the last get()) and is not written to until
+    the next get().
+
+    :PARAMETERS:
+        *ladybug* --- LadybugAPI for the worker thread. Do not use it from any
+            other thread.
+        **depth** --- Number of frames to convert ahead.
+        **color_processing** --- Color processing method for the conversion.
+        **cameras** --- Camera units to convert.
+        **sentences** --- NMEA sentences to read with each frame.
+        **pool** --- BufferPool of the slot buffers. Default is the pool
+            shared by all streams. The buffers are returned by close().
+    '''
+    def __init__(self, ladybug, depth=4, color_processing=None,
+                 cameras=range(6), sentences=('GPRMC', 'GPGGA', 'GPGSA'),
+                 pool=None):
+        assert depth > 0, 'depth must be at least 1.'
+        self.ladybug = ladybug
+        self.depth = depth
+        self.color_processing = color_processing
+        self.cameras = sorted(cameras)
+        self.sentences = sentences
+        self.total_frames = ladybug.total_frames
+
+        # RING OF BUFFER SETS
+        self.pool = pool or buffer_pool
+        self.free = [FrameSlot(self.pool.acquire()) for i in xrange(depth + 1)]
+        self.ready = {} # CONVERTED FRAMES KEYED BY FRAME NUMBER
+        self.current = None # SLOT HELD BY THE CALLER
+        self.next = 0 # NEXT FRAME FOR THE WORKER
+        self.generation = 0 # CHANGES WHEN THE WORKER IS REPOSITIONED
+        self.stopped = False
+
+        # COUNTERS
+        self.hits = 0 # FRAME WAS CONVERTED ALREADY
+        self.waits = 0 # FRAME WAS BEING CONVERTED OR NEXT IN LINE
+        self.misses = 0 # WORKER WAS REPOSITIONED
+
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name='FramePrefetcher')
+        self.thread.daemon = True
+        self.thread.start()
+
+
+    def get(self, frame):
+        '''Wait for a frame and return its FrameSlot.
+
+        The slot stays valid until the next call to get().
+        '''
+        assert 0 <= frame < self.total_frames, 'frame out of bounds.'
+        with self.cond:
+            # RETURN THE CALLER'S LAST SLOT TO THE RING
+            if self.current is not None:
+                self.free.append(self.current)
+                self.current = None
+            if frame in self.ready:
+                self.hits += 1
+            elif frame == self.next:
+                self.waits += 1
+            else:
+                self.misses += 1
+                self.generation += 1
+                self.free.extend(self.ready.values())
+                self.ready.clear()
+                self.next = frame
+            # DROP FRAMES THAT WERE SKIPPED OVER
+            for n in self.ready.keys():
+                if n < frame:
+                    self.free.append(self.ready.pop(n))
+            self.cond.notify_all()
+            while frame not in self.ready:
+                self.cond.wait()
+            self.current = self.ready.pop(frame)
+        if self.current.error:
+            raise self.current.error
+        return self.current
+
+
+    def stats(self):
+        '''Hit, wait and miss counters and the hit rate.'''
+        total = self.hits + self.waits + self.misses
+        return dict(hits=self.hits, waits=self.waits, misses=self.misses,
+                    depth=self.depth,
+                    hit_rate=float(self.hits) / total if total else 0.)
+
+
+    def close(self):
+        '''Stop the worker thread and return the buffers to the pool.'''
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+        self.thread.join()
+        slots = self.free + self.ready.values() + [self.current]
+        for slot in slots:
+            if slot is not None:
+                self.pool.release( slot.buffers )
+        self.free, self.ready, self.current = [], {}, None
+
+
+    def _run(self):
+        if self.color_processing is not None:
+            self.ladybug.SetColorProcessingMethod( self.color_processing )
+        while True:
+            with self.cond:
+                while not self.stopped and (not self.free or
+                                            self.next >= self.total_frames):
+                    self.cond.wait()
+                if self.stopped:
+                    return
+                slot = self.free.pop()
+                frame = self.next
+                generation = self.generation
+
+            # CONVERT OUTSIDE THE LOCK
+            self._convert(slot, frame)
+
+            with self.cond:
+                if generation == self.generation:
+                    self.ready[frame] = slot
+                    self.next = frame + 1
+                else:
+                    # REPOSITIONED WHILE CONVERTING
+                    self.free.append(slot)
+                self.cond.notify_all()
+
+
+    def _convert(self, slot, frame):
+        slot.frame = frame
+        slot.error = None
+        slot.gps_error = None
+        try:
+            if self.ladybug.next_frame != frame:
+                self.ladybug.GoToImage( frame )
+            slot.header = self.ladybug.ReadImageFromStream()
+            self.ladybug.ConvertToMultipleBGRU32( slot.buffers, self.cameras )
+        except Warning, e:
+            slot.error = e
+            return
+        try:
+            slot.gps = dict((s, self.ladybug.GetGPSNMEADataFromImage(s))
+                            for s in self.sentences)
+        except Warning, e:
+            slot.gps = None
+            slot.gps_error = e
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+A recording split over several stream files, read as one stream.
+
+The camera splits a recording into files of about 2 GB named
+<name>-000000.pgr, <name>-000001.pgr, etc. Recording numbers the frames of
+all files together. Only the stream header of each file is read when the
+recording is opened (for ulNumberOfImages). Each file is memory-mapped the
+first time one of its frames is read and stays open, so reading across a
+file boundary does not reopen anything.
+
+Metadata jobs that only need one file at a time (GPS logs, frame indexes)
+can be run with one process per file with Recording.scan().
+
+:REQUIRES: numpy
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 18:02:44 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 18:02:44 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+import os
+import re
+import glob
+import multiprocessing
+from numpy import r_, cumsum, searchsorted, int64
+from pgrfile import PGRFile, STREAM_HEADER_SIZE
+from structures import getLadybugStreamHeadInfo
+from gpslog import stream_files, recording_gps_log
+
+
+
+def recordings(dirname):
+    '''Recordings in a folder, as a dict of name: list of stream files.'''
+    found = {}
+    for fname in glob.glob(os.path.join(dirname, '*.pgr')):
+        match = re.match(r'(.*)-\d{6}\.pgr$', fname, re.IGNORECASE)
+        name = os.path.basename(match.group(1) if match else fname)
+        found.setdefault(name, []).append(fname)
+    return dict((name, sorted(fnames)) for name, fnames in found.items())
+
+
+def recording_files(path):
+    '''Stream files of the recording in folder *path*, or of the recording
+    that stream file *path* belongs to.'''
+    if not os.path.isdir(path):
+        return stream_files(path)
+    found = recordings(path)
+    if len(found) != 1:
+        raise ValueError, '{0} recordings in {1}: {2}'.format(len(found), path,
+                                                     ', '.join(sorted(found)))
+    return found.values()[0]
+
+
+def number_of_images(fname):
+    '''ulNumberOfImages of a stream file (reads the stream header only).'''
+    with open(fname, 'rb') as rfile:
+        return getLadybugStreamHeadInfo( rfile.read(STREAM_HEADER_SIZE) ).ulNumberOfImages
+
+
+def _scan_file(args):
+    job, fname, first_frame = args
+    return job(fname, first_frame)
+
+
+
+class Recording:
+    '''Frames of all stream files of a recording with one frame numbering.
+
+    Same reading methods as PGRFile, with recording frame numbers.
+
+    :PARAMETERS:
+        *path* --- Recording folder, or any stream file of the recording.
+    '''
+    def __init__(self, path):
+        self.fnames = recording_files(path)
+        if not self.fnames:
+            raise IOError, 'no stream files found: {0}'.format(path)
+        counts = [number_of_images(fname) for fname in self.fnames]
+        # RECORDING FRAME NUMBER OF THE FIRST FRAME OF EACH FILE, AND THE TOTAL
+        self.starts = r_[0, cumsum(counts)].astype(int64)
+        self.total_frames = int(self.starts[-1])
+        self.files = [None] * len(self.fnames) # OPENED ON FIRST USE
+
+    def __len__(self):
+        return self.total_frames
+
+    def __del__(self):
+        self.close()
+
+
+    def close(self):
+        '''Close the open stream files.'''
+        for pgr in self.files:
+            if pgr is not None:
+                pgr.close()
+        self.files = [None] * len(self.fnames)
+
+
+    def locate(self, n):
+        '''(file number, frame number in that file) of frame *n*.'''
+        assert 0 <= n < self.total_frames, 'frame out of bounds.'
+        i = int(searchsorted(self.starts, n, 'right')) - 1
+        return i, int(n - self.starts[i])
+
+
+    def file(self, i):
+        '''PGRFile of file number *i*.'''
+        if self.files[i] is None:
+            self.files[i] = PGRFile( self.fnames[i] )
+        return self.files[i]
+
+
+    def frame(self, n):
+        i, local = self.locate(n)
+        return self.file(i).frame(local)
+
+
+    def camera_tiles(self, n, cam):
+        i, local = self.locate(n)
+        return self.file(i).camera_tiles(local, cam)
+
+
+    def imageinfo(self, n):
+        i, local = self.locate(n)
+        return self.file(i).imageinfo(local)
+
+
+    def image_header(self, n):
+        '''LadybugImage fields of frame *n*. uiSeqNum is the recording frame
+        number.'''
+        i, local = self.locate(n)
+        LImage = self.file(i).image_header(local)
+        LImage.uiSeqNum = n
+        return LImage
+
+
+    def read(self, n):
+        '''Returns the image header and the raw data buffer of frame *n*.'''
+        return self.image_header(n), self.frame(n)
+
+
+    def frames(self, start=0, stop=None):
+        '''Generator of (frame number, header, data) through the files.'''
+        stop = self.total_frames if stop is None else min(stop, self.total_frames)
+        for n in xrange(start, stop):
+            yield (n,) + self.read(n)
+
+
+    def scan(self, job, processes=None):
+        '''Run a job on each stream file in worker processes.
+
+        :PARAMETERS:
+            *job* --- Module level function job(fname, first_frame), where
+                first_frame is the recording frame number of the file's first
+                frame.
+            **processes** --- Number of worker processes. 1 runs the jobs in
+                this process.
+
+        :RETURNS:
+            List of job results in file order.
+        '''
+        tasks = [(job, fname, int(first))
+                 for fname, first in zip(self.fnames, self.starts)]
+        if processes == 1 or len(tasks) == 1:
+            return map(_scan_file, tasks)
+        pool = multiprocessing.Pool(processes or min(len(tasks),
+                                                     multiprocessing.cpu_count()))
+        try:
+            return pool.map(_scan_file, tasks)
+        finally:
+            pool.close()
+            pool.join()
+
+
+    def gps_log(self, processes=None):
+        '''GPS log table of the recording (see gpslog.recording_gps_log).'''
+        return recording_gps_log(self.fnames, processes)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Lookup tables for rectifying and unrectifying pixel positions.
+
+RectifyPixel and UnrectifyPixel cost one DLL call per point. This module
+samples both mappings once per camera on a regular grid and saves the
+grids next to config.txt. Whole arrays of points are then mapped by
+bilinear interpolation in NumPy.
+
+Coordinates are in the API (sideways) image orientation: (row, col) of a
+1616x1232 camera image. Ladybug3stream handles the rotation.
+
+:REQUIRES: numpy
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 11:02:16 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 11:02:16 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+import os
+from numpy import (arange, r_, zeros, empty, nan, float32, asarray, clip,
+                   searchsorted, isfinite, sqrt, random, load, savez)
+
+
+
+class RectifyMaps:
+    '''Sampled RectifyPixel and UnrectifyPixel grids for the camera units.
+
+    The forward grid holds the rectified (row, col) of each distorted grid
+    node. The inverse grid holds the distorted (row, col) of each rectified
+    grid node. Points between nodes are interpolated bilinearly. Points
+    outside the image, or next to nodes the API could not map, return nan.
+    '''
+    def __init__(self, rows=1232, cols=1616, step=8):
+        self.rows, self.cols, self.step = rows, cols, step
+        # GRID NODES. THE LAST NODE IS ALWAYS ON THE LAST PIXEL.
+        self.node_rows = r_[arange(0, rows-1, step), rows-1].astype(float)
+        self.node_cols = r_[arange(0, cols-1, step), cols-1].astype(float)
+        self.forward = {}
+        self.inverse = {}
+
+
+    def cache_name(self, dirname):
+        '''File name of the cached grids in the folder with config.txt.'''
+        return os.path.join(dirname, 'rectify_{0}x{1}_step{2}.npz'.format(
+                                            self.cols, self.rows, self.step))
+
+
+    def build(self, ladybug, cams=range(6)):
+        '''Sample the API mappings for each camera unit.
+
+        :PARAMETERS:
+            *ladybug* --- LadybugAPI with the configuration loaded.
+            **cams** --- Camera units to sample.
+        '''
+        shape = (len(self.node_rows), len(self.node_cols), 2)
+        for cam in cams:
+            fwd = empty(shape, float32)
+            inv = empty(shape, float32)
+            for i, row in enumerate(self.node_rows):
+                for j, col in enumerate(self.node_cols):
+                    try:
+                        fwd[i,j] = ladybug.RectifyPixel( cam, row, col )
+                    except Warning:
+                        fwd[i,j] = nan
+                    try:
+                        inv[i,j] = ladybug.UnrectifyPixel( cam, row, col )
+                    except Warning:
+                        inv[i,j] = nan
+            self.forward[cam] = fwd
+            self.inverse[cam] = inv
+            print 'Rectify map for camera', cam, 'sampled'
+
+
+    def save(self, dirname):
+        grids = {}
+        for cam in self.forward:
+            grids['forward%d' % cam] = self.forward[cam]
+            grids['inverse%d' % cam] = self.inverse[cam]
+        savez(self.cache_name(dirname), **grids)
+
+
+    def load(self, dirname, config_fname=None):
+        '''Load cached grids. Returns False if there is no cache or the cache
+        is older than the configuration file.'''
+        fname = self.cache_name(dirname)
+        if not os.path.exists(fname):
+            return False
+        if config_fname and os.path.exists(config_fname):
+            if os.path.getmtime(config_fname) > os.path.getmtime(fname):
+                return False
+        grids = load(fname)
+        for name in grids.files:
+            if name.startswith('forward'):
+                self.forward[int(name[7:])] = grids[name]
+            else:
+                self.inverse[int(name[7:])] = grids[name]
+        return True
+
+
+    def rectify(self, cam, rows, cols):
+        '''Rectified (row, col) arrays for arrays of distorted positions.'''
+        return self._interpolate(self.forward[cam], rows, cols)
+
+
+    def unrectify(self, cam, rows, cols):
+        '''Distorted (row, col) arrays for arrays of rectified positions.'''
+        return self._interpolate(self.inverse[cam], rows, cols)
+
+
+    def _interpolate(self, grid, rows, cols):
+        rows = asarray(rows, float)
+        cols = asarray(cols, float)
+        i, ti = self._cell(self.node_rows, rows)
+        j, tj = self._cell(self.node_cols, cols)
+        ti = ti[..., None]
+        tj = tj[..., None]
+        res = ((1-ti) * ((1-tj) * grid[i, j] + tj * grid[i, j+1]) +
+               ti * ((1-tj) * grid[i+1, j] + tj * grid[i+1, j+1]))
+        outside = ((rows < 0) | (rows > self.node_rows[-1]) |
+                   (cols < 0) | (cols > self.node_cols[-1]))
+        res[outside] = nan
+        return res[..., 0], res[..., 1]
+
+
+    def _cell(self, nodes, x):
+        '''Index of the grid cell holding each x and the fraction across it.'''
+        i = clip(searchsorted(nodes, x, 'right') - 1, 0, len(nodes) - 2)
+        return i, (x - nodes[i]) / (nodes[i+1] - nodes[i])
+
+
+    def accuracy(self, ladybug, cam, npoints=200, seed=0):
+        '''Compare the interpolated mappings with the per-point API calls.
+
+        :RETURNS:
+            dict of 'rectify' and 'unrectify' error statistics in pixels
+            (mean, rms, max) over random points inside the image.
+        '''
+        rand = random.RandomState(seed)
+        rows = rand.uniform(0, self.rows - 1, npoints)
+        cols = rand.uniform(0, self.cols - 1, npoints)
+        report = {}
+        for name, interp, api in [
+                ('rectify', self.rectify, ladybug.RectifyPixel),
+                ('unrectify', self.unrectify, ladybug.UnrectifyPixel)]:
+            exact = zeros((npoints, 2))
+            for k in xrange(npoints):
+                try:
+                    exact[k] = api( cam, rows[k], cols[k] )
+                except Warning:
+                    exact[k] = nan
+            r, c = interp( cam, rows, cols )
+            err = sqrt((r - exact[:,0])**2 + (c - exact[:,1])**2)
+            err = err[isfinite(err)]
+            report[name] = dict(mean=err.mean(), rms=sqrt((err**2).mean()),
+                                max=err.max(), points=len(err))
+        return report
@@ -3,8 +3,13 @@
 """
 Structures and enumerations used with the Ladybug3 API.
 
-This module contains structures (in the form of namedtuples) for use in 
-interacting with the Ladybug3 API.
+This module contains structures for use in interacting with the Ladybug3 API.
+
+Each structure layout is compiled once into a CStruct class. Fields are
+decoded with precompiled struct.Struct objects the first time they are
+read, so reading a few fields of a record does not decode the rest.
+Decoded records keep the attribute names and _asdict() of the namedtuples
+used before.
 
 :SINCE: Sat Apr 28 19:09:31 2012
 .. note: Incomplete. Can add the remaining enums from API.
@@ -27,256 +32,378 @@ __version__ = '0.1'
 
 
 
-from struct import unpack
-from collections import namedtuple
-from ctypes import Structure, c_uint, c_float, c_double
+from struct import Struct, calcsize
+from collections import OrderedDict
+from ctypes import Structure, c_uint, c_float, c_double, c_void_p, sizeof
+
+#===============================================================================
+# LAZY STRUCTURE DECODING
+#===============================================================================
+class CStruct(object):
+    '''Base class for compiled C structure decoders.
+
+    Keeps a private copy of the structure bytes. Each field is decoded when
+    first read and then cached on the instance.
+    '''
+    _fields = ()
+    _size = 0
+
+    def __init__(self, data, offset=0):
+        if offset == 0 and type(data) is str and len(data) == self._size:
+            self._raw = data
+        else:
+            self._raw = str(buffer(data, offset, self._size))
+            if len(self._raw) != self._size:
+                raise ValueError, '{0} requires {1} bytes'.format(
+                                    self.__class__.__name__, self._size)
+
+    def _asdict(self):
+        return OrderedDict( (name, getattr(self, name)) for name in self._fields )
+
+    def _extend(self, pairs):
+        '''Attach extra (name, value) pairs, e.g. fields of another structure.'''
+        for name, value in pairs:
+            self.__dict__[name] = value
+        self._fields = self._fields + tuple(name for name, value in pairs)
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __repr__(self):
+        return '{0}({1})'.format(self.__class__.__name__,
+                ', '.join('{0}={1!r}'.format(*item) for item in self._asdict().items()))
+
+
+
+class _Field(object):
+    '''Decodes one field of a CStruct on first access.'''
+    def __init__(self, name, fmt, offset, convert=None):
+        self.name = name
+        self.unpack_from = Struct(fmt).unpack_from
+        self.offset = offset
+        self.convert = convert
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        value = self.unpack_from(obj._raw, self.offset)
+        value = self.convert(value) if self.convert else value[0]
+        obj.__dict__[self.name] = value # CACHE. SHADOWS THIS DESCRIPTOR.
+        return value
+
+
+
+def compile_struct(name, layout, byteorder='<'):
+    '''Create a CStruct class from a field layout.
+
+    :PARAMETERS:
+        *name* --- Class name.
+        *layout* --- List of (field name, format) or (field name, format,
+            converter). The name can be a tuple of names sharing one field,
+            or None for padding and unused fields. Without a converter the
+            first unpacked value is used.
+        **byteorder** --- struct byte order character. Padding is explicit.
+
+    :RETURNS: CStruct subclass. Instantiate with the structure bytes.
+    '''
+    attrs = {}
+    fields = []
+    offset = 0
+    for entry in layout:
+        names, fmt = entry[:2]
+        convert = entry[2] if len(entry) > 2 else None
+        if isinstance(names, str):
+            names = (names,)
+        for fname in names or ():
+            attrs[fname] = _Field(fname, byteorder + fmt, offset, convert)
+            fields.append(fname)
+        offset += calcsize(byteorder + fmt)
+    attrs['_fields'] = tuple(fields)
+    attrs['_size'] = offset
+    return type(name, (CStruct,), attrs)
+
+
+
+def _cstring(values):
+    return values[0].rstrip(' \t\r\n\0')
+
+def _low_byte(values):
+    return int(values[0]%2**8)
+
+def _low_bytes(values):
+    return [int(n%2**8) for n in values]
 
 #===============================================================================
 # STRUCTURES CARRIED OVER FROM C++ EXAMPLES
 #===============================================================================
-  
-  # struct LadybugStreamHeadInfo
+
+# struct LadybugStreamHeadInfo
+_LadybugStreamHeadInfo = compile_struct('LadybugStreamHeadInfo', [
+        ('ulLadybugStreamVersion',  'L'),
+        ('ulFrameRate',             'L'),
+        ('serialBase',              'L'),
+        ('serialHead',              'L'),
+        (None,                      '25L'), # reserved
+        ('ulPaddingSize',           'L'),
+        ('dataFormat',              'I'),
+        ('resolution',              'I'),
+        ('stippledFormat',          'I'),
+        ('ulConfigrationDataSize',  'L'),
+        ('ulNumberOfImages',        'L'), # PER STREAM FILE (2GB)
+        ('ulNumberOfKeyIndex',      'L'),
+        ('ulIncrement',             'L'),
+        ('ulStreamDataOffset',      'L'),
+        ('ulGPSDataOffset',         'L'),
+        ('ulGPSDataSize',           'L'),
+        (None,                      '212L'), # reservedSpace
+        ('ulOffsetTable',           '512L', tuple) ])
+
 def getLadybugStreamHeadInfo( data ):
     '''Ladybug stream file header format.'''
-    data = unpack('L'*30 +'I'*3 + 'L'*731, data)
-    tmpdict = dict(
-        ulLadybugStreamVersion = data[0],
-        ulFrameRate = data[1],
-        serialBase = data[2],
-        serialHead = data[3],
-        #reserved = data[4:29],
-        ulPaddingSize = data[29],
-        dataFormat = data[30],
-        resolution = data[31],
-        stippledFormat = data[32],
-        ulConfigrationDataSize = data[33],
-        ulNumberOfImages = data[34], # PER STREAM FILE (2GB)
-        ulNumberOfKeyIndex = data[35],
-        ulIncrement = data[36],
-        ulStreamDataOffset = data[37],
-        ulGPSDataOffset = data[38],
-        ulGPSDataSize = data[39],
-        #reservedSpace = data[40:252],
-        ulOffsetTable = data[252:764] )
-    return namedtuple('CStruct', tmpdict.keys() )(**tmpdict)
+    return _LadybugStreamHeadInfo( data )
+
 
 # struct LadybugImageRenderingInfo
-def getLadybugImageRenderingInfo(data ):
-    data = unpack('c'*832 +'I'+ 'c'*64 +'??III' +'c'*128 +'?' +'I'*979, data)
-    tmpdict = dict(
-        pszDeviceDescription =      ''.join(data[0:128]).rstrip(' \t\r\n\0'),
-        pszAdapterString =          ''.join(data[128:256]).rstrip(' \t\r\n\0'),
-        pszBiosString =             ''.join(data[256:384]).rstrip(' \t\r\n\0'),
-        pszChipType =               ''.join(data[384:512]).rstrip(' \t\r\n\0'),
-        pszDacType =                ''.join(data[512:640]).rstrip(' \t\r\n\0'),
-        pszInstalledDisplayDriver = ''.join(data[640:768]).rstrip(' \t\r\n\0'),
-        pszDriverVersion =          ''.join(data[768:832]).rstrip(' \t\r\n\0'),
-        uiMemorySize =              data[832],
-        pszOpenGLVersion =          ''.join(data[833:897]).rstrip(' \t\r\n\0'),
-        bPBO =                      data[897],
-        bFBO =                      data[898],
-        uiMaxTextureSize =          data[899],
-        uiMaxViewPortWidth =        data[900],
-        uiMaxViewPortHeight =       data[901],
-        pszOpenGLVendor =           ''.join(data[902:966]).rstrip(' \t\r\n\0'),
-        pszOpenGLRenderer =         ''.join(data[966:1030]).rstrip(' \t\r\n\0'),
-        bPBuffer =                  data[1030] )
-    return namedtuple('CStruct', tmpdict.keys() )(**tmpdict)
+_LadybugImageRenderingInfo = compile_struct('LadybugImageRenderingInfo', [
+        ('pszDeviceDescription',        '128s', _cstring),
+        ('pszAdapterString',            '128s', _cstring),
+        ('pszBiosString',               '128s', _cstring),
+        ('pszChipType',                 '128s', _cstring),
+        ('pszDacType',                  '128s', _cstring),
+        ('pszInstalledDisplayDriver',   '128s', _cstring),
+        ('pszDriverVersion',            '64s',  _cstring),
+        ('uiMemorySize',                'I'),
+        ('pszOpenGLVersion',            '64s',  _cstring),
+        ('bPBO',                        '?'),
+        ('bFBO',                        '?'),
+        (None,                          '2x'),
+        ('uiMaxTextureSize',            'I'),
+        ('uiMaxViewPortWidth',          'I'),
+        ('uiMaxViewPortHeight',         'I'),
+        ('pszOpenGLVendor',             '64s',  _cstring),
+        ('pszOpenGLRenderer',           '64s',  _cstring),
+        ('bPBuffer',                    '?'),
+        (None,                          '3x979I') ])
 
+def getLadybugImageRenderingInfo(data ):
+    return _LadybugImageRenderingInfo( data )
 
 
+# LadybugImageInfo fields, as included in LadybugImage
+_ImageInfoLayout = [
+        ('ulFingerprint',       'L'), # 0xCAFEBABE = 3405691582L
+        ('ulVersion',           'L'),
+        ('ulTimeSeconds',       'L'),
+        ('ulTimeMicroSeconds',  'L'),
+        ('ulSequenceId',        'L'),
+        ('ulHRate',             'L'),
+        ('arulGainAdjust',      '6L', _low_bytes),
+        ('ulWhiteBalance',      'L'),
+        ('ulBayerGain',         'L'),
+        ('ulBayerMap',          'L'),
+        ('ulBrightness',        'L'),
+        ('ulGamma',             'L', _low_byte),
+        ('ulSerialNum',         'L'),
+        ('ulShutter',           '5L', _low_bytes), # The 6th appears to be missing in data!
+        (None,                  '4x'),
+        ('dGPSLatitude',        'd'), # Actually at 33, not 34!
+        ('dGPSLongitude',       'd'),
+        ('dGPSAltitude',        'd') ]
 
 # The LadybugImage structure.
+_LadybugImage = compile_struct('LadybugImage', [
+        ('uiCols',          'I'),
+        ('uiRows',          'I'),
+        ('dataFormat',      'I'),
+        ('resolution',      'I'),
+        ('timeStamp',       '5L', tuple),
+        (None,              'L'), # data[ 9 ] skipped. What is it? An error?
+        ] + _ImageInfoLayout + [
+        ('pData',           'B'),
+        ('bStippled',       '?'),
+        (None,              '2xI'),
+        (('uiDataSizeBytes', 'uiSeqNum'), 'I'),
+        ('uiBufferIndex',   'I'),
+        (None,              '3L') ]) # ulReserved
+
 def getLadybugImage(data):
-    data = unpack('IIIILLLLL' +'L'*24 +'dddB?IIILLL', data)
-    tmpdict = dict(
-        uiCols =            data[ 0 ],
-        uiRows =            data[ 1 ],
-        dataFormat =        data[ 2 ],
-        resolution =        data[ 3 ],
-        timeStamp =         data[ 4:9 ],
-        # data[ 9 ] skipped. What is it? An error?
-
-        # LadybugImageInfo structure included here
-        ulFingerprint =     data[10], # 0xCAFEBABE = 3405691582L
-        ulVersion =         data[11],
-        ulTimeSeconds =     data[12], 
-        ulTimeMicroSeconds =data[13], 
-        ulSequenceId =      data[14],
-        ulHRate =           data[15],
-        arulGainAdjust =    [int(n%2**8) for n in data[16:22]],
-        ulWhiteBalance =    data[22],
-        ulBayerGain =       data[23],
-        ulBayerMap =        data[24],
-        ulBrightness =      data[25],
-        ulGamma =           int(data[26]%2**8),
-        ulSerialNum =       data[27],
-        ulShutter =         [int(n%2**8) for n in data[28:33]], # The 6th appears to be missing in data!
-        dGPSLatitude =      data[33], # Actually at 33, not 34!
-        dGPSLongitude =     data[34],
-        dGPSAltitude =      data[35],
-
-        pData =             data[ 36 ],
-        bStippled =         data[ 37 ],
-        uiDataSizeBytes =   data[ 39 ],
-        uiSeqNum =          data[ 39 ],
-        uiBufferIndex =     data[ 40 ]#,
-        #ulReserved =        data[ 41:44 ]
-        )
-    return namedtuple('CStruct', tmpdict.keys() )(**tmpdict)
-    
-    
+    return _LadybugImage( data )
+
+
+# struct LadybugImageInfo (as embedded at the start of each stream frame)
+_LadybugImageInfo = dict( (byteorder,
+                           compile_struct('LadybugImageInfo', _ImageInfoLayout, byteorder))
+                          for byteorder in '<>' )
+
+def getLadybugImageInfo(data, byteorder='<'):
+    '''Same field layout as the LadybugImageInfo block inside LadybugImage.
+
+    The camera writes this block big-endian. Check the byte order with
+    ulFingerprint (0xCAFEBABE) before decoding.
+    '''
+    return _LadybugImageInfo[byteorder]( data )
+
+
 # struct LadybugProcessedImage
+_POINTER = 'L' if sizeof(c_void_p) == 4 else 'Q'
+_LadybugProcessedImage = compile_struct('LadybugProcessedImage', [
+        ('uiCols',          'I'), # 4 bytes
+        ('uiRows',          'I'), # 4
+        ('pData',           _POINTER), # unsigned char* (ADDRESS OF THE PIXELS)
+        ('pixelFormat',     'L'), # 4
+        ('ulReserved',      '8L', tuple), # 4 * 8
+        (None,              '%dx' % (sizeof(c_void_p) - 4)) ]) # TAIL PADDING
+LADYBUG_PROCESSED_IMAGE_SIZE = _LadybugProcessedImage._size
+
 def getLadybugProcessedImage(data):
-    data = unpack('IIBL'+'L'*8, data)
-    tmpdict = dict(
-        uiCols =            data[ 0 ], # 4 bytes
-        uiRows =            data[ 1 ], # 4
-        pData =             data[ 2 ], # 1
-        pixelFormat =        data[ 3 ], # 4
-
-        ulReserved =        data[ 4:12 ] ) # 4 * 8
-    return namedtuple('CStruct', tmpdict.keys() )(**tmpdict)
-    
-    
+    return _LadybugProcessedImage( data )
+
+
 #  struct LadybugNMEAGPGGA
+_LadybugNMEAGPGGA = compile_struct('LadybugNMEAGPGGA', [
+        ('bValidData',          '?'),
+        ('ucGGAHour',           'B'),
+        ('ucGGAMinute',         'B'),
+        ('ucGGASecond',         'B'),
+        ('wGGASubSecond',       'H'),
+        (None,                  '2x'),
+        ('dGGALatitude',        'd'),
+        ('dGGALongitude',       'd'),
+        ('ucGGAGPSQuality',     'B'),
+        ('ucGGANumOfSatsInUse', 'B'),
+        (None,                  '6x'),
+        ('dGGAHDOP',            'd'),
+        ('dGGAAltitude',        'd'),
+        ('dGGAHeightOfGeoid',   'd'),
+        ('ulCount',             'L'),
+        (None,                  '14L') ]) # ulReserved
+
 def getLadybugNMEAGPGGA(data):
-    data = unpack('?BBBHddBBdddL'+'L'*14, data)
-    tmpdict = dict(
-        bValidData =        data[0],
-        ucGGAHour =         data[1],
-        ucGGAMinute =       data[2],
-        ucGGASecond =       data[3],
-        wGGASubSecond =     data[4],
-        dGGALatitude =      data[5],
-        dGGALongitude =     data[6],
-        ucGGAGPSQuality =   data[7],
-        ucGGANumOfSatsInUse = data[8],
-        dGGAHDOP =          data[9],
-        dGGAAltitude =      data[10],
-        dGGAHeightOfGeoid = data[11],
-        ulCount =           data[12]#,
-        #ulReserved =        data[13:27]
-        )
-    return namedtuple('CStruct', tmpdict.keys() )(**tmpdict)
-    
+    return _LadybugNMEAGPGGA( data )
+
+
 # struct LadybugNMEAGPRMC
+_LadybugNMEAGPRMC = compile_struct('LadybugNMEAGPRMC', [
+        ('bValidData',      '?'),
+        ('ucRMCHour',       'B'),
+        ('ucRMCMinute',     'B'),
+        ('ucRMCSecond',     'B'),
+        ('wRMCSubSecond',   'H'),
+        ('ucRMCDataValid',  'B'),
+        (None,              'x'),
+        ('dRMCLatitude',    'd'),
+        ('dRMCLongitude',   'd'),
+        ('dRMCGroundSpeed', 'd'),
+        ('dRMCCourse',      'd'),
+        ('ucRMCDay',        'B'),
+        ('ucRMCMonth',      'B'),
+        ('wRMCYear',        'H'),
+        (None,              '4x'),
+        ('dRMCMagVar',      'd'),
+        ('ulCount',         'L'),
+        (None,              '14L') ]) # ulReserved
+
 def getLadybugNMEAGPRMC(data):
-    data = unpack('?BBBHBddddBBHdL'+'L'*14, data)
-    tmpdict = dict(
-        bValidData = data[0],
-        ucRMCHour = data[1],
-        ucRMCMinute = data[2],
-        ucRMCSecond = data[3],
-        wRMCSubSecond = data[4],
-        ucRMCDataValid = data[5],
-        dRMCLatitude = data[6],
-        dRMCLongitude = data[7],
-        dRMCGroundSpeed = data[8],
-        dRMCCourse = data[9],
-        ucRMCDay = data[10],
-        ucRMCMonth = data[11],
-        wRMCYear = data[12],
-        dRMCMagVar = data[13],
-        ulCount = data[14]#,
-        #ulReserved = data[15:29]
-        )
-    return namedtuple('CStruct', tmpdict.keys() )(**tmpdict)
-    
+    return _LadybugNMEAGPRMC( data )
+
 
 # struct LadybugNMEAGPVTG
+_LadybugNMEAGPVTG = compile_struct('LadybugNMEAGPVTG', [
+        ('bValidData',                          '?'),
+        (None,                                  '7x'),
+        ('dVTGTrackMadeGood',                   'd'),
+        ('dVTGMagneticTrackMadeGood',           'd'),
+        ('dVTGGroundSpeedKnots',                'd'),
+        ('dVTGGroundSpeedKilometersPerHour',    'd'),
+        ('ulCount',                             'L'),
+        (None,                                  '16L') ]) # ulReserved
+
 def getLadybugNMEAGPVTG(data):
-    data = unpack('?ddddL'+'L'*16, data)
-    tmpdict = dict(
-       bValidData = data[0],
-       dVTGTrackMadeGood = data[1],
-       dVTGMagneticTrackMadeGood = data[2],
-       dVTGGroundSpeedKnots = data[3],
-       dVTGGroundSpeedKilometersPerHour = data[4],
-       ulCount = data[5]#,
-       #ulReserved = data[6:22]
-       )
-    return namedtuple('CStruct', tmpdict.keys() )(**tmpdict)
+    return _LadybugNMEAGPVTG( data )
 
 
 # struct LadybugNMEAGPZDA
+_LadybugNMEAGPZDA = compile_struct('LadybugNMEAGPZDA', [
+        ('bValidData',              '?'),
+        ('ucZDAHour',               'B'),
+        ('ucZDAMinute',             'B'),
+        ('ucZDASecond',             'B'),
+        ('wZDASubSecond',           'H'),
+        ('ucZDADay',                'B'),
+        ('ucZDAMonth',              'B'),
+        ('wZDAYear',                'H'),
+        ('ucZDALocalZoneHour',      'B'),
+        ('ucZDALocalZoneMinute',    'B'),
+        ('ulCount',                 'L'),
+        (None,                      '14L') ]) # ulReserved
+
 def getLadybugNMEAGPZDA(data):
-    data = unpack('?BBBHBBHBBL'+'L'*14, data)
-    tmpdict = dict(
-        bValidData = data[0],
-        ucZDAHour = data[1],
-        ucZDAMinute = data[2],
-        ucZDASecond = data[3],
-        wZDASubSecond = data[4],
-        ucZDADay = data[5],
-        ucZDAMonth = data[6],
-        wZDAYear = data[7],
-        ucZDALocalZoneHour = data[8],
-        ucZDALocalZoneMinute = data[9],
-        ulCount = data[10]#,
-        #ulReserved = data[11:25]
-        )
-    return namedtuple('CStruct', tmpdict.keys() )(**tmpdict)
+    return _LadybugNMEAGPZDA( data )
 
 
 # struct LadybugNMEAGPGLL
+_LadybugNMEAGPGLL = compile_struct('LadybugNMEAGPGLL', [
+        ('bValidData',      '?'),
+        (None,              '7x'),
+        ('dGLLLatitude',    'd'),
+        ('dGLLLongitude',   'd'),
+        ('ucGLLHour',       'B'),
+        ('ucGLLMinute',     'B'),
+        ('ucGLLSecond',     'B'),
+        (None,              'x'),
+        ('wGLLSubSecond',   'H'),
+        ('ucGLLDataValid',  'B'),
+        (None,              'x'),
+        ('ulCount',         'L'),
+        (None,              '14L') ]) # ulReserved
+
 def getLadybugNMEAGPGLL(data):
-    data = unpack('?ddBBBHBL'+'L'*14, data)
-    tmpdict = dict(
-        bValidData = data[0],
-        dGLLLatitude = data[1],
-        dGLLLongitude = data[2],
-        ucGLLHour = data[3],
-        ucGLLMinute = data[4],
-        ucGLLSecond = data[5],
-        wGLLSubSecond = data[6],
-        ucGLLDataValid = data[7],
-        ulCount = data[8]#,
-        #ulReserved = data[9:23]
-        )
-    return namedtuple('CStruct', tmpdict.keys() )(**tmpdict)
+    return _LadybugNMEAGPGLL( data )
 
 
 # struct LadybugNMEAGPGSA
+_LadybugNMEAGPGSA = compile_struct('LadybugNMEAGPGSA', [
+        ('bValidData',          '?'),
+        ('ucGSAMode',           'B'),
+        ('ucGSAFixMode',        'B'),
+        (None,                  'x'),
+        ('wGSASatsInSolution',  '36H', tuple),
+        (None,                  '4x'),
+        ('dGSAPDOP',            'd'),
+        ('dGSAHDOP',            'd'),
+        ('dGSAVDOP',            'd'),
+        ('ulCount',             'L'),
+        (None,                  '16L') ]) # ulReserved
+
 def getLadybugNMEAGPGSA(data):
-    data = unpack('?BB'+'H'*36+'dddL'+'L'*16, data)
-    tmpdict = dict(
-        bValidData = data[0],
-        ucGSAMode = data[1],
-        ucGSAFixMode = data[2],
-        wGSASatsInSolution = data[3:39],
-        dGSAPDOP = data[39],
-        dGSAHDOP = data[40],
-        dGSAVDOP = data[41],
-        ulCount = data[42]#,
-        #ulReserved = data[43:59]
-        )
-    return namedtuple('CStruct', tmpdict.keys() )(**tmpdict)
-                
-                
-# The LadybugImage structure.
+    return _LadybugNMEAGPGSA( data )
+
+
+# The LadybugImage3d structure.
+_LadybugImage3d = compile_struct('LadybugImage3d', [
+        ('uiRows',          'I'),
+        ('uiCols',          'I'),
+        ('dRx',             'd'),
+        ('dRy',             'd'),
+        ('dRz',             'd'),
+        ('dTx',             'd'),
+        ('dTy',             'd'),
+        ('dTz',             'd'),
+        ('fCylHeightMin',   'f'),
+        ('fCylHeightMax',   'f'),
+        ('fX',              'f'),
+        ('fY',              'f'),
+        ('fZ',              'f'),
+        ('fTheta',          'f'),
+        ('fPhi',            'f'),
+        ('fCylAngle',       'f'),
+        ('fCylHeight',      'f') ])
+
 def getLadybugImage3d(data):
-    data = unpack('IIddddddfffffffff', data)
-    tmpdict = dict(
-        uiRows =            data[ 0 ],
-        uiCols =            data[ 1 ],
-        dRx =               data[ 2 ],
-        dRy =               data[ 3 ],
-        dRz =               data[ 4 ],
-        dTx =               data[ 5 ],
-        dTy =               data[ 6 ],
-        dTz =               data[ 7 ],
-        fCylHeightMin =     data[ 8 ],
-        fCylHeightMax =     data[ 9 ],
-        fX =                data[10 ],
-        fY =                data[11 ],
-        fZ =                data[12 ],
-        fTheta =            data[13 ],
-        fPhi =              data[14 ],
-        fCylAngle =         data[15 ],
-        fCylHeight =        data[16 ]
-        )
-    return namedtuple('CStruct', tmpdict.keys() )(**tmpdict)
+    return _LadybugImage3d( data )
 
 
 
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Test data shared by the test modules: synthetic stream files and a fake
+ladybug.dll.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 22:31:05 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 22:31:05 2026'
+__version__ = '0.1'
+
+import sys
+import time
+from struct import pack
+from ctypes import create_string_buffer, addressof
+import numpy as np
+sys.path.append("..") # Access modules that are one level up
+from pgrfile import FINGERPRINT, TILE_TABLE_OFFSET, FRAME_HEADER_SIZE
+
+
+
+def write_test_stream(fname, nframes=25, increment=4, padding=512, seed=0):
+    '''Writes a synthetic stream file. Returns the list of (offset, size,
+    seqid) for each frame.'''
+    rand = np.random.RandomState(seed)
+    data_offset = 3056 + 1000 # HEADER + CONFIGURATION DATA
+    frames = []
+    body = []
+    offset = data_offset
+    for n in range(nframes):
+        seqid = 100 + 2*n
+        # IMAGE INFO BLOCK (BIG-ENDIAN)
+        quads = [FINGERPRINT, 1, 1292000000 + n, 1000*n, seqid] + [0]*18
+        header = pack('>23L4xddd', *(quads + [24.5 + n*1e-4, 121.5, 10.+n]))
+        header = header.ljust(TILE_TABLE_OFFSET, '\0')
+        # TILE TABLE AND TILE DATA
+        sizes = rand.randint(1, 300, 24)
+        tile_offsets = FRAME_HEADER_SIZE + np.r_[0, np.cumsum(sizes)[:-1]]
+        table = []
+        for o, s in zip(tile_offsets, sizes):
+            table += [int(o), int(s)]
+        header += pack('>48L', *table)
+        record = header.ljust(FRAME_HEADER_SIZE, '\0') + chr(n % 256) * int(sum(sizes))
+        record = record.ljust(-(-len(record) // padding) * padding, '\0')
+        frames.append( (offset, len(record), seqid) )
+        body.append(record)
+        offset += len(record)
+
+    fields = [0]*764
+    fields[29] = padding
+    fields[34] = nframes
+    fields[35] = len(range(0, nframes, increment))
+    fields[36] = increment
+    fields[37] = data_offset
+    for k, n in enumerate(range(0, nframes, increment)):
+        fields[252 + k] = frames[n][0]
+    with open(fname, 'wb') as wfile:
+        wfile.write( pack('<' + 'L'*30 +'I'*3 + 'L'*731, *fields) )
+        wfile.write( '\0' * 1000 )
+        wfile.write( ''.join(body) )
+    return frames
+
+
+
+def add_gps_section(fname, text):
+    '''Append NMEA text to a stream file and point the header at it.'''
+    with open(fname, 'r+b') as f:
+        f.seek(0, 2)
+        offset = f.tell()
+        f.write(text)
+        f.seek(38 * 4)
+        f.write(pack('<LL', offset, len(text)))
+
+
+
+class FakeDLL:
+    '''Every function succeeds, except ladybugGoToImage past frame 9.'''
+    def __init__(self):
+        self.calls = []
+        self.message = create_string_buffer('LADYBUG_INVALID_ARGUMENT')
+
+    def __getattr__(self, name):
+        def func(*args):
+            self.calls.append(name)
+            time.sleep(0.001)
+            if name == 'ladybugGoToImage' and args[1] > 9:
+                return 17 # LADYBUG_INVALID_ARGUMENT
+            if name == 'ladybugErrorToString':
+                return addressof(self.message) # char *
+            return 0
+        return func
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for off-screen image retrieval without ladybug.dll.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 20:02:15 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 20:02:15 2026'
+__version__ = '0.1'
+
+import sys
+from struct import pack
+from ctypes import memmove
+sys.path.append("..") # Access modules that are one level up
+from numpy import arange, uint8, uint16
+import API
+from API import LadybugAPI
+from structures import _POINTER
+from enums import *
+from fixtures import FakeDLL
+
+
+
+class RenderingDLL(FakeDLL):
+    '''Renders a 5 x 3 BGRU test image into memory it owns.'''
+    def __init__(self, pixels=None, pixel_format=LADYBUG_BGRU):
+        FakeDLL.__init__(self)
+        if pixels is None:
+            pixels = arange(5*3*4, dtype=uint8).reshape(3, 5, 4)
+        self.pixels = pixels
+        self.pixel_format = pixel_format
+        self.configured = []
+
+    def ladybugConfigureOutputImages(self, context, outputs):
+        self.configured.append(outputs)
+        return 0
+
+    def ladybugRenderOffScreenImage(self, context, output, pImage):
+        header = pack('<II' + _POINTER + 'L8L', 5, 3, self.pixels.ctypes.data,
+                      self.pixel_format, *[0]*8)
+        memmove(pImage, header, len(header))
+        return 0
+
+
+
+def test_render_asarray():
+    original = API.c
+    dll = API.c = RenderingDLL()
+    try:
+        api = LadybugAPI('test.pgr')
+        arr = api.RenderOffScreenImage(LADYBUG_DOME, asarray=True)
+        assert arr.shape == (3, 5, 4)
+        assert (arr == dll.pixels).all()
+        # A VIEW OVER THE RENDERED MEMORY, NOT A COPY
+        dll.pixels[1, 2] = 7
+        assert (arr[1, 2] == 7).all()
+        assert api.RenderOffScreenImage(LADYBUG_DOME) is None
+        image = api.GetProcessedImage()
+        assert image.size == (5, 3)
+        assert image.getpixel((0, 0)) == (2, 1, 0)
+
+        # EACH TYPE IS ADDED TO THE OUTPUT CONFIGURATION ONCE
+        api.RenderOffScreenImage(LADYBUG_RECTIFIED_CAM3)
+        api.RenderOffScreenImage(LADYBUG_DOME)
+        assert dll.configured == [LADYBUG_DOME, LADYBUG_DOME | LADYBUG_RECTIFIED_CAM3]
+        try:
+            api.RenderOffScreenImage(LADYBUG_ALL_RECTIFIED_IMAGES)
+        except AssertionError:
+            pass
+        else:
+            assert False, 'several output types at once must fail'
+        del arr, api
+    finally:
+        API.c = original
+
+
+
+def test_render_pixel_format():
+    original = API.c
+    try:
+        # 16-BIT BGR IMAGES ARE READ WITH THEIR OWN SIZE AND TYPE
+        pixels = arange(5*3*3, dtype=uint16).reshape(3, 5, 3) * 1000
+        API.c = RenderingDLL(pixels, LADYBUG_BGR16)
+        api = LadybugAPI('test.pgr')
+        arr = api.RenderOffScreenImage(LADYBUG_PANORAMIC, asarray=True)
+        assert arr.dtype == uint16 and arr.shape == (3, 5, 3)
+        assert (arr == pixels).all()
+        try:
+            api.GetProcessedImage()
+        except AssertionError:
+            pass
+        else:
+            assert False, '16-bit images must not convert to PIL'
+
+        API.c = RenderingDLL(pixel_format=LADYBUG_UNSPECIFIED_PIXEL_FORMAT)
+        api = LadybugAPI('test.pgr')
+        try:
+            api.RenderOffScreenImage(LADYBUG_PANORAMIC, asarray=True)
+        except ValueError:
+            pass
+        else:
+            assert False, 'an unknown pixel format must fail'
+        del arr, api
+    finally:
+        API.c = original
+
+
+
+class StreamDLL(FakeDLL):
+    '''Models the reading position of the stream. Reading the stream header
+    resets it to the first image, as in the SDK.'''
+    def __init__(self):
+        FakeDLL.__init__(self)
+        self.position = 0
+        self.read = []
+
+    def ladybugGoToImage(self, readContext, frame):
+        self.position = frame
+        return 0
+
+    def ladybugGetStreamHeader(self, readContext, pInfo, pFileName):
+        self.position = 0
+        return 0
+
+    def ladybugReadImageFromStream(self, readContext, pImage):
+        self.read.append(self.position)
+        self.position += 1
+        return 0
+
+
+
+def test_reading_position():
+    original = API.c
+    dll = API.c = StreamDLL()
+    try:
+        api = LadybugAPI('test.pgr')
+        assert api.next_frame == dll.position == 0
+        api.ReadImageFromStream()
+        # THE COLOR TILE FORMAT IS SET BEFORE THE FIRST CONVERSION
+        api.PrepareConversion()
+        assert 'ladybugSetColorTileFormat' in dll.calls
+        assert api.next_frame == dll.position == 1
+        api.ReadImageFromStream()
+        assert dll.read == [0, 1]
+        del api
+    finally:
+        API.c = original
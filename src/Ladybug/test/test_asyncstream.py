@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the non-blocking stream facade.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 19:10:36 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 19:10:36 2026'
+__version__ = '0.1'
+
+import os
+import sys
+import time
+import tempfile
+import threading
+sys.path.append("..") # Access modules that are one level up
+from numpy import full, uint8
+from asyncstream import AsyncStream
+from fixtures import write_test_stream
+
+
+
+class FakeStream:
+    '''Camera images filled with the frame number. Records the calling
+    threads and whether two calls ever overlap.'''
+    def __init__(self):
+        self.frame = None
+        self.threads = set()
+        self.busy = False
+        self.overlap = False
+        self.loads = []
+
+    def loadframe(self, goto, cameras=None):
+        self.overlap |= self.busy
+        self.busy = True
+        self.threads.add( threading.current_thread() )
+        time.sleep(0.005) # DLL CALL
+        self.frame = goto
+        self.loads.append(goto)
+        self.busy = False
+        return True
+
+    def image_array(self, cam=None, rotate=True, order='RGB'):
+        self.threads.add( threading.current_thread() )
+        return full((2, 3, 3), self.frame + cam, uint8)
+
+
+
+def test_serialized_calls():
+    fake = FakeStream()
+    stream = AsyncStream(fake)
+    results = [stream.frame(n, cameras=[0, 1]) for n in range(5)]
+    done = []
+    stream.image_array(1, callback=done.append).wait()
+    assert [r.get()[1][0,0,0] for r in results] == [1, 2, 3, 4, 5]
+    assert fake.loads == range(5)
+    # THE LAST LOADED FRAME, AND A COPY OF THE BUFFER
+    assert done[0][0,0,0] == 5
+    assert len(fake.threads) == 1 and threading.current_thread() not in fake.threads
+    assert not fake.overlap
+    stream.close()
+
+
+def test_frames():
+    fake = FakeStream()
+    stream = AsyncStream(fake)
+    seen = []
+    for n, images in stream.frames([3, 7, 8, 9], cameras=[2], ahead=2):
+        seen.append( (n, int(images[2][0,0,0])) )
+    assert seen == [(3, 5), (7, 9), (8, 10), (9, 11)]
+    assert fake.loads == [3, 7, 8, 9]
+    stream.close()
+
+
+def test_pgr_backend():
+    dirname = tempfile.mkdtemp()
+    fname = os.path.join(dirname, 'Ladybug-Test-000000.pgr')
+    frames = write_test_stream(fname, nframes=6)
+    with AsyncStream(fname, backend='pgr') as stream:
+        infos = [stream.gps(n) for n in (4, 1)]
+        info, gga = infos[0].get()
+        assert info.frame == 4 and info.seqid == frames[4][2]
+        assert abs(info.lat - (24.5 + 4e-4)) < 1e-9
+        assert infos[1].get()[0].frame == 1
+        assert stream.load(5).get()
+    assert stream.executor is None
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the multi-process batch executor.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 12:52:10 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 12:52:10 2026'
+__version__ = '0.1'
+
+import os
+import sys
+import time
+import tempfile
+sys.path.append("..") # Access modules that are one level up
+import batch
+from batch import BatchExecutor, StreamOpener, frame_header, memory_used
+from fixtures import write_test_stream
+
+
+
+class StubDecoder:
+    '''Counts the frames it decodes in this worker process.'''
+    def __init__(self):
+        self.pid = os.getpid()
+        self.decoded = 0
+
+
+def square(decoder, frame):
+    decoder.decoded += 1
+    return frame * frame, decoder.pid
+
+
+
+def test_stub_decoder():
+    with BatchExecutor(StubDecoder, processes=3, chunksize=4) as executor:
+        results = executor.map(square, range(50))
+    assert [r[0] for r in results] == [n*n for n in range(50)]
+    # CHUNKS OF CONSECUTIVE FRAMES GO TO ONE WORKER
+    assert len(set(r[1] for r in results[:4])) == 1
+
+
+
+def test_stream_headers():
+    fname = os.path.join(tempfile.mkdtemp(), 'Ladybug-Test-000000.pgr')
+    frames = write_test_stream(fname, nframes=10)
+    with BatchExecutor(StreamOpener(fname, 'pgr'), processes=2, chunksize=3,
+                       memory_limit=2**31) as executor:
+        headers = executor.map(frame_header, range(10))
+    assert [h['ulSequenceId'] for h in headers] == [f[2] for f in frames]
+
+
+
+def failing_factory():
+    raise IOError, 'ladybug.dll not found'
+
+
+class DoneMarker:
+    '''Job that marks each frame it runs with a file. Frame 0 fails.'''
+    def __init__(self, dirname):
+        self.dirname = dirname
+
+    def __call__(self, decoder, frame):
+        if frame == 0:
+            raise ValueError, 'bad frame'
+        time.sleep(0.02)
+        open(os.path.join(self.dirname, str(frame)), 'w').close()
+        return frame
+
+
+def test_error_stops_batch():
+    dirname = tempfile.mkdtemp()
+    try:
+        with BatchExecutor(StubDecoder, processes=2, chunksize=1) as executor:
+            executor.map(DoneMarker(dirname), range(200))
+    except ValueError:
+        pass
+    else:
+        assert False, 'a job error must fail the batch'
+    # THE QUEUED FRAMES ARE NOT RUN
+    assert len(os.listdir(dirname)) < 100
+
+
+def test_factory_error():
+    with BatchExecutor(failing_factory, processes=2) as executor:
+        try:
+            executor.map(square, range(10))
+        except IOError, e:
+            assert 'ladybug.dll' in str(e)
+        else:
+            assert False, 'a failing factory must fail the batch'
+
+
+def test_working_set_limit():
+    # THE CHECK USED WHERE RLIMIT_AS IS NOT AVAILABLE, RUN IN THIS PROCESS
+    assert memory_used() > 0
+    batch._init_worker(StubDecoder, None)
+    batch._memory_limit = 1
+    try:
+        batch._run_chunk( (square, [2, 3]) )
+    except MemoryError, e:
+        assert 'after frame 2' in str(e)
+    else:
+        assert False, 'a worker over the limit must fail'
+    finally:
+        batch._memory_limit = None
+        batch._decoder = None
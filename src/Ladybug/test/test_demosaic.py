@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the NumPy demosaic methods.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 14:10:02 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 14:10:02 2026'
+__version__ = '0.1'
+
+import sys
+sys.path.append("..") # Access modules that are one level up
+from demosaic import demosaic, mosaic, synthetic_rgb, psnr, channels
+from enums import *
+
+
+
+def test_methods():
+    rgb = synthetic_rgb(96, 128)
+    for stippled in [LADYBUG_BGGR, LADYBUG_GBRG, LADYBUG_GRBG, LADYBUG_RGGB]:
+        raw = mosaic(rgb, stippled)
+        out = demosaic(raw, stippled, LADYBUG_HQLINEAR)
+        assert out.shape == rgb.shape and out.dtype == rgb.dtype
+        assert psnr(out, rgb) > 35
+        # SAMPLED VALUES ARE KEPT
+        R = channels(raw, stippled)[0]
+        assert (channels(out[..., 0], stippled)[0] == R).all()
+        half = demosaic(raw, stippled, LADYBUG_DOWNSAMPLE4)
+        assert half.shape == (48, 64, 3)
+        assert (half[..., 2] == channels(raw, stippled)[3]).all()
+        fast = demosaic(raw, stippled, LADYBUG_NEAREST_NEIGHBOR_FAST)
+        assert (fast[1::2, 1::2] == half).all()
+        assert demosaic(raw, stippled, LADYBUG_MONO).shape == (96, 128)
+
+
+
+def test_tiles():
+    rgb = synthetic_rgb(16, 16, seed=1)
+    raw = mosaic(rgb, LADYBUG_RGGB)
+    tiles = [raw[0::2, 0::2], raw[0::2, 1::2], raw[1::2, 0::2], raw[1::2, 1::2]]
+    assert (demosaic(tiles, LADYBUG_RGGB) == demosaic(raw, LADYBUG_RGGB)).all()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the batch panorama exporter against a stand-in for the API.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 15:30:12 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 15:30:12 2026'
+__version__ = '0.1'
+
+import sys
+import tempfile
+from collections import namedtuple
+import numpy as np
+from PIL import Image
+import pexif
+sys.path.append("..") # Access modules that are one level up
+from export import PanoramaExporter, panorama_offset
+
+
+
+class FakeAPI:
+    '''Renders a panorama with a white column at x = frame.'''
+    next_frame = 0
+
+    def __init__(self):
+        self.setup_calls = 0
+
+    def GoToImage(self, frame):
+        self.next_frame = frame
+
+    def ReadImageFromStream(self):
+        LImage = namedtuple('LImage', 'dGPSLatitude dGPSLongitude dGPSAltitude')
+        self.ladybugImage = LImage(24.5 + self.next_frame, 121.25, 10.)
+        self.next_frame += 1
+
+    def SetAlphaMasking(self, masking):
+        self.setup_calls += 1
+
+    def InitializeAlphaMasks(self): pass
+    def SetColorProcessingMethod(self, method): pass
+    def SetOffScreenImageSize(self, *args): pass
+    def ConvertToMultipleBGRU32(self): pass
+    def UpdateTextures(self): pass
+    def RenderOffScreenImage(self, selection): pass
+
+    def GetProcessedImage(self):
+        arr = np.zeros((32, 64, 3), np.uint8)
+        arr[:, self.next_frame - 1] = 255
+        return Image.fromarray(arr)
+
+
+
+def test_export():
+    api = FakeAPI()
+    exporter = PanoramaExporter(api, tempfile.mkdtemp(), carfront=10,
+                                size=(64, 32), quality=95, threads=2)
+    saved = exporter.run(range(3, 9))
+    assert len(saved) == 6 and saved[0].endswith('3.jpg')
+    assert api.setup_calls == 1
+    assert exporter.fps > 0
+    # COLUMN x = 4 MOVED BY THE CAR FRONT OFFSET
+    im = np.asarray(Image.open(saved[1]).convert('L'))
+    assert im[16].argmax() == 4 + panorama_offset(64, 10)
+    lat, lon = pexif.JpegFile.fromFile(saved[1]).get_geo()
+    assert abs(lat - 28.5) < 1e-3 and abs(lon - 121.25) < 1e-3
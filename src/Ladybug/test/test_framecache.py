@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the decoded image cache.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 14:48:19 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 14:48:19 2026'
+__version__ = '0.1'
+
+import sys
+import numpy as np
+sys.path.append("..") # Access modules that are one level up
+from framecache import FrameCache
+
+
+
+def test_lru_budget():
+    cache = FrameCache(max_bytes=3000)
+    for frame in range(3):
+        cache.put((frame, 0, 1, True, 'RGB'), np.zeros(1000, np.uint8) + frame)
+    # FRAME 0 BECOMES MOST RECENTLY USED, SO FRAME 1 IS DROPPED NEXT
+    assert cache.get((0, 0, 1, True, 'RGB'))[0] == 0
+    cache.put((3, 0, 1, True, 'RGB'), np.zeros(1000, np.uint8))
+    assert cache.get((1, 0, 1, True, 'RGB')) is None
+    assert cache.has_frame(0) and not cache.has_frame(1)
+    assert cache.nbytes == 3000
+    # TOO LARGE TO STORE
+    cache.put((4, 0, 1, True, 'RGB'), np.zeros(4000, np.uint8))
+    assert not cache.has_frame(4)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 1, 1)
+
+
+
+def test_invalidate():
+    cache = FrameCache()
+    arr = cache.put((5, 2, 1, True, 'RGB'), np.ones((4, 4, 3), np.uint8))
+    cache.put((5, 3, 1, True, 'RGB'), np.ones((4, 4, 3), np.uint8))
+    cache.put((6, 3, 1, True, 'RGB'), np.ones((4, 4, 3), np.uint8))
+    assert not arr.flags.writeable
+    cache.invalidate(5)
+    assert len(cache) == 1 and not cache.has_frame(5)
+    cache.invalidate()
+    assert len(cache) == 0 and cache.nbytes == 0
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the sidecar frame metadata index.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 17:21:08 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 17:21:08 2026'
+__version__ = '0.1'
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+import numpy as np
+sys.path.append("..") # Access modules that are one level up
+from frameindex import FrameIndex
+from gpslog import stream_gps_log
+from fixtures import write_test_stream, add_gps_section
+
+
+
+def test_index():
+    fname = os.path.join(tempfile.mkdtemp(), 'Ladybug-Test-000000.pgr')
+    frames = write_test_stream(fname, nframes=12)
+    index = FrameIndex(fname)
+    assert len(index) == 12
+    assert list(index.seqid) == [f[2] for f in frames]
+    assert list(index.skipped) == [0] + [1]*11
+    assert index.imageUTC[0] == np.datetime64('2010-12-10T16:53:20')
+    assert index.imageUTC[3] == np.datetime64('2010-12-10T16:53:23.003')
+    assert np.isnat(index.gpsUTC).all() and index.valid.all()
+    assert isinstance(index.lat, np.memmap)
+    # LOOKUPS BY BISECTION
+    assert index.seek_time(datetime(2010, 12, 10, 16, 53, 25, 500000)) == 5
+    assert index.seek_time(datetime(2010, 12, 10, 16, 53, 19)) is None
+    assert index.seek_seqid(106) == 3
+    assert index.seek_seqid(107) == 3 # NOT RECORDED
+    # NOTHING TO DO WHEN THE FILE DID NOT CHANGE
+    assert FrameIndex(fname, update=False).update() == 0
+
+    # GPS SECTION ADDED: ONLY THE GPS COLUMNS ARE RECOMPUTED
+    add_gps_section(fname,
+        '$GPRMC,165320.00,A,2430.0,N,12130.0,E,0.0,0.0,101210,,,A*00\r\n'
+        '$GPGGA,165322.00,2430.0,N,12130.0,E,2,09,0.9,10.0,M,,,,*00\r\n'
+        '$GPRMC,165325.50,V,2430.0,N,12130.0,E,0.0,0.0,101210,,,A*00\r\n')
+    index = FrameIndex(fname)
+    assert index.source['frames'] == 12
+    log = stream_gps_log(fname)
+    assert list(index.valid) == list(log['valid'])
+    assert index.gpsUTC[6] == np.datetime64(log['gpsUTC'][6])
+    assert list(index.gps_quality[:4]) == [0, 0, 2, 2]
+    assert index.satellites[11] == 9 and np.isnan(index.hdop[0])
+    table = index.table(['frame', 'lat', 'valid'])
+    assert table['lat'][3] == 24.5 + 3e-4
+
+    # FRAMES ADDED TO THE STREAM ARE READ, THE OTHERS KEPT
+    write_test_stream(fname, nframes=20)
+    index = FrameIndex(fname, update=False)
+    assert index.update() == 8
+    assert len(index) == 20 and list(index.frame) == range(20)
+    # A DIFFERENT STREAM IS INDEXED AGAIN
+    write_test_stream(fname, nframes=5, seed=3)
+    os.utime(fname, (0, 0))
+    assert FrameIndex(fname, update=False).update() == 5
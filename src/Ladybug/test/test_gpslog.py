@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the GPS log scan of stream files.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 13:25:37 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 13:25:37 2026'
+__version__ = '0.1'
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+sys.path.append("..") # Access modules that are one level up
+from gpslog import recording_gps_log, stream_files
+from fixtures import write_test_stream, add_gps_section
+
+
+
+def test_recording_gps_log():
+    dirname = tempfile.mkdtemp()
+    fnames = [os.path.join(dirname, 'Ladybug-Test-00000%d.pgr' % i) for i in range(2)]
+    frames = write_test_stream(fnames[0], nframes=10)
+    write_test_stream(fnames[1], nframes=10)
+    add_gps_section(fnames[0],
+        '$GPRMC,165320.00,A,2430.0,N,12130.0,E,0.0,0.0,101210,,,A*00\r\n'
+        '$GPGGA,165320.00,2430.0,N,12130.0,E,1,08,1.0,10.0,M,,,,*00\r\n'
+        '$GPRMC,165325.50,V,2430.0,N,12130.0,E,0.0,0.0,101210,,,A*00\r\n')
+    assert stream_files(fnames[1]) == fnames
+
+    log = recording_gps_log(fnames, processes=2)
+    assert len(log) == 20
+    assert list(log['frame']) == range(20)
+    assert list(log['seqid'][:10]) == [f[2] for f in frames]
+    assert log['skipped'][1] == 1
+    # SECOND FILE STARTS AGAIN AT THE SAME SEQUENCE ID
+    assert log['skipped'][10] == frames[0][2] - frames[-1][2] - 1
+    assert log['imageUTC'][0] == datetime(2010, 12, 10, 16, 53, 20)
+    assert log['gpsUTC'][5] == datetime(2010, 12, 10, 16, 53, 20)
+    assert log['gpsUTC'][6] == datetime(2010, 12, 10, 16, 53, 25, 500000)
+    assert log['valid'][5] and not log['valid'][6]
+    # NO GPS SECTION: VALID IF THE HEADER HAS A POSITION
+    assert log['gpsUTC'][10] == datetime.min
+    assert log['valid'][10]
+    assert log['lat'][3] == 24.5 + 3e-4
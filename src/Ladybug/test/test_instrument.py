@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the ladybug.dll call instrumentation.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 19:37:52 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 19:37:52 2026'
+__version__ = '0.1'
+
+import sys
+import json
+import time
+sys.path.append("..") # Access modules that are one level up
+import API
+from API import LadybugAPI
+from instrument import Instrumentation, HOT_METHODS
+from fixtures import FakeDLL
+
+
+
+def test_enable_disable():
+    original = API.c
+    fake = API.c = FakeDLL()
+    goto = LadybugAPI.__dict__['GoToImage']
+    stats = Instrumentation(samples=3)
+    try:
+        stats.enable()
+        assert API.c is not fake
+        api = LadybugAPI('test.pgr')
+        for frame in range(5):
+            api.GoToImage(frame)
+        try:
+            api.GoToImage(10)
+        except Exception:
+            pass
+        else:
+            assert False, 'error code must raise'
+        stats.disable()
+        assert API.c is fake
+        assert LadybugAPI.__dict__['GoToImage'] is goto
+        api.GoToImage(2) # NOT COUNTED
+        del api # CLOSED WITH THE FAKE DLL
+    finally:
+        stats.disable()
+        API.c = original
+
+    report = stats.report()
+    dll = report['ladybugGoToImage']
+    assert dll['count'] == 6 and dll['errors'] == 1
+    assert dll['min'] >= 0.001 and dll['total'] >= 0.006
+    assert dll['p50'] <= dll['p90'] <= dll['p99'] <= dll['max']
+    assert report['ladybugErrorToString']['errors'] == 0
+    method = report['LadybugAPI.GoToImage']
+    assert method['count'] == 6 and method['errors'] == 1
+    assert method['total'] >= dll['total']
+    assert report['ladybugCreateContext']['count'] == 1
+
+    text = stats.save()
+    assert json.loads(text)['calls']['ladybugGoToImage']['count'] == 6
+    line = stats.log_line(top=2)
+    assert 'GoToImage' in line and line.count('|') == 1
+
+
+def test_periodic_log():
+    stats = Instrumentation()
+    stats.record('ladybugReadImageFromStream', 0.01, 4096)
+    lines = []
+    stats.start_log(0.02, lines.append)
+    time.sleep(0.1)
+    stats.stop_log()
+    assert len(lines) >= 2
+    assert 'ladybugReadImageFromStream 1x' in lines[0]
+    assert stats.report()['ladybugReadImageFromStream']['bytes'] == 4096
+
+
+def test_hot_methods_exist():
+    for cls, name, nbytes in HOT_METHODS:
+        assert name in cls.__dict__, name
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the camera image geometry of Ladybug3stream.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 22:14:37 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 22:14:37 2026'
+__version__ = '0.1'
+
+import os
+import sys
+import tempfile
+sys.path.append("..") # Access modules that are one level up
+import numpy as np
+from numpy import random, uint8, asarray, rot90
+from PIL import Image
+from interface import Ladybug3stream
+from rectify import RectifyMaps
+from panorama import calibration_from_api, save_calibration
+from fixtures import write_test_stream
+from test_panorama import FakeAPI
+
+
+
+class BufferAPI:
+    '''Six converted 16 x 12 BGRU camera images.'''
+    def __init__(self):
+        self.cameras = tuple(range(6))
+        self.pixels = random.RandomState(0).randint(0, 256, (6, 12, 16, 4)).astype(uint8)
+
+    def AcquireBuffers(self):
+        return self
+
+    def GetImageArray(self, buffers):
+        return self.pixels
+
+
+
+class SmallRigAPI(FakeAPI):
+    '''The rig of test_panorama with 32 x 24 images and no distortion.'''
+    def GetCameraUnitFocalLength(self, cam):
+        return 8.2
+
+    def GetCameraUnitImageCenter(self, cam):
+        return 16., 12.
+
+    def RectifyPixel(self, cam, row, col):
+        return row, col
+
+    UnrectifyPixel = RectifyPixel
+
+
+
+def test_image_canvas():
+    fname = os.path.join(tempfile.mkdtemp(), 'Ladybug-Test-000000.pgr')
+    write_test_stream(fname, nframes=2)
+    stream = Ladybug3stream(fname, backend='pgr')
+    api = stream.ladybug = BufferAPI()
+    rgb = api.pixels[2, ..., 2::-1]
+    # SAME AS THE ORIGINAL PIL rotate(-90) OF THE UNROTATED IMAGE
+    old = asarray( Image.fromarray(rgb.copy()).rotate(-90) )
+    image = stream.image(2)
+    assert image.size == (16, 12)
+    assert (asarray(image) == old).all()
+    # image_array HAS THE FULL ROTATED IMAGE
+    arr = stream.image_array(2)
+    assert arr.shape == (16, 12, 3)
+    assert (arr == rot90(rgb, -1)).all()
+
+
+def test_panorama_without_sdk():
+    dirname = tempfile.mkdtemp()
+    fname = os.path.join(dirname, 'Ladybug-Test-000000.pgr')
+    write_test_stream(fname, nframes=3)
+    # SAVED ON A MACHINE WITH THE SDK
+    api = SmallRigAPI()
+    calibration = os.path.join(dirname, 'calibration.npz')
+    save_calibration(calibration, calibration_from_api(api, rows=24))
+    maps = RectifyMaps(24, 32)
+    maps.build(api)
+    maps.save(dirname)
+
+    stream = Ladybug3stream(fname, backend='pgr')
+    read = []
+    def camera_tiles(n, cam):
+        read.append( (n, cam) )
+        return [np.full((12, 16), 100, uint8)] * 4
+    stream.pgrfile.camera_tiles = camera_tiles
+    stream.loadframe(1)
+    pano = stream.render_panorama((128, 64), threads=2, calibration=calibration)
+    assert read == [(1, cam) for cam in range(6)]
+    assert pano.shape == (64, 128, 3)
+    assert (pano[:48] == 100).all()
+    assert (pano[-2:] == 0).all() # NO CAMERA LOOKS STRAIGHT DOWN
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the software panorama renderer with the default rig calibration.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 16:52:37 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 16:52:37 2026'
+__version__ = '0.1'
+
+import sys
+import numpy as np
+sys.path.append("..") # Access modules that are one level up
+import panorama
+from panorama import PanoramaRenderer, calibration_from_api, euler_zyx_H
+
+# CamToLadybugEulerZYX Rx Ry Rz Tx Ty Tz (NCKU RS LAB LADYBUG3, SEE Ladybug_SfM.py)
+EXTRINSICS = [
+    (-1.560195, 1.568134, -1.563117, 0.041786, -0.001909, -0.000328),
+    (2.136062, 1.567502, 0.879774, 0.011587, -0.040133, -0.000543),
+    (0.706740, 1.568451, -1.809267, -0.035002, -0.022902, 0.000131),
+    (1.760194, 1.570313, -2.011164, -0.032845, 0.025595, 0.000190),
+    (-0.762114, 1.567740, 0.494800, 0.014474, 0.039348, 0.000549),
+    (0.002663, 0.004042, 0.002932, 0.001139, -0.000746, 0.062041) ]
+NAMES = ('Rx','Ry','Rz','Tx','Ty','Tz')
+
+
+
+class FakeAPI:
+    def GetCameraUnitExtrinsics(self, cam):
+        return dict(zip(NAMES, EXTRINSICS[cam]))
+
+    def GetCameraUnitFocalLength(self, cam):
+        return 410.
+
+    def GetCameraUnitImageCenter(self, cam):
+        return 808., 616.
+
+
+
+def camera_images(values):
+    return [np.full((1232, 1616, 3), value, np.uint8) for value in values]
+
+
+
+def test_calibration():
+    calibration = calibration_from_api(FakeAPI())
+    K, H = calibration[0]
+    assert np.allclose(K[:2,2], [615., 808.])
+    assert np.allclose(H, euler_zyx_H(*EXTRINSICS[0]))
+    # CAMERA 0 LOOKS FORWARD, CAMERA 5 LOOKS UP
+    assert np.allclose(H[:3,2], [1, 0, 0], atol=0.02)
+    assert np.allclose(calibration[5][1][:3,2], [0, 0, 1], atol=0.02)
+
+
+
+def test_render():
+    renderer = PanoramaRenderer(calibration_from_api(FakeAPI()), threads=3)
+    # WEIGHTS SUM TO ONE WHEREVER A CAMERA SEES
+    pano = renderer.render(camera_images([100]*6), (512, 256))
+    assert pano.shape == (256, 512, 3)
+    assert (pano[:200] == 100).all()
+    assert (pano[-5:] == 0).all() # NO CAMERA LOOKS STRAIGHT DOWN
+
+    pano = renderer.render(camera_images([20, 50, 80, 110, 140, 170]), (512, 256))
+    assert (pano[128, 256] == 20).all() # CAMERA 0 AT THE CENTER
+    assert (pano[128, 256 + 512/5] == 50).all() # CAMERA 1 TO ITS RIGHT
+    assert (pano[0] == 170).all() # TOP CAMERA
+
+    # SEVERAL SIZES, ONE THREAD GIVES THE SAME IMAGE
+    small = renderer.render(camera_images([20, 50, 80, 110, 140, 170]), (256, 128))
+    assert sorted(renderer.tables) == [(256, 128), (512, 256)]
+    single = PanoramaRenderer(renderer.calibration, threads=1, band_rows=40)
+    assert (single.render(camera_images([20, 50, 80, 110, 140, 170]), (256, 128)) == small).all()
+
+
+
+def test_numpy_sampling():
+    rand = np.random.RandomState(0)
+    y, x = np.mgrid[0:40, 0:60]
+    image = np.dstack([3*x, 5*y, 2*x + 3*y]).astype(np.uint8)
+    map_x = rand.uniform(-2, 62, (3, panorama.REMAP_COLS)).astype(np.float32)
+    map_y = rand.uniform(-2, 42, (3, panorama.REMAP_COLS)).astype(np.float32)
+    with_cv2 = panorama.remap(image, map_x, map_y)
+    cv2, panorama.cv2 = panorama.cv2, None
+    try:
+        with_numpy = panorama.remap(image, map_x, map_y)
+    finally:
+        panorama.cv2 = cv2
+    inside = ((map_x >= 0) & (map_x <= 59) & (map_y >= 0) & (map_y <= 39)).ravel()
+    assert np.abs(with_cv2[inside] - with_numpy[inside]).max() < 1
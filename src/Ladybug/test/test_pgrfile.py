@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the pure-Python PGR stream reader.
+
+Writes a small synthetic stream file with the Ladybug3 frame layout and
+reads it back with PGRFile.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 10:12:41 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 10:12:41 2026'
+__version__ = '0.1'
+
+import os
+import sys
+import tempfile
+sys.path.append("..") # Access modules that are one level up
+from pgrfile import PGRFile, FRAME_HEADER_SIZE
+from fixtures import write_test_stream
+
+
+
+def test_random_access():
+    fname = os.path.join(tempfile.mkdtemp(), 'Ladybug-Test-000000.pgr')
+    frames = write_test_stream(fname)
+    pgr = PGRFile(fname)
+    assert len(pgr) == len(frames)
+    assert pgr.byteorder == '>'
+    # OUT OF ORDER ACCESS, INCLUDING FRAMES BETWEEN KEYS
+    for n in [17, 3, 24, 0, 9]:
+        offset, size, seqid = frames[n]
+        assert pgr.frame_offset(n) == offset
+        assert pgr.frame_size(n) == size
+        header, data = pgr.read(n)
+        assert header.ulSequenceId == seqid
+        assert header.ulTimeSeconds == 1292000000 + n
+        assert abs(header.dGPSAltitude - (10. + n)) < 1e-9
+        assert len(data) == size
+        assert data[FRAME_HEADER_SIZE] == chr(n)
+    pgr.close()
+
+
+
+def test_build_index():
+    fname = os.path.join(tempfile.mkdtemp(), 'Ladybug-Test-000000.pgr')
+    frames = write_test_stream(fname, nframes=40, increment=16)
+    pgr = PGRFile(fname)
+    offsets = pgr.build_index()
+    assert list(offsets) == [f[0] for f in frames]
+    assert list(pgr.sizes) == [f[1] for f in frames]
+    pgr.close()
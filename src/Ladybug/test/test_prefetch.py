@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the background frame reader against a stand-in for the API.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 12:20:44 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 12:20:44 2026'
+__version__ = '0.1'
+
+import os
+import sys
+import tempfile
+sys.path.append("..") # Access modules that are one level up
+from prefetch import FramePrefetcher
+from API import BufferPool, BGRU32_BUFFER_SIZE
+from interface import Ladybug3stream
+from fixtures import write_test_stream
+
+
+
+class FakeAPI:
+    '''Frame numbers in place of images.'''
+    total_frames = 20
+    next_frame = 0
+
+    def __init__(self):
+        self.seeks = []
+
+    def SetColorProcessingMethod(self, method):
+        pass
+
+    def GoToImage(self, frame):
+        self.seeks.append(frame)
+        self.next_frame = frame
+
+    def ReadImageFromStream(self):
+        self.next_frame += 1
+        return self.next_frame - 1
+
+    def ConvertToMultipleBGRU32(self, buffers, cameras):
+        buffers.imCols, buffers.imRows = 4, 2
+        buffers.array()[:] = self.next_frame - 1
+
+    def GetGPSNMEADataFromImage(self, sentence):
+        raise Warning, 'no GPS'
+
+
+
+def test_sequential_and_seek():
+    api = FakeAPI()
+    pf = FramePrefetcher(api, depth=2)
+    try:
+        for n in range(6):
+            slot = pf.get(n)
+            assert slot.header == n
+            assert (slot.buffers.array() == n).all()
+            assert slot.gps is None
+        # JUMP BACK REPOSITIONS THE WORKER
+        assert pf.get(3).header == 3
+        assert pf.get(4).header == 4
+        stats = pf.stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] + stats['waits'] == 7
+        assert 3 in api.seeks
+    finally:
+        pf.close()
+
+
+
+def test_shared_pool():
+    pool = BufferPool(max_free=4)
+    first = FramePrefetcher(FakeAPI(), depth=2, pool=pool)
+    first.get(0)
+    second = FramePrefetcher(FakeAPI(), depth=1, pool=pool)
+    assert pool.stats()['in_use'] == 5
+    first.close()
+    second.close()
+    stats = pool.stats()
+    assert stats['in_use'] == 0 and stats['free'] == 4 and stats['allocated'] == 4
+    assert stats['peak_bytes'] == 5 * 6 * BGRU32_BUFFER_SIZE
+    # A NEW STREAM REUSES THE RETURNED SETS
+    third = FramePrefetcher(FakeAPI(), depth=3, pool=pool)
+    try:
+        assert (third.get(5).buffers.array() == 5).all()
+        assert pool.stats()['allocated'] == 4
+    finally:
+        third.close()
+
+
+
+class StaleAPI(FakeAPI):
+    '''Main context that still holds GPS data of an earlier frame.'''
+    def GetGPSNMEADataFromImage(self, sentence="GPGGA"):
+        return 'stale'
+
+
+
+def test_prefetched_frame_without_gps():
+    fname = os.path.join(tempfile.mkdtemp(), 'Ladybug-Test-000000.pgr')
+    write_test_stream(fname, nframes=4)
+    stream = Ladybug3stream(fname, backend='pgr')
+    stream.ladybug = StaleAPI()
+    stream.prefetcher = FramePrefetcher(FakeAPI(), depth=1)
+    try:
+        assert stream.loadframe(2)
+        assert stream.buffers is not None
+        for method in (stream.getGPSdata, stream.getFrameInfo):
+            try:
+                method()
+            except Warning, e:
+                assert str(e) == 'no GPS'
+            else:
+                assert False, 'no GPS data for a prefetched frame must raise'
+    finally:
+        stream.set_prefetch(0)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for reading a multi-file recording as one stream.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 18:31:05 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 18:31:05 2026'
+__version__ = '0.1'
+
+import os
+import sys
+import tempfile
+sys.path.append("..") # Access modules that are one level up
+from pgrfile import PGRFile
+from recording import Recording, recording_files
+from frameindex import update_frame_index
+from interface import Ladybug3stream
+from fixtures import write_test_stream
+
+
+
+def write_recording(dirname, name='Ladybug-Test', sizes=(10, 7, 5)):
+    fnames = [os.path.join(dirname, '{0}-{1:06d}.pgr'.format(name, i))
+              for i in range(len(sizes))]
+    for fname, n in zip(fnames, sizes):
+        write_test_stream(fname, nframes=n)
+    return fnames
+
+
+def first_seqid(fname, first_frame):
+    '''Scan job: (recording frame number, ulSequenceId) of the first frame.'''
+    pgr = PGRFile(fname)
+    try:
+        return first_frame, pgr.imageinfo(0).ulSequenceId
+    finally:
+        pgr.close()
+
+
+
+def test_global_frames():
+    dirname = tempfile.mkdtemp()
+    fnames = write_recording(dirname)
+    assert recording_files(dirname) == fnames
+    assert recording_files(fnames[1]) == fnames
+
+    rec = Recording(dirname)
+    assert rec.total_frames == len(rec) == 22
+    assert list(rec.starts) == [0, 10, 17, 22]
+    assert rec.locate(9) == (0, 9)
+    assert rec.locate(10) == (1, 0)
+    assert rec.locate(21) == (2, 4)
+    assert rec.files == [None] * 3 # NOTHING OPENED YET
+
+    # FRAME DATA OF THE SECOND FILE'S FIRST FRAME
+    assert rec.imageinfo(10).ulSequenceId == 100
+    assert rec.image_header(10).uiSeqNum == 10
+    assert rec.frame(12) == rec.file(1).frame(2)
+    rec.close()
+
+
+def test_frames_across_files():
+    rec = Recording(write_recording(tempfile.mkdtemp())[0])
+    opened = []
+    for n, LImage, data in rec.frames(8, 19):
+        assert LImage.uiSeqNum == n
+        opened.append( list(rec.files) )
+    # EACH FILE IS OPENED ONCE AND KEPT
+    assert opened[-1][0] is opened[0][0]
+    assert opened[-1][1] is opened[2][1] is not None
+    assert n == 18
+    rec.close()
+
+
+def test_scan():
+    dirname = tempfile.mkdtemp()
+    write_recording(dirname)
+    rec = Recording(dirname)
+    expected = [(0, 100), (10, 100), (17, 100)]
+    assert rec.scan(first_seqid, processes=1) == expected
+    assert rec.scan(first_seqid, processes=2) == expected
+
+    assert rec.scan(update_frame_index, processes=2) == [10, 7, 5]
+    assert rec.scan(update_frame_index, processes=2) == [0, 0, 0]
+
+
+def test_several_recordings():
+    dirname = tempfile.mkdtemp()
+    write_recording(dirname, 'Ladybug-A', (3, 3))
+    write_recording(dirname, 'Ladybug-B', (4,))
+    try:
+        Recording(dirname)
+    except ValueError:
+        pass
+    else:
+        assert False, 'a folder with two recordings must fail'
+    assert len(Recording(os.path.join(dirname, 'Ladybug-B-000000.pgr'))) == 4
+
+
+
+def test_recording_index():
+    dirname = tempfile.mkdtemp()
+    write_recording(dirname)
+    stream = Ladybug3stream(dirname, backend='pgr')
+    index = stream.frame_index()
+    # ONE ROW PER FRAME OF THE RECORDING, NOT OF THE FIRST FILE
+    assert len(index) == stream.getNumberOfFrames() == 22
+    assert list(index.frame) == range(22)
+    assert list(index.skipped[9:12]) == [1, 0, 1]
+    log = index.table()
+    assert log['seqid'][10] == 100 and log['lat'][21] == index.lat[21]
+    assert index.update() == 0
+    assert stream.frame_index() is index
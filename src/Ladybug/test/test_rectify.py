@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the rectification lookup tables against a stand-in for the API.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 11:02:16 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 11:02:16 2026'
+__version__ = '0.1'
+
+import sys
+import tempfile
+import numpy as np
+sys.path.append("..") # Access modules that are one level up
+from rectify import RectifyMaps
+
+
+
+class FakeAPI:
+    '''Smooth radial distortion in place of ladybug.dll.'''
+    def RectifyPixel(self, cam, row, col):
+        dr, dc = row - 616., col - 808.
+        k = 1 + 2e-7 * (dr*dr + dc*dc) + 0.01 * cam
+        return 616. + dr * k, 808. + dc * k
+
+    def UnrectifyPixel(self, cam, row, col):
+        dr, dc = row - 616., col - 808.
+        k = 1 - 2e-7 * (dr*dr + dc*dc) - 0.01 * cam
+        return 616. + dr * k, 808. + dc * k
+
+
+
+def test_interpolation_accuracy():
+    api = FakeAPI()
+    maps = RectifyMaps(step=16)
+    maps.build(api, cams=[0, 3])
+    for cam in [0, 3]:
+        report = maps.accuracy(api, cam)
+        assert report['rectify']['max'] < 0.05
+        assert report['unrectify']['max'] < 0.05
+    # GRID NODES ARE EXACT, INCLUDING THE LAST ROW AND COLUMN
+    r, c = maps.rectify(3, [0., 1231.], [0., 1615.])
+    assert np.allclose(r, [api.RectifyPixel(3, 0, 0)[0], api.RectifyPixel(3, 1231, 1615)[0]])
+    # OUTSIDE THE IMAGE
+    r, c = maps.unrectify(0, [-1.], [10.])
+    assert np.isnan(r[0])
+
+
+
+def test_cache():
+    dirname = tempfile.mkdtemp()
+    maps = RectifyMaps(step=64)
+    maps.build(FakeAPI(), cams=[1])
+    maps.save(dirname)
+    loaded = RectifyMaps(step=64)
+    assert loaded.load(dirname)
+    assert np.array_equal(loaded.forward[1], maps.forward[1])
+    assert not RectifyMaps(step=32).load(dirname)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the compiled structure decoders.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 11:40:05 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 11:40:05 2026'
+__version__ = '0.1'
+
+import sys
+from struct import pack
+from ctypes import create_string_buffer
+sys.path.append("..") # Access modules that are one level up
+from structures import getLadybugImage, getLadybugNMEAGPRMC
+
+
+
+def test_ladybug_image():
+    values = [1616, 1232, 3, 10] + range(5) + [0, 0xCAFEBABE, 2, 1292000000, 500, 77, 15]
+    values += [0x1FF]*6 + [0]*4 + [0x122, 1234] + [0x2AB]*5
+    values += [24.5, 121.25, 33.0, 7, True, 0, 8192, 9, 0, 0, 0]
+    buf = create_string_buffer( pack('<IIIILLLLL' +'L'*24 +'4xdddB?2xIIILLL', *values), 188 )
+    LImage = getLadybugImage( buf )
+    # CHANGING THE SOURCE BUFFER DOES NOT CHANGE THE DECODED RECORD
+    buf[0:4] = '\0'*4
+    assert LImage.uiCols == 1616
+    assert LImage.timeStamp == (0, 1, 2, 3, 4)
+    assert LImage.ulFingerprint == 0xCAFEBABE
+    assert LImage.ulSequenceId == 77
+    assert LImage.arulGainAdjust == [0xFF]*6
+    assert LImage.ulGamma == 0x22
+    assert LImage.ulShutter == [0xAB]*5
+    assert (LImage.dGPSLatitude, LImage.dGPSLongitude, LImage.dGPSAltitude) == (24.5, 121.25, 33.0)
+    assert LImage.uiDataSizeBytes == LImage.uiSeqNum == 8192
+    assert LImage._asdict()['ulSequenceId'] == 77
+    assert len(list(LImage)) == len(LImage._fields)
+
+
+
+def test_nmea_rmc():
+    data = pack('<?BBBHBxddddBBH4xdL14L', True, 12, 30, 45, 500, 65,
+                24.5, 121.5, 10., 90., 10, 12, 2010, 0., 3, *([0]*14))
+    gps = getLadybugNMEAGPRMC( data )
+    assert (gps.wRMCYear, gps.ucRMCMonth, gps.ucRMCDay) == (2010, 12, 10)
+    assert gps.ucRMCDataValid == 65
+    assert gps.dRMCCourse == 90.
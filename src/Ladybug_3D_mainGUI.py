@@ -35,7 +35,9 @@ from PIL import Image, ImageTk, ImageDraw, ImageChops
 import time
 from SFM import Polygon_Obj as PO
 from Ladybug import Ladybug3stream
-from SFM.opticflow import FeatureMatcher
+from SFM.opticflow import FeatureMatcher, RigMatcher
+from SFM.trackstore import TrackStore
+from SFM.frameselect import FrameSelector, save_keep_list
 from collections import namedtuple
 import pickle
 #from ladybug_image_series_selector import ladybug_interp_data
@@ -60,6 +62,8 @@ class ladybug3D_app(Tkinter.Tk):
             geometry='1000x800+100+100',
             maxWidth = 1000,
             maxHeight = 800,
+            prefetch=0, # FRAMES CONVERTED AHEAD (A SECOND SDK CONTEXT AND
+                        # 48 MB OF BUFFERS PER FRAME), 0 IS OFF
             # (x left, y ltop, y lbottom, x right, y rtop, y rbottom)
                         )
     settings = default_settings.copy()
@@ -638,7 +642,16 @@ class ladybug3D_app(Tkinter.Tk):
         # SET REGION OF INTEREST (CROPPING WINDOW)
         crop = self.settings['subwindows']
 #        fm = [FeatureMatcher('Pyramid','SIFT', roi=crop[i]) for i in range(5)]
-        fm = [FeatureMatcher('Grid','SURF', roi=crop[i]) for i in range(5)]
+        # KEYS ARE SAVED WITH THE STREAM AND REUSED ON THE NEXT RUN
+        store = self.PGRstream.fname + '.features'
+        fm = [FeatureMatcher('Grid','SURF', roi=crop[i], store=store, history=3)
+              for i in range(5)]
+        # THE FIVE CAMERAS OF A FRAME ARE MATCHED IN PARALLEL
+        rig = RigMatcher(fm, workers=self.settings.get('match_workers'))
+        # TRACKS OF ALL FIVE CAMERAS (RECTIFIED POSITIONS) FOR SLAM AND DISPLAY
+        self.tracks = tracks = TrackStore()
+        # ENDED TRACKS ARE KEPT FOR THIS MANY FRAMES
+        track_memory = self.settings.get('track_memory', 100)
 
         rangestring = askstring('Calculate Motion', 'Enter Range (separated with a space)')
         rangestring = rangestring.split()
@@ -670,9 +683,14 @@ class ladybug3D_app(Tkinter.Tk):
 
         rectifyPixel = self.PGRstream.rectifyPixel
 
-        for frameN in xrange(start, stopat ):
+        # SKIP FRAMES WHILE THE VEHICLE IS STOPPED
+        keep = self.select_frames(start, stopat, cam=xC[0])
+
+        prev_frame = None
+        prev_keys = None
+        for frameN in keep:
             # LOAD NEXT FRAME SET
-            self.image_manager(frameN)
+            self.image_manager(frameN, cameras=range(5))
 
             # REFRESH DISPLAY
             self.get_thumbs()
@@ -682,10 +700,11 @@ class ladybug3D_app(Tkinter.Tk):
             print 'Processing Frame', frameN
             image_keys = []
             image_matches = []
-            for i in range(5):
-                image = self.PGRstream.image( i ).convert('L')
-                # GET KEYS AND MATCHES FROM IMAGE
-                image_key, image_match = fm[i].add( asarray(image) )
+            images = [lambda i=i: asarray(self.PGRstream.image( i ).convert('L'))
+                      for i in range(5)]
+            # GET KEYS AND MATCHES FROM IMAGES
+            results = rig.add( images, frame=frameN )
+            for i, (image_key, image_match) in enumerate(results):
 #                print 'image_key', image_key
 #                print 'image_match', image_match
                 # RECTIFY POSITIONS USING LADYBUG API
@@ -693,13 +712,44 @@ class ladybug3D_app(Tkinter.Tk):
                 image_key[:,0], image_key[:,1] = XY
                 image_keys.append(image_key)
                 image_matches.append(image_match)
+                if prev_keys is not None:
+                    tracks.add_pair( i, prev_frame, prev_keys[i], frameN,
+                                     image_key, fm[i].pairs[-1] )
+            tracks.end_tracks(frameN)
+            tracks.prune(before=frameN - track_memory)
 
             Tr_code = SfM(self.log['seqid'][frameN], image_keys, image_matches)
             print repr( Tr_code )
             if Tr_code != None:
-                translation[frameN-1], translation[frameN] = Tr_code
+                translation[prev_frame], translation[frameN] = Tr_code
+            prev_frame = frameN
+            prev_keys = image_keys
+        rig.close()
+        for i in range(5):
+            fm[i].store.flush()
+        print 'Matching', rig.timings()
         print 'Translation', start, 'to', stopat
         print repr(translation[start:stopat])
+        print 'Tracks', tracks.stats()
+
+
+
+    def select_frames(self, start, stopat, cam=0):
+        '''Frames in the range where the vehicle or the scene moved (see
+        SFM/frameselect.py). The keep-list is saved with the stream
+        (<stream>.keep.npy) for batch runs (featurestore.extract reads it).
+        '''
+        log = self.log
+        def image(frame):
+            self.PGRstream.loadframe( frame, cameras=[cam] )
+            return self.PGRstream.image_array( cam )
+        frames = range(start, stopat)
+        keep = FrameSelector().keep_list( frames, log['lat'][start:stopat],
+                                          log['lon'][start:stopat],
+                                          log['valid'][start:stopat], image=image )
+        save_keep_list( self.PGRstream.fname + '.keep.npy', keep )
+        print 'Keeping', len(keep), 'of', len(frames), 'frames'
+        return keep
 
 
 
@@ -744,7 +794,7 @@ class ladybug3D_app(Tkinter.Tk):
 
         for frameN in xrange(start, stopat ):
             # LOAD NEXT FRAME SET
-            self.image_manager(frameN)
+            self.image_manager(frameN, cameras=range(5))
 
             # REFRESH DISPLAY
             self.get_thumbs()
@@ -789,6 +839,8 @@ class ladybug3D_app(Tkinter.Tk):
         pgr_fname = str(askopenfilename(initialdir=os.path.split(self.settings['dir_stream'][0]), filetypes=[("ladybug stream files","*.pgr")]))
         self.settings['dir_stream'] = pgr_fname
         self.PGRstream = Ladybug3stream( self.settings['dir_stream'] )
+        self.PGRstream.set_prefetch( self.settings.get('prefetch', 0) )
+        self.PGRstream.set_cache( 512 * 2**20 )
         self.totalStrVar.set( self.PGRstream.getNumberOfFrames() )
         self.image_manager(0)
         self.get_thumbs()
@@ -814,12 +866,22 @@ class ladybug3D_app(Tkinter.Tk):
         self.load_session(latest=True)
 
 
-    def image_manager(self, arg=None):
+    def mode_cameras(self):
+        '''Cameras shown in the current GUI mode.'''
+        if self.mode.get() == '2 Cameras':
+            return [(self.camera()+i)%5 for i in xrange(2)]
+        if self.mode.get() in ('Road View', '3 Cameras'):
+            return [(self.camera()+i+4)%5 for i in xrange(3)]
+        return range(6)
+
+
+    def image_manager(self, arg=None, cameras=None):
         '''Manages the loading of 'next', 'prev', or frame index images.
 
         Pass an integer to load a particular image. This method calls on
         ladybug3stream.load to load frame image set from stream. This does not
-        load a particular image.
+        load a particular image. Only the cameras shown in the current mode are
+        converted unless a list of cameras is given.
         '''
         tmpNum = self.frame()
         if isinstance(arg, int):    tmpNum = arg
@@ -834,7 +896,8 @@ class ladybug3D_app(Tkinter.Tk):
             do_flow = self.FLOWit.get()
             successful = self.PGRstream.loadframe( tmpNum,
                                                   ('SIFT' if do_sift else ''),
-                                                  FLOW = (self.camNumStrVar.get() if do_flow else None) )
+                                                  FLOW = (self.camNumStrVar.get() if do_flow else None),
+                                                  cameras = cameras or self.mode_cameras() )
             if not successful:
                 print 'Error returned from PGRstream.load'
                 return False
@@ -933,6 +996,8 @@ class ladybug3D_app(Tkinter.Tk):
         # CHECK IF FILE ALREADY EXISTS.
         if not os.path.exists( gps_filename + '.pkl'):
             # PROCESS ENTIRE VIDEO AND GET GPS DATA AS STRUCTURED ARRAY
+            # (valid AND gpsUTC FROM EACH FRAME'S OWN GPRMC DATA. THE FRAME
+            # INDEX TABLE HOLDS THE NEAREST FIX OF THE GPS SECTION INSTEAD)
             log = self.PGRstream.getVideoGPSlog()
 
 
@@ -1193,6 +1258,8 @@ class ladybug3D_app(Tkinter.Tk):
         self.resize( resizeparam )
         self.update()
         self.PGRstream = Ladybug3stream( self.settings.get('dir_stream') )
+        self.PGRstream.set_prefetch( self.settings.get('prefetch', 0) )
+        self.PGRstream.set_cache( 512 * 2**20 )
         self.totalStrVar.set( self.PGRstream.getNumberOfFrames() )
         self.image_manager( int(self.settings.get('imNumStrVar')) )
         self.get_thumbs()
@@ -56,7 +56,7 @@ import matplotlib.pyplot as plt  # plt.plot(x,y)  plt.show()
 #import cv2
 from Ladybug.interface import Ladybug3stream
 from SFM.online_SLAM import SLAM
-from SFM.opticflow import FeatureMatcher, flann_matcher
+from SFM.opticflow import FeatureMatcher, DescriptorSet, sum_timings
 from UI.gpsmath import calc_dist_haver, calc_dist_cos
 
 #===============================================================================
@@ -71,10 +71,13 @@ from UI.gpsmath import calc_dist_haver, calc_dist_cos
 #===============================================================================
 # MAIN METHOD AND TESTING AREA
 #===============================================================================
-def main(filename = r'E:\Ladybug3 Video\20101210 - Suhua - PGR original\Ladybug-Retrun-000000.pgr'):
-    """Run program on a *.PGR file."""
+def main(filename = r'E:\Ladybug3 Video\20101210 - Suhua - PGR original',
+         prefetch=0):
+    """Run program on a recording folder or *.PGR file. *prefetch* frames
+    are read ahead while matching (0 is off)."""
 
     ladybug = Ladybug3stream(filename)
+    ladybug.set_prefetch(prefetch)
     total_frames = ladybug.getNumberOfFrames()
     print 'Total frames:', total_frames
 
@@ -107,7 +110,7 @@ def main(filename = r'E:\Ladybug3 Video\20101210 - Suhua - PGR original\Ladybug-
         k, d = fm[0].getkeys( asarray(image) )
 #        k, d = fm[0].add( asarray(image) )
         keys.append(k)
-        desc.append(d)
+        desc.append( DescriptorSet(d) ) # INDEX IS BUILT ONCE AND KEPT
 
         if False:
             print 'F', i, 'keys:', len(keys[-1])
@@ -121,7 +124,7 @@ def main(filename = r'E:\Ladybug3 Video\20101210 - Suhua - PGR original\Ladybug-
                                             p[0], p[1])
                     if mdist > MIN_DIST:
                         #Calculate 3D points
-                        mm = flann_matcher( desc[i], desc[-1], threshold=0.4 )
+                        mm = desc[i].match( desc[-1], threshold=0.4 )
                         print mm
 
                         plt.plot(keys[i][:,0], -keys[i][:,1], 'r+')
@@ -140,6 +143,7 @@ def main(filename = r'E:\Ladybug3 Video\20101210 - Suhua - PGR original\Ladybug-
             print triangulated
             print positions
 
+    print 'FLANN', sum_timings(desc)
     del ladybug
 
 
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Persistent store of keypoints and descriptors for one recording.
+
+Features are keyed by frame and camera. Each detector configuration (see
+FeatureMatcher.config) has its own folder in the store. Features are written
+in chunks of many images. Each chunk is three .npy files:
+
+    <chunk>.keys.npy   --- N x 2 float32 keypoint positions of all images.
+    <chunk>.desc.npy   --- N x D descriptors of all images.
+    <chunk>.index.npy  --- (frame, cam, start, count) row ranges per image.
+
+Chunk names are unique per writer and the index file is renamed into place
+last. Readers ignore chunks without an index, so several processes can
+append to one store at the same time without locks. Key and descriptor files
+are memory-mapped when read.
+
+The *.SIFTpgm images of Ladybug3stream.create_SIFT_image_set are not kept
+here. They are the input files of the external SIFT program.
+
+:REQUIRES: numpy
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 16:05:44 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 16:05:44 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+import os
+import glob
+import time
+import uuid
+from numpy import array, zeros, empty, concatenate, float32, save, load
+from frameselect import load_keep_list
+
+INDEX_DTYPE = [('frame', 'i4'), ('cam', 'i2'), ('start', 'i8'), ('count', 'i4')]
+
+
+
+class FeatureStore:
+    '''Keypoints and descriptors of one detector configuration.
+
+    :PARAMETERS:
+        *dirname* --- Store folder of the recording, e.g. the stream file name
+            with a '.features' extension.
+        **config** --- Detector configuration name (subfolder).
+        **chunk_images** --- Number of images written per chunk.
+    '''
+    def __init__(self, dirname, config='default', chunk_images=64):
+        self.dirname = os.path.join(dirname, config)
+        if not os.path.isdir(self.dirname):
+            try:
+                os.makedirs(self.dirname)
+            except OSError:
+                # CREATED BY ANOTHER WORKER
+                if not os.path.isdir(self.dirname):
+                    raise
+        self.chunk_images = chunk_images
+        self.index = {} # (frame, cam): (chunk, start, count)
+        self.chunks = {} # chunk: (keys, desc) memory maps
+        self.pending = {} # (frame, cam): (keys, desc) NOT WRITTEN YET
+        self.refresh()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, key):
+        return key in self.index or key in self.pending
+
+    def __len__(self):
+        return len(set(self.index) | set(self.pending))
+
+
+    def refresh(self):
+        '''Add the chunks written by other workers since the last refresh.'''
+        for fname in glob.glob(os.path.join(self.dirname, '*.index.npy')):
+            chunk = os.path.basename(fname)[:-len('.index.npy')]
+            if chunk in self.chunks:
+                continue
+            self.chunks[chunk] = None # OPENED ON FIRST USE
+            for frame, cam, start, count in load(fname):
+                # THE FIRST COPY OF AN IMAGE WINS
+                self.index.setdefault((int(frame), int(cam)),
+                                      (chunk, int(start), int(count)))
+
+
+    def has(self, frame, cam):
+        return (frame, cam) in self
+
+
+    def get(self, frame, cam):
+        '''(keys, descriptors) of one image, or None if not stored.
+
+        Keys are an N by 2 array. Descriptors are None if N is 0.
+        '''
+        if (frame, cam) in self.pending:
+            return self.pending[(frame, cam)]
+        if (frame, cam) not in self.index:
+            return None
+        chunk, start, count = self.index[(frame, cam)]
+        keys, desc = self._open(chunk)
+        if count == 0:
+            return zeros((0, 2), float32), None
+        return keys[start:start+count], desc[start:start+count]
+
+
+    def put(self, frame, cam, keys, desc):
+        '''Add the features of one image. Written with the next chunk.'''
+        keys = array(keys, float32).reshape(-1, 2) # COPY, CALLERS MAY CHANGE KEYS
+        self.pending[(frame, cam)] = (keys, desc if len(keys) else None)
+        if len(self.pending) >= self.chunk_images:
+            self.flush()
+
+
+    def flush(self):
+        '''Write the pending images as one chunk.'''
+        if not self.pending:
+            return
+        items = sorted(self.pending.items())
+        index = empty(len(items), INDEX_DTYPE)
+        start = 0
+        for i, ((frame, cam), (keys, desc)) in enumerate(items):
+            index[i] = (frame, cam, start, len(keys))
+            start += len(keys)
+        keys = concatenate([k for f, (k, d) in items])
+        descs = [d for f, (k, d) in items if d is not None]
+        desc = concatenate(descs) if descs else zeros((0, 0), float32)
+        chunk = '{0:013d}-{1}'.format(int(time.time()*1000), uuid.uuid4().hex[:12])
+        self._write(chunk, keys, desc, index)
+        self.chunks[chunk] = (keys, desc)
+        for frame, cam, start, count in index:
+            self.index.setdefault((int(frame), int(cam)),
+                                  (chunk, int(start), int(count)))
+        self.pending = {}
+
+
+    def close(self):
+        self.flush()
+
+
+    def compact(self):
+        '''Merge all chunks into one. Other workers must not be reading.'''
+        self.flush()
+        self.refresh()
+        old = list(self.chunks)
+        if len(old) < 2:
+            return
+        for key in sorted(self.index):
+            self.pending[key] = self.get(*key)
+        self.index = {}
+        self.chunks = {}
+        self.flush()
+        for chunk in old:
+            for part in ('index', 'keys', 'desc'):
+                try:
+                    os.remove(os.path.join(self.dirname, '{0}.{1}.npy'.format(chunk, part)))
+                except OSError:
+                    pass # STILL OPEN (WINDOWS)
+
+
+    def _open(self, chunk):
+        if self.chunks.get(chunk) is None:
+            base = os.path.join(self.dirname, chunk)
+            self.chunks[chunk] = (load(base + '.keys.npy', mmap_mode='r'),
+                                  load(base + '.desc.npy', mmap_mode='r'))
+        return self.chunks[chunk]
+
+
+    def _write(self, chunk, keys, desc, index):
+        # THE INDEX IS RENAMED INTO PLACE LAST. SEE MODULE DOCSTRING.
+        for part, arr in [('keys', keys), ('desc', desc), ('index', index)]:
+            fname = os.path.join(self.dirname, '{0}.{1}.npy'.format(chunk, part))
+            with open(fname + '.tmp', 'wb') as wfile:
+                save(wfile, arr)
+            os.rename(fname + '.tmp', fname)
+
+
+
+def extract(stream, matchers, frames, cameras=range(5)):
+    '''Compute and store the features of the images not in the stores.
+
+    :PARAMETERS:
+        *stream* --- Ladybug3stream.
+        *matchers* --- FeatureMatcher for each camera, with a store.
+        *frames* --- Frame numbers, or the file name of a keep-list (see
+            frameselect.py) to skip stationary and duplicate frames.
+        **cameras** --- Camera units.
+
+    :RETURNS:
+        Number of images computed.
+    '''
+    if isinstance(frames, basestring):
+        frames = load_keep_list(frames)
+    computed = 0
+    for frame in frames:
+        missing = [cam for cam in cameras if not matchers[cam].store.has(frame, cam)]
+        if not missing:
+            continue
+        stream.loadframe( frame, cameras=missing )
+        for cam in missing:
+            matchers[cam].getkeys( stream.image_array(cam), frame=frame, cam=cam )
+            computed += 1
+    for cam in cameras:
+        matchers[cam].store.flush()
+    return computed
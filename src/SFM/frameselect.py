@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Frame selection before motion analysis.
+
+When the vehicle stops, hundreds of nearly identical frames would go through
+feature extraction, matching and the trifocal and SLAM steps. FrameSelector
+marks these frames so they can be skipped:
+
+    stationary  --- the GPS position in the frame header moved less than
+                    min_distance since the last kept frame AND the image looks
+                    the same as the last kept image.
+    duplicate   --- the GPS did not show movement (or has no fix) and the image
+                    is practically the same as the last kept or the previous
+                    image (a repeated frame).
+
+Images are compared with a difference hash (dHash) and the mean absolute
+difference (MAD) of a small luma thumbnail. Images are only requested when
+the GPS does not show movement, so a moving vehicle costs no image reads.
+
+The result is a keep-list of frame numbers. Consecutive kept frames have a
+baseline, so the scale estimate from sequence ids (Ladybug_SfM.process_keys)
+no longer divides by the gap of a stopped vehicle.
+
+:REQUIRES: numpy
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 18:48:20 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 18:48:20 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+from numpy import (asarray, array, zeros, sin, cos, arctan2, sqrt, radians,
+                   float32, uint8, abs, mean, save, load)
+
+# FRAME STATUS CODES
+KEEP, STATIONARY, DUPLICATE = 0, 1, 2
+
+EARTH_RADIUS = 6371000.0 # METERS
+
+
+
+#===============================================================================
+# GPS AND IMAGE SIGNATURES
+#===============================================================================
+def gps_distance(lat1, lon1, lat2, lon2):
+    '''Haversine distance in meters. Works on numbers or arrays.'''
+    lat1, lon1, lat2, lon2 = [radians(asarray(x, float)) for x in (lat1, lon1, lat2, lon2)]
+    a = sin((lat2-lat1)/2)**2 + sin((lon2-lon1)/2)**2 * cos(lat1) * cos(lat2)
+    return EARTH_RADIUS * 2 * arctan2(sqrt(a), sqrt(1-a))
+
+
+def luma(image):
+    '''2D float32 luma of a grey or RGB image (ndarray or PIL image).'''
+    image = asarray(image)
+    if image.ndim == 3:
+        image = image[:,:,:3].dot(array([0.299, 0.587, 0.114], float32))
+    return image.astype(float32)
+
+
+def downsample(image, shape):
+    '''Block mean of a 2D image to *shape* (rows, cols). Edge rows and
+    columns that do not fill a block are dropped.'''
+    rows, cols = shape
+    by, bx = image.shape[0] // rows, image.shape[1] // cols
+    assert by and bx, 'image is smaller than the thumbnail.'
+    image = image[:rows*by, :cols*bx]
+    return image.reshape(rows, by, cols, bx).mean(axis=3).mean(axis=1)
+
+
+def dhash(image, size=8):
+    '''64 bit (for size 8) difference hash of a 2D luma image: one bit per
+    pair of horizontally neighbouring thumbnail pixels.'''
+    thumb = downsample(image, (size, size + 1))
+    bits = (thumb[:,1:] > thumb[:,:-1]).ravel()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def hamming(hash1, hash2):
+    return bin(hash1 ^ hash2).count('1')
+
+
+class Signature:
+    '''dHash and luma thumbnail of one image.'''
+    def __init__(self, image, hash_size=8, thumb_shape=(24, 32)):
+        image = luma(image)
+        self.hash = dhash(image, hash_size)
+        self.thumb = downsample(image, thumb_shape)
+
+    def difference(self, other):
+        '''(Hamming distance of the hashes, MAD of the thumbnails)'''
+        return (hamming(self.hash, other.hash),
+                float(mean(abs(self.thumb - other.thumb))))
+
+
+
+#===============================================================================
+# SELECTION
+#===============================================================================
+class FrameSelector:
+    '''Chooses the frames worth analysing.
+
+    :PARAMETERS:
+        **min_distance** --- Meters the vehicle must move since the last kept
+            frame for a frame to be kept without looking at the image.
+        **max_hamming** --- dHash bits that may differ in a stationary frame.
+        **max_mad** --- Thumbnail MAD (grey levels) of a stationary frame.
+        **duplicate_mad** --- Thumbnail MAD of a duplicate frame. Sensor noise
+            averages out in the thumbnail, so only repeated images are this close.
+        **max_gap** --- Keep at least every max_gap-th frame. None for no limit.
+    '''
+    def __init__(self, min_distance=0.5, max_hamming=6, max_mad=3.0,
+                 duplicate_mad=0.01, max_gap=None):
+        self.min_distance = min_distance
+        self.max_hamming = max_hamming
+        self.max_mad = max_mad
+        self.duplicate_mad = duplicate_mad
+        self.max_gap = max_gap
+        self.images_read = 0
+
+
+    def select(self, frames, lat=None, lon=None, valid=None, image=None):
+        '''Status of each frame.
+
+        :PARAMETERS:
+            *frames* --- Frame numbers in increasing order.
+            **lat**, **lon** --- GPS position of each frame (indexed like
+                *frames*). None without GPS.
+            **valid** --- GPS status of each frame. Defaults to a non-zero
+                position.
+            **image** --- Function image(frame) that returns the image of a
+                frame (e.g. one camera unit). Called only for frames that the
+                GPS does not show moving. None to select by GPS only.
+
+        :RETURNS:
+            uint8 array of KEEP, STATIONARY or DUPLICATE for each frame.
+        '''
+        frames = list(frames)
+        status = zeros(len(frames), uint8)
+        if lat is not None:
+            lat, lon = asarray(lat, float), asarray(lon, float)
+            if valid is None:
+                valid = (lat != 0) | (lon != 0)
+            valid = asarray(valid, bool)
+        last = None # INDEX OF THE LAST KEPT FRAME
+        last_sig = prev_sig = None # SIGNATURES OF THE LAST KEPT AND PREVIOUS FRAME
+        for i, frame in enumerate(frames):
+            if last is None or (self.max_gap and i - last >= self.max_gap):
+                last, last_sig, prev_sig = i, None, None
+                continue
+            moved = None # UNKNOWN
+            if lat is not None and valid[i] and valid[last]:
+                moved = bool(gps_distance(lat[last], lon[last], lat[i], lon[i])
+                             >= self.min_distance)
+            if image is None:
+                if moved is False:
+                    status[i] = STATIONARY
+                else:
+                    last = i
+                continue
+
+            if moved:
+                last, last_sig, prev_sig = i, None, None
+                continue
+            # THE LAST KEPT IMAGE IS ONLY READ WHEN A FRAME AFTER IT IS COMPARED
+            sig = self._signature(image, frame)
+            if last_sig is None:
+                last_sig = self._signature(image, frames[last])
+            bits, mad = sig.difference(last_sig)
+            if min(mad, (prev_sig or last_sig).difference(sig)[1]) <= self.duplicate_mad:
+                status[i] = DUPLICATE
+            elif bits <= self.max_hamming and mad <= self.max_mad:
+                status[i] = STATIONARY
+            else:
+                last, last_sig = i, sig
+            prev_sig = sig
+        return status
+
+
+    def keep_list(self, frames, *args, **kwargs):
+        '''Frame numbers to analyse (see select).'''
+        frames = list(frames)
+        status = self.select(frames, *args, **kwargs)
+        return [frame for frame, s in zip(frames, status) if s == KEEP]
+
+
+    def _signature(self, image, frame):
+        self.images_read += 1
+        return Signature(image(frame))
+
+
+
+def save_keep_list(fname, keep):
+    save(fname, array(keep, 'i4'))
+
+
+def load_keep_list(fname):
+    return [int(frame) for frame in load(fname)]
@@ -26,10 +26,25 @@ __date__ = 'Thu Sep 13 23:01:23 2012'
 __version__ = '0.1'
 
 
-from numpy import array, arange, int32, append, cross, zeros, where, pi, sqrt, r_, mean, std, min, max, sum
+from numpy import (array, arange, cross, zeros, where, pi, sqrt, r_, mean, std, min, max,
+                   sum, float32, argsort, searchsorted, minimum, uint8, int32,
+                   full, argpartition, asarray, iinfo)
 import matplotlib.pyplot as plt  # plt.plot(x,y)  plt.show()
 import cv2
-
+import os
+import sys
+import time
+import hashlib
+import threading
+from multiprocessing.pool import ThreadPool
+from featurestore import FeatureStore
+
+# FLANN INDEX PARAMETERS FOR BINARY (ORB, BRIEF) DESCRIPTORS
+LSH_PARAMS = dict(algorithm=6, table_number=6, key_size=12, multi_probe_level=1)
+# BINARY SETS ARE MATCHED BY BRUTE FORCE UP TO THIS MANY DESCRIPTOR PAIRS
+BRUTE_FORCE_PAIRS = 1000000
+# BITS SET IN EACH BYTE VALUE
+POPCOUNT = array([bin(i).count('1') for i in range(256)], uint8)
 
 detector_formats = ["","Grid","Pyramid"]
 detector_types = ["FAST","STAR","SIFT","SURF","ORB","MSER","GFTT","HARRIS"]
@@ -51,20 +66,38 @@ class FeatureMatcher:
     def __init__(self,
                  detector_format='Pyramid', detector_type='FAST',
                  extractor_format='', extractor_type='SIFT',
-                 roi=None):
+                 roi=None, store=None, history=None):
         '''Initialize a cv2 FeatureDetector and DescriptorExtractor.
 
         Defaults are "PyramidFAST" for feature detecting and "SIFT" for descriptor
-        extraction. FLANN is used for matching.
+        extraction. FLANN is used for matching (LSH for the binary ORB and
+        BRIEF descriptors, see DescriptorSet).
+
+        If **store** is the folder of a feature store (see featurestore.py),
+        keys of images given with a frame and camera number are saved there
+        and loaded instead of detected the next time.
+
+        If **history** is given, only the keys, descriptors and matches of the
+        last **history** images (at least 3) are kept. Use a TrackStore (see
+        trackstore.py) for longer tracks.
         '''
         detector = detector_format + detector_type
         extractor = extractor_format + extractor_type
         self.featdet = cv2.FeatureDetector_create(detector)
         self.desext = cv2.DescriptorExtractor_create(extractor)
         self.crop = roi
+        # NAME OF THE DETECTOR CONFIGURATION FOR THE FEATURE STORE
+        self.config = detector + '-' + extractor
+        if roi is not None:
+            self.config += '-roi' + hashlib.md5(repr(array(roi).tolist())).hexdigest()[:8]
+        self.store = FeatureStore(store, self.config) if store else None
+        assert history is None or history >= 3, 'history must be at least 3 images'
+        self.history = history
 
         self.keys = []
         self.descriptors = []
+        self.sets = [] # DescriptorSet OF EACH IMAGE, INDEXES ARE KEPT
+        self.pairs = [] # MATCHES OF EACH IMAGE TO THE NEXT
         self.matches = []
 
 
@@ -99,7 +132,8 @@ class FeatureMatcher:
 
 
 
-    def add(self, image, triplet=True, threshold=0.5):
+    def add(self, image, triplet=True, threshold=0.5, frame=None, cam=None,
+            mutual=False):
         '''Add one RGB or grayscale image at a time to the class.
 
         Each image: detect keypoints and descriptors.
@@ -112,6 +146,10 @@ class FeatureMatcher:
             *image* --- ndarray, single band
             **triplet** --- boolean, retrieve triplets (True) or pairs (False)
             **threshold** --- float, Matching threshold (Uniqueness)
+            **frame**, **cam** --- Frame and camera of the image for the
+                feature store (see getkeys).
+            **mutual** --- Keep only mutual nearest neighbours. Uses the
+                index of the previous image that was built when it was added.
 
         :RETURNS:
             **tuple**
@@ -122,15 +160,19 @@ class FeatureMatcher:
             - Change to add a parameter where the user sets how many images to match.
 
         '''
-        keys, desc = self.getkeys(image)
+        keys, desc = self.getkeys(image, frame, cam)
+        if self.history:
+            self._forget(self.history - 1)
         self.descriptors.append( desc )
+        self.sets.append( DescriptorSet(desc) )
         self.keys.append( keys )
 
         if len(self.keys) >= 2:
             # Run matching algorithm on last two images
-            self.matches.append( flann_matcher(self.descriptors[-2],
-                                               self.descriptors[-1],
-                                               threshold=threshold) )
+            self.pairs.append( self.sets[-2].match(self.sets[-1],
+                                                   threshold=threshold,
+                                                   mutual=mutual) )
+            self.matches.append( self.pairs[-1] )
             # If triplet correspondences are not wanted, return pair match
             if triplet == False:
                 return self.keys[-1], self.matches[-1]
@@ -143,17 +185,45 @@ class FeatureMatcher:
 
 
 
-    def getkeys(self, image):
+    def getkeys(self, image, frame=None, cam=None):
         '''Returns a key points and corresponding descriptors from an image
         file or ndarray.
 
         :PARAMETERS:
-            *image* --- Image filename or an image ndarray
+            *image* --- Image filename, an image ndarray, or a function that
+                returns one. A function is only called if the keys are not
+                in the feature store.
+            **frame**, **cam** --- Frame and camera of the image. Keys are
+                loaded from and saved to the feature store when given.
 
         :RETURNS:
             - Key points for image. N by 2 array.
             - Descriptors for key points. N-length list.
         '''
+        if self.store is not None and frame is not None:
+            found = self.store.get(frame, cam)
+            if found is not None:
+                # KEYS ARE OFTEN RECTIFIED IN PLACE, STORED KEYS ARE READ-ONLY
+                return array(found[0]), found[1]
+        if callable(image):
+            image = image()
+        keyarr, desc = self._detect(image)
+        if self.store is not None and frame is not None:
+            self.store.put(frame, cam, keyarr, desc)
+        return keyarr, desc
+
+
+
+    def _forget(self, n):
+        '''Keep the lists of the last *n* images only.'''
+        for images in (self.keys, self.descriptors, self.sets):
+            del images[:-n]
+        for pairs in (self.pairs, self.matches):
+            del pairs[:-(n-1)]
+
+
+
+    def _detect(self, image):
         if isinstance(image, str):
             image = cv2.imread(image, 0)
         if len(image.shape) == 3:
@@ -192,6 +262,265 @@ class FeatureMatcher:
 
 
 
+    def tracks(self, min_length=2):
+        '''Key point tracks through all added images (see chain_tracks).'''
+        return chain_tracks(self.pairs, min_length)
+
+
+
+    def timings(self):
+        '''Index build and query seconds of all added images.'''
+        return sum_timings(self.sets)
+
+
+
+class RigMatcher:
+    '''FeatureMatchers of the cameras of a rig, run in parallel.
+
+    Detection, description and FLANN matching of the cameras of one frame
+    run on a thread pool (OpenCV releases the GIL). Each camera's matcher is
+    used by one thread at a time, so its lists and feature store need no
+    locks.
+
+        rig = RigMatcher([FeatureMatcher('Grid','SURF') for i in range(5)])
+        for frame in frames:
+            keys, matches = zip(*rig.add(images, frame=frame))
+        print rig.timings()
+
+    :PARAMETERS:
+        *matchers* --- FeatureMatcher of each camera, in camera order.
+        **workers** --- Number of threads (default one per camera).
+    '''
+    def __init__(self, matchers, workers=None):
+        self.matchers = list(matchers)
+        self.workers = workers or len(self.matchers)
+        self.executor = ThreadPool(self.workers)
+        # IMAGE FUNCTIONS READ FROM ONE STREAM, WHICH IS NOT THREAD-SAFE
+        self.read_lock = threading.Lock()
+        self.seconds = [[] for m in self.matchers] # add() TIME OF EACH CAMERA
+        self.frame_seconds = [] # WALL TIME OF EACH rig.add()
+
+    def __len__(self):
+        return len(self.matchers)
+
+    def __getitem__(self, cam):
+        return self.matchers[cam]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def add(self, images, frame=None, cameras=None, **kwargs):
+        '''Add one image per camera (see FeatureMatcher.add).
+
+        :PARAMETERS:
+            *images* --- Image of each camera of *cameras*. Functions that
+                return the image are called one at a time.
+            **frame** --- Frame number for the feature stores.
+            **cameras** --- Camera numbers of *images* (default all).
+            Other keywords are passed to FeatureMatcher.add.
+
+        :RETURNS:
+            List of (keys, matches) in the order of *cameras*.
+        '''
+        if cameras is None:
+            cameras = range(len(self.matchers))
+        assert len(images) == len(cameras), 'one image per camera'
+        t0 = time.time()
+        jobs = [self.executor.apply_async(self._add, (cam, image, frame, kwargs))
+                for cam, image in zip(cameras, images)]
+        results = [job.get() for job in jobs]
+        self.frame_seconds.append( time.time() - t0 )
+        return results
+
+
+    def timings(self):
+        '''Dict of camera: timing of its add() calls (count, total, mean,
+        max and last seconds) and FLANN index times (see
+        FeatureMatcher.timings). Key 'frames' is the wall time of the rig's
+        add() calls.'''
+        report = {}
+        for cam, (matcher, seconds) in enumerate(zip(self.matchers, self.seconds)):
+            timing = dict(count=len(seconds), total=float(sum(seconds)),
+                          mean=float(mean(seconds)) if seconds else 0.,
+                          max=float(max(seconds)) if seconds else 0.,
+                          last=seconds[-1] if seconds else 0.)
+            timing.update( matcher.timings() )
+            report[cam] = timing
+        frames = self.frame_seconds
+        report['frames'] = dict(count=len(frames), total=float(sum(frames)),
+                                workers=self.workers)
+        return report
+
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.close()
+            self.executor.join()
+            self.executor = None
+
+
+    def _add(self, cam, image, frame, kwargs):
+        if callable(image):
+            image = _locked(image, self.read_lock)
+        t0 = time.time()
+        result = self.matchers[cam].add(image, frame=frame, cam=cam, **kwargs)
+        self.seconds[cam].append( time.time() - t0 )
+        return result
+
+
+
+def _locked(func, lock):
+    def call():
+        with lock:
+            return func()
+    return call
+
+
+
+class DescriptorSet:
+    '''Descriptors of one image with a FLANN index that is built on first use
+    and kept.
+
+    Float descriptors (SIFT, SURF) get a kd-tree forest. Binary descriptors
+    (ORB, BRIEF; uint8 bytes) get an LSH index, or are matched by brute force
+    Hamming distance (see hamming_knn) when the two sets are small.
+
+    The set can be matched against many other sets. Each index is built once,
+    whichever side of a match the set is on.
+
+    :PARAMETERS:
+        *desc* --- N by D descriptors (or None for no keys).
+        **trees** --- The number of parallel kd-trees to use. Try [1 to 16].
+        **checks** --- Leaves visited per query. Higher is slower and more
+            exact.
+        **brute_force** --- Largest number of descriptor pairs of a binary
+            query matched by brute force.
+    '''
+    def __init__(self, desc, trees=4, checks=32, brute_force=BRUTE_FORCE_PAIRS):
+        self.binary = desc is not None and asarray(desc).dtype == uint8
+        self.desc = (zeros((0, 0), float32) if desc is None
+                     else array(desc, uint8 if self.binary else float32))
+        self.trees = trees
+        self.checks = checks
+        self.brute_force = brute_force
+        self.flann = None
+        self.build_time = 0.
+        self.query_time = 0.
+        self.queries = 0
+        self.brute = 0 # QUERIES MATCHED BY BRUTE FORCE
+
+    def __len__(self):
+        return len(self.desc)
+
+
+    def index(self):
+        '''The cv2.flann_Index of this set, built on the first call.'''
+        if self.flann is None:
+            t0 = time.time()
+            params = LSH_PARAMS if self.binary else dict(algorithm=1, trees=self.trees)
+            self.flann = cv2.flann_Index(self.desc, params)
+            self.build_time += time.time() - t0
+        return self.flann
+
+
+    def knn(self, desc, k=2):
+        '''Indices and squared distances (Hamming distances for binary sets)
+        of the *k* nearest descriptors in this set for each row of *desc*.
+        Index -1 where LSH found no neighbour.'''
+        if self.binary and len(self) * len(desc) <= self.brute_force:
+            t0 = time.time()
+            idx, dist = hamming_knn(desc, self.desc, k)
+            self.query_time += time.time() - t0
+            self.queries += len(desc)
+            self.brute += len(desc)
+            return idx, dist
+        index = self.index()
+        t0 = time.time()
+        idx, dist = index.knnSearch(desc, k, params=dict(checks=self.checks))
+        self.query_time += time.time() - t0
+        self.queries += len(desc)
+        return idx, dist
+
+
+    def match(self, other, threshold=0.6, mutual=False):
+        '''Returns a 2 by N ndarray of matching indices. Row 0 are indices of
+        this set and row 1 the corresponding indices in *other*.
+
+        :PARAMETERS:
+            *other* --- DescriptorSet to match to. Its index is used.
+            **threshold** --- Lower value returns fewer but better matches.
+                Ratio of squared distances (of the nearest and second
+                nearest), also for Hamming distances.
+            **mutual** --- Keep only pairs that are also nearest neighbours
+                from *other* to this set (uses the index of this set).
+        '''
+        if len(self) == 0 or len(other) < 2:
+            return zeros((2, 0), int)
+        assert self.binary == other.binary, 'binary and float descriptors'
+        idx2, dist = other.knn(self.desc, 2)
+        dist = dist.astype(float)
+        if self.binary:
+            dist **= 2
+        mask = (dist[:,0] < threshold * dist[:,1]) & (idx2[:,0] >= 0)
+        idx1 = arange(len(self))
+        if mutual:
+            back = self.knn(other.desc, 1)[0][:,0]
+            mask &= back[idx2[:,0]] == idx1
+        return array([idx1[mask], idx2[mask,0]], int)
+
+
+    def timings(self):
+        return dict(build=self.build_time, query=self.query_time,
+                    queries=self.queries, brute=self.brute)
+
+
+
+def sum_timings(sets):
+    '''Total index build and query seconds of DescriptorSets.'''
+    timings = dict(build=0., query=0., queries=0, brute=0, indexes=0)
+    for dset in sets:
+        for key, value in dset.timings().items():
+            timings[key] += value
+        timings['indexes'] += dset.flann is not None
+    return timings
+
+
+
+def hamming_knn(query, train, k=2, chunk_bytes=1<<24):
+    '''Brute force *k* nearest neighbours of binary descriptors.
+
+    :PARAMETERS:
+        *query*, *train* --- N by B uint8 descriptors (B bytes each).
+        **chunk_bytes** --- Size of the XOR array of one block of queries.
+
+    :RETURNS:
+        (idx, dist) int32 arrays of the train indices and Hamming distances,
+        nearest first. Index -1 where train has fewer than *k* descriptors.
+    '''
+    query, train = asarray(query, uint8), asarray(train, uint8)
+    idx = full((len(query), k), -1, int32)
+    dist = full((len(query), k), iinfo(int32).max, int32)
+    n = k if k < len(train) else len(train)
+    if not n or not len(query):
+        return idx, dist
+    rows = int(chunk_bytes // train.size) or 1
+    for start in xrange(0, len(query), rows):
+        block = query[start:start+rows]
+        d = POPCOUNT[block[:,None,:] ^ train[None,:,:]].sum(2, dtype=int32)
+        near = argpartition(d, n - 1, axis=1)[:,:n]
+        near_dist = d[arange(len(block))[:,None], near]
+        order = argsort(near_dist, axis=1, kind='mergesort')
+        line = arange(len(block))[:,None]
+        idx[start:start+rows,:n] = near[line, order]
+        dist[start:start+rows,:n] = near_dist[line, order]
+    return idx, dist
+
+
+
 def extend_matchset(match1, match2):
     '''Returns a 3 by N ndarray of correspondences over three images.
 
@@ -201,44 +530,85 @@ def extend_matchset(match1, match2):
 
     :RETURNS:
         3 by N ndarray, where N is the number of matches over three images.
+        (K+1 by N if *match1* has K rows.)
 
     '''
-    # ADD A NEW ROW TO MATCH1 TO FILL
-    len2 = len(match2)
-    M = append(array(match1, int), zeros((len2-1,len(match1[0])),int)-1, 0)
+    match1, match2 = array(match1, int), array(match2, int)
+    # JOIN THE LAST ROW OF MATCH1 TO THE FIRST ROW OF MATCH2
+    order = argsort(match2[0], kind='mergesort')
+    found, pos = _lookup(match2[0][order], match1[-1])
+    return r_[match1[:,found], match2[1:,order[pos[found]]]]
 
-    B1 = M[-len2]
-    B2 = match2[0]
-    for b1 in B1:
-        if b1 in B2:
-            M[-len2+1:,where(B1 == b1)] = match2[1:,where(B2 == b1)]
 
-    return M[:,M[-1] != -1].copy()
 
+def chain_tracks(pairs, min_length=2):
+    '''Join the matches of consecutive images into tracks of any length.
 
+    Tracks are joined in one pass over the pairs with sorting and
+    searchsorted (no Python loop over matches). When two tracks reach the
+    same key point, the first one continues.
+
+    :PARAMETERS:
+        *pairs* --- 2 by N match arrays. pairs[k] matches image k to k+1.
+        **min_length** --- Minimum number of images in a track.
 
-def flann_matcher(desc1, desc2, threshold=0.6, trees=4):
+    :RETURNS:
+        (n_images, n_tracks) ndarray of key point indices, -1 in the images
+        a track is not seen in. Tracks are ordered by their first image.
+    '''
+    pairs = [array(pair, int).reshape(2, -1) for pair in pairs]
+    nframes = len(pairs) + 1
+    tracks = zeros((nframes, int(sum([pair.shape[1] for pair in pairs]))), int) - 1
+    n = 0
+    for k, (a, b) in enumerate(pairs):
+        # TRACKS SEEN IN IMAGE k, SORTED BY KEY POINT INDEX
+        alive = where(tracks[k,:n] >= 0)[0]
+        order = argsort(tracks[k,alive], kind='mergesort')
+        found, pos = _lookup(tracks[k,alive[order]], a)
+        tracks[k+1,alive[order[pos[found]]]] = b[found]
+        # UNMATCHED PAIRS START NEW TRACKS
+        m = len(a) - found.sum()
+        tracks[k,n:n+m] = a[~found]
+        tracks[k+1,n:n+m] = b[~found]
+        n += m
+    tracks = tracks[:,:n]
+    return tracks[:,(tracks >= 0).sum(0) >= min_length]
+
+
+
+def _lookup(keys, values):
+    '''(found, pos): whether each value is in sorted *keys* and where.'''
+    if len(keys) == 0:
+        return zeros(len(values), bool), zeros(len(values), int)
+    pos = minimum(searchsorted(keys, values), len(keys) - 1)
+    return keys[pos] == values, pos
+
+
+
+def flann_matcher(desc1, desc2, threshold=0.6, trees=4, mutual=False):
     """Returns a 2 by N ndarray of matching indices.
 
     Column 0 are indices of first set and col 1 are corresponding indices in
-    second set. Uses the KDTree algorithm in cv2.flann_index.
+    second set. Uses the KDTree algorithm in cv2.flann_index, or LSH and
+    brute force Hamming distance for binary descriptors (see DescriptorSet).
 
     :PARAMETERS:
-        *desc1* --- List of descriptors for first set
-        *desc2* --- List of descriptors for second set
+        *desc1* --- List of descriptors for first set, or a DescriptorSet
+        *desc2* --- List of descriptors for second set, or a DescriptorSet.
+            Pass DescriptorSets to keep their indexes for the next call.
         **threshold** --- Lower value returns fewer but better matches
         **trees** --- The number of parallel kd-trees to use. Try [1 to 16].
+        **mutual** --- Keep only mutual nearest neighbours.
 
     :RETURNS:
         2 by N ndarray, where N is the number of matches.
 
     """
-    flann = cv2.flann_Index(desc2, dict(algorithm=1, trees=trees))
-    idx2, dist = flann.knnSearch(desc1, 2, params={})
-    mask = dist[:,0] / dist[:,1] < threshold
-    idx1 = arange(len(desc1))
-    pairs = int32( zip(idx1, idx2[:,0]) )
-    return pairs[mask].astype(int).T
+    if not isinstance(desc1, DescriptorSet):
+        desc1 = DescriptorSet(desc1, trees)
+    if not isinstance(desc2, DescriptorSet):
+        desc2 = DescriptorSet(desc2, trees)
+    return desc1.match(desc2, threshold, mutual)
 
 
 
@@ -302,3 +672,85 @@ def test_vector_flow(a, b, c, max_angle=pi/32):
     return gdvecs & gdscale
 
 
+
+#===============================================================================
+# BENCHMARK
+#===============================================================================
+# (name, detector_format, detector_type, extractor_format, extractor_type)
+BENCHMARK_CONFIGS = [('SIFT+kd-tree', '', 'SIFT', '', 'SIFT'),
+                     ('ORB+LSH', '', 'ORB', '', 'ORB')]
+
+
+def benchmark(images, configs=BENCHMARK_CONFIGS, threshold=0.6):
+    '''Compare detector, descriptor and index combinations on consecutive
+    images.
+
+    Each image is matched to the next. Inliers are the matches consistent
+    with a RANSAC fundamental matrix.
+
+    :PARAMETERS:
+        *images* --- List of images (ndarrays) in frame order.
+        **configs** --- List of (name, detector_format, detector_type,
+            extractor_format, extractor_type).
+        **threshold** --- Matching threshold.
+
+    :RETURNS:
+        Dict of name: dict(keys, detect_ms, match_ms, matches, matches_per_s,
+        inliers, inlier_yield) where keys, matches and inliers are per image
+        pair (keys per image) and times are per image.
+    '''
+    results = {}
+    for name, dformat, dtype, eformat, etype in configs:
+        fm = FeatureMatcher(dformat, dtype, eformat, etype)
+        t0 = time.time()
+        found = [fm.getkeys(image) for image in images]
+        detect = time.time() - t0
+        sets = [DescriptorSet(desc) for keys, desc in found]
+        t0 = time.time()
+        pairs = [sets[i].match(sets[i+1], threshold) for i in xrange(len(sets) - 1)]
+        match = time.time() - t0
+        matches = inliers = 0
+        for i, pair in enumerate(pairs):
+            matches += pair.shape[1]
+            if pair.shape[1] < 8:
+                continue
+            pts1 = found[i][0][pair[0]].astype(float32)
+            pts2 = found[i+1][0][pair[1]].astype(float32)
+            F, mask = cv2.findFundamentalMat(pts1, pts2, cv2.FM_RANSAC, 1., 0.99)
+            inliers += int(mask.sum()) if mask is not None else 0
+        npairs = float(len(pairs)) or 1.
+        results[name] = dict(keys=sum([len(keys) for keys, desc in found]) / float(len(found)),
+                             detect_ms=detect * 1000. / len(images),
+                             match_ms=match * 1000. / len(images),
+                             matches=matches / npairs,
+                             matches_per_s=matches / match if match else 0.,
+                             inliers=inliers / npairs,
+                             inlier_yield=inliers / float(matches) if matches else 0.)
+        r = results[name]
+        print ('{0:14} {1:7.0f} keys  detect {2:7.1f} ms  match {3:7.1f} ms  '
+               '{4:7.0f} matches ({5:8.0f}/s)  {6:7.0f} inliers ({7:.0%})'.format(
+               name, r['keys'], r['detect_ms'], r['match_ms'], r['matches'],
+               r['matches_per_s'], r['inliers'], r['inlier_yield']))
+    return results
+
+
+
+#===============================================================================
+# MAIN METHOD AND TESTING AREA
+#===============================================================================
+def main(fname, first=0, last=10, cam=0):
+    """Benchmark SIFT+kd-tree against ORB+LSH on frames of a Ladybug stream."""
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from Ladybug import Ladybug3stream
+    stream = Ladybug3stream(fname)
+    images = []
+    for frame in xrange(int(first), int(last)):
+        stream.loadframe( frame, cameras=[int(cam)] )
+        # COPY, THE VIEW IS OVERWRITTEN BY THE NEXT FRAME
+        images.append( array(stream.image_array(int(cam))) )
+    benchmark(images)
+
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
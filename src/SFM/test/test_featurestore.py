@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the persistent feature store.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 16:05:44 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 16:05:44 2026'
+__version__ = '0.1'
+
+import os
+import sys
+import glob
+import shutil
+import tempfile
+sys.path.append("..") # Access modules that are one level up
+from numpy import random, float32, memmap
+from featurestore import FeatureStore, extract
+from frameselect import save_keep_list
+
+
+
+def features(n, seed):
+    rand = random.RandomState(seed)
+    return rand.uniform(0, 1000, (n, 2)), rand.rand(n, 128).astype(float32)
+
+
+def test_store():
+    dirname = tempfile.mkdtemp()
+    try:
+        store = FeatureStore(dirname, 'FAST-SIFT', chunk_images=4)
+        for frame in xrange(6):
+            keys, desc = features(frame * 10, frame)
+            store.put(frame, 0, keys, desc)
+        # ONE FULL CHUNK WRITTEN, TWO IMAGES PENDING
+        assert len(glob.glob(os.path.join(dirname, 'FAST-SIFT', '*.index.npy'))) == 1
+        store.close()
+
+        # A SECOND WRITER APPENDS ITS OWN CHUNK
+        other = FeatureStore(dirname, 'FAST-SIFT')
+        other.put(3, 1, *features(5, 99))
+        other.close()
+
+        store = FeatureStore(dirname, 'FAST-SIFT')
+        assert len(store) == 7
+        assert store.get(9, 0) is None
+        keys, desc = store.get(0, 0)
+        assert keys.shape == (0, 2) and desc is None
+        keys, desc = store.get(5, 0)
+        assert isinstance(desc, memmap)
+        assert (keys == features(50, 5)[0].astype(float32)).all()
+        assert (desc == features(50, 5)[1]).all()
+        assert (store.get(3, 1)[1] == features(5, 99)[1]).all()
+
+        store.compact()
+        assert len(glob.glob(os.path.join(dirname, 'FAST-SIFT', '*.index.npy'))) == 1
+        store = FeatureStore(dirname, 'FAST-SIFT')
+        assert len(store) == 7
+        assert (store.get(4, 0)[1] == features(40, 4)[1]).all()
+        # OTHER DETECTOR CONFIGURATIONS ARE SEPARATE
+        assert len(FeatureStore(dirname, 'ORB-ORB')) == 0
+    finally:
+        shutil.rmtree(dirname, True)
+
+
+
+class CountingMatcher:
+    '''Stands in for a FeatureMatcher with a store.'''
+    def __init__(self, store):
+        self.store = store
+
+    def getkeys(self, image, frame=None, cam=None):
+        keys, desc = features(3, frame)
+        self.store.put(frame, cam, keys, desc)
+        return keys, desc
+
+
+class FrameStream:
+    def __init__(self):
+        self.loaded = []
+
+    def loadframe(self, frame, cameras=None):
+        self.loaded.append(frame)
+
+    def image_array(self, cam):
+        return None
+
+
+def test_extract_keep_list():
+    dirname = tempfile.mkdtemp()
+    keep = os.path.join(dirname, 'Ladybug-Test-000000.pgr.keep.npy')
+    save_keep_list(keep, [0, 4, 5, 9])
+    store = FeatureStore(os.path.join(dirname, 'features'))
+    stream = FrameStream()
+    matchers = [CountingMatcher(store) for cam in range(2)]
+    assert extract(stream, matchers, keep, cameras=range(2)) == 8
+    assert stream.loaded == [0, 4, 5, 9]
+    assert store.has(9, 1) and not store.has(1, 0)
+    shutil.rmtree(dirname)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for stationary and duplicate frame selection.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 18:48:20 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 18:48:20 2026'
+__version__ = '0.1'
+
+import sys
+sys.path.append("..") # Access modules that are one level up
+from numpy import random, uint8, clip, roll
+from frameselect import (FrameSelector, Signature, gps_distance, KEEP,
+                         STATIONARY, DUPLICATE)
+
+
+
+def scene(shift, noise, seed):
+    '''Grey image of a random scene moved *shift* pixels, with sensor noise.'''
+    rand = random.RandomState(seed)
+    base = random.RandomState(0).randint(0, 255, (60, 80))
+    base = base.repeat(8, axis=0).repeat(8, axis=1) # BLOCKY, LIKE REAL EDGES
+    image = roll(base, shift, axis=1) + rand.normal(0, noise, base.shape)
+    return clip(image, 0, 255).astype(uint8)
+
+
+def test_gps_distance():
+    # ONE THOUSANDTH OF A DEGREE OF LATITUDE IS ABOUT 111 METERS
+    assert abs(gps_distance(24.5, 121.5, 24.501, 121.5) - 111.19) < 0.1
+    assert gps_distance(24.5, 121.5, 24.5, 121.5) == 0
+
+
+def test_signature():
+    a, b = Signature(scene(0, 2, 1)), Signature(scene(0, 2, 2))
+    bits, mad = a.difference(b)
+    assert bits <= 6 and mad < 3
+    bits, mad = a.difference(Signature(scene(120, 2, 3)))
+    assert bits > 6 and mad > 3
+
+
+def test_select():
+    # MOVING, STOPPED AT A LIGHT (NOISE ONLY), REPEATED FRAME, MOVING AGAIN
+    shifts = [0, 40, 80, 80, 80, 80, 80, 120, 160]
+    noise = [2, 2, 2, 2, 2, 2, 0, 2, 2]
+    images = {}
+    for frame, (shift, n) in enumerate(zip(shifts, noise)):
+        images[frame] = scene(shift, n, frame)
+    images[6] = images[5] # REPEATED
+    lat = [24.5 + 1e-4 * s / 40 for s in shifts]
+    lon = [121.5] * len(shifts)
+    frames = range(len(shifts))
+    read = []
+    def image(frame):
+        read.append(frame)
+        return images[frame]
+
+    selector = FrameSelector()
+    status = selector.select(frames, lat, lon, image=image)
+    assert list(status) == [KEEP, KEEP, KEEP, STATIONARY, STATIONARY,
+                            STATIONARY, DUPLICATE, KEEP, KEEP]
+    # MOVING FRAMES ARE KEPT WITHOUT READING THE IMAGES
+    assert sorted(set(read)) == [2, 3, 4, 5, 6]
+    assert selector.images_read == len(read)
+
+    # NO GPS FIX: THE IMAGES DECIDE
+    keep = FrameSelector().keep_list(frames, [0]*9, [0]*9, image=image)
+    assert keep == [0, 1, 2, 7, 8]
+    # GPS ONLY
+    keep = FrameSelector().keep_list(frames, lat, lon)
+    assert keep == [0, 1, 2, 7, 8]
+    keep = FrameSelector(max_gap=3).keep_list(frames, lat, lon)
+    assert keep == [0, 1, 2, 5, 7, 8]
@@ -0,0 +1,247 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for descriptor matching with cached FLANN indexes.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 20:24:47 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 20:24:47 2026'
+__version__ = '0.1'
+
+import sys
+import time
+import threading
+sys.path.append("..") # Access modules that are one level up
+from numpy import (random, float32, arange, r_, array, where, append, zeros,
+                   uint8, unpackbits)
+from opticflow import (DescriptorSet, flann_matcher, sum_timings,
+                       extend_matchset, chain_tracks, RigMatcher, hamming_knn,
+                       POPCOUNT)
+
+
+
+def descriptor_sets(n=200, extra=50, seed=0):
+    '''Set 2 has the descriptors of set 1 shuffled, with noise, and extra
+    unrelated descriptors. Returns the sets and the true index in set 2 of
+    each descriptor of set 1.'''
+    rand = random.RandomState(seed)
+    desc1 = rand.rand(n, 64).astype(float32)
+    order = rand.permutation(n + extra)
+    desc2 = r_[desc1 + rand.normal(0, 0.01, desc1.shape),
+               rand.rand(extra, 64)].astype(float32)[order.argsort()]
+    return desc1, desc2, order.argsort().argsort()[:n]
+
+
+def test_match():
+    desc1, desc2, truth = descriptor_sets()
+    set1, set2 = DescriptorSet(desc1), DescriptorSet(desc2)
+    matches = set1.match(set2, threshold=0.6)
+    assert matches.shape[0] == 2 and matches.shape[1] > 190
+    assert (matches[1] == truth[matches[0]]).all()
+    assert (flann_matcher(desc1, desc2) == matches).all()
+
+    # THE INDEX OF SET 2 IS BUILT ONCE FOR MANY QUERIES
+    flann = set2.index()
+    others = [DescriptorSet(desc1[i::3]) for i in range(3)]
+    for other in others:
+        other.match(set2)
+    assert set2.index() is flann
+    assert set2.queries == len(desc1) * 2
+    assert all(other.flann is None for other in others)
+
+    # MUTUAL MODE BUILDS THE INDEX OF SET 1 ONCE AND REUSES BOTH
+    mutual = set1.match(set2, mutual=True)
+    assert (mutual[1] == truth[mutual[0]]).all()
+    assert set(mutual[0]) <= set(matches[0])
+    flann1 = set1.flann
+    set1.match(set2, mutual=True)
+    assert set1.flann is flann1 and set2.index() is flann
+
+    timings = sum_timings([set1, set2] + others)
+    assert timings['indexes'] == 2
+    assert timings['build'] > 0 and timings['query'] > 0
+
+
+def test_empty():
+    set1 = DescriptorSet(None)
+    set2 = DescriptorSet(random.rand(1, 64))
+    assert set1.match(set2).shape == (2, 0)
+    assert set2.match(set2).shape == (2, 0)
+
+
+
+def random_pairs(nframes, n, keys, seed=0):
+    '''Pairwise matches with unique indices per row, like flann_matcher.'''
+    rand = random.RandomState(seed)
+    return [array([rand.permutation(keys)[:n], rand.permutation(keys)[:n]])
+            for k in range(nframes - 1)]
+
+
+def chain_reference(pairs):
+    '''Tracks from a dict walk over the pairs.'''
+    ends = {} # KEY POINT IN THE LAST IMAGE: TRACK
+    tracks = []
+    for k, (a, b) in enumerate(pairs):
+        new_ends = {}
+        for i, j in zip(a, b):
+            track = ends.get(i)
+            if track is None:
+                track = {k: i}
+                tracks.append(track)
+            track[k+1] = j
+            new_ends.setdefault(j, track)
+        ends = new_ends
+    return sorted(tuple(t.get(k, -1) for k in range(len(pairs) + 1)) for t in tracks)
+
+
+def extend_matchset_loop(match1, match2):
+    '''The original loop version of extend_matchset.'''
+    len2 = len(match2)
+    M = append(array(match1, int), zeros((len2-1,len(match1[0])),int)-1, 0)
+    B1 = M[-len2]
+    B2 = match2[0]
+    for b1 in B1:
+        if b1 in B2:
+            M[-len2+1:,where(B1 == b1)] = match2[1:,where(B2 == b1)]
+    return M[:,M[-1] != -1].copy()
+
+
+def test_chain_tracks():
+    pairs = random_pairs(6, 300, 400)
+    tracks = chain_tracks(pairs)
+    assert tracks.shape[0] == 6
+    assert sorted(map(tuple, tracks.T)) == chain_reference(pairs)
+    # EVERY PAIR IS IN A TRACK
+    for k, (a, b) in enumerate(pairs):
+        both = (tracks[k] >= 0) & (tracks[k+1] >= 0)
+        assert set(zip(tracks[k][both], tracks[k+1][both])) == set(zip(a, b))
+    assert ((tracks >= 0).sum(0) >= 4).sum() == chain_tracks(pairs, 4).shape[1]
+    assert chain_tracks([]).shape == (1, 0)
+
+    # THREE IMAGES: SAME AS extend_matchset, SAME AS THE LOOP VERSION
+    full = tracks[:3, (tracks[:3] >= 0).all(0)]
+    triplets = extend_matchset(pairs[0], pairs[1])
+    assert sorted(map(tuple, full.T)) == sorted(map(tuple, triplets.T))
+    assert (triplets == extend_matchset_loop(pairs[0], pairs[1])).all()
+
+
+def test_chain_large():
+    # 10k MATCHES PER PAIR
+    pairs = random_pairs(10, 10000, 12000)
+    tracks = chain_tracks(pairs)
+    triplets = extend_matchset(pairs[0], pairs[1])
+    assert tracks.shape[0] == 10 and len(triplets) == 3
+    assert (tracks >= -1).all() and ((tracks >= 0).sum(0) >= 2).all()
+
+
+
+class SleepyMatcher:
+    '''Stands in for a FeatureMatcher. add() takes 20 ms and returns the
+    camera and frame.'''
+    def __init__(self):
+        self.threads = set()
+        self.added = []
+
+    def add(self, image, frame=None, cam=None, threshold=0.5):
+        if callable(image):
+            image = image()
+        self.threads.add( threading.current_thread() )
+        time.sleep(0.02)
+        self.added.append( (frame, image) )
+        return cam, frame
+
+    def timings(self):
+        return dict(build=0., query=0., queries=0, indexes=0)
+
+
+def test_rig_matcher():
+    matchers = [SleepyMatcher() for i in range(5)]
+    reads = []
+    def reader(cam):
+        def image():
+            reads.append(cam)
+            return cam * 10
+        return image
+    with RigMatcher(matchers) as rig:
+        for frame in range(3):
+            results = rig.add([reader(cam) for cam in range(5)], frame=frame,
+                              threshold=0.4)
+            assert results == [(cam, frame) for cam in range(5)]
+        # PARTIAL RIG, CAMERA ORDER OF *cameras*
+        assert rig.add([7, 8], frame=3, cameras=[4, 1]) == [(4, 3), (1, 3)]
+    assert sorted(reads) == sorted(range(5) * 3)
+    assert matchers[1].added[-1] == (3, 8)
+    assert matchers[2].added == [(0, 20), (1, 20), (2, 20)]
+    assert len(set.union(*[m.threads for m in matchers])) > 1
+    timing = rig.timings()
+    assert timing[4]['count'] == 4 and timing[0]['count'] == 3
+    assert timing[0]['mean'] >= 0.02
+    assert timing['frames']['count'] == 4 and timing['frames']['workers'] == 5
+    assert rig.executor is None
+
+
+
+def binary_sets(n=300, extra=100, flips=8, seed=0):
+    '''Binary (32 byte) version of descriptor_sets. Each set 2 copy has
+    *flips* random bits flipped.'''
+    rand = random.RandomState(seed)
+    desc1 = rand.randint(0, 256, (n, 32)).astype(uint8)
+    noisy = desc1.copy()
+    for row in noisy:
+        bits = rand.choice(256, flips, replace=False)
+        row[bits // 8] ^= (1 << (bits % 8)).astype(uint8)
+    order = rand.permutation(n + extra)
+    desc2 = r_[noisy, rand.randint(0, 256, (extra, 32)).astype(uint8)][order.argsort()]
+    return desc1, desc2, order.argsort().argsort()[:n]
+
+
+def test_hamming_knn():
+    rand = random.RandomState(1)
+    query = rand.randint(0, 256, (40, 8)).astype(uint8)
+    train = rand.randint(0, 256, (25, 8)).astype(uint8)
+    bits = unpackbits(query[:,None,:] ^ train[None,:,:], axis=2).sum(2)
+    # SMALL BLOCKS TO CHECK THE CHUNKING
+    idx, dist = hamming_knn(query, train, 3, chunk_bytes=100)
+    assert (dist == bits[arange(40)[:,None], idx]).all()
+    assert (dist[:,0] == bits.min(1)).all()
+    assert (dist[:,:-1] <= dist[:,1:]).all()
+    assert POPCOUNT[255] == 8 and POPCOUNT[0x81] == 2
+    idx, dist = hamming_knn(query, train[:1], 2)
+    assert (idx[:,0] == 0).all() and (idx[:,1] == -1).all()
+
+
+def test_binary_matching():
+    desc1, desc2, truth = binary_sets()
+    set1, set2 = DescriptorSet(desc1), DescriptorSet(desc2)
+    assert set1.binary and set1.desc.dtype == uint8
+    matches = set1.match(set2, 0.6)
+    assert matches.shape[1] > 0.95 * len(desc1)
+    assert (truth[matches[0]] == matches[1]).all()
+    assert set2.flann is None and set2.timings()['brute'] == len(desc1)
+
+    # LSH INDEX FOR LARGER SETS
+    lsh1, lsh2 = DescriptorSet(desc1, brute_force=0), DescriptorSet(desc2, brute_force=0)
+    matches = lsh1.match(lsh2, 0.6, mutual=True)
+    assert lsh2.flann is not None and lsh1.flann is not None
+    assert matches.shape[1] > 0.8 * len(desc1)
+    assert (truth[matches[0]] == matches[1]).all()
+    assert sum_timings([lsh1, lsh2])['brute'] == 0
+
+    # FLOAT AND BINARY SETS DO NOT MATCH
+    try:
+        set1.match(DescriptorSet(desc2.astype(float32)))
+    except AssertionError:
+        pass
+    else:
+        assert False, 'mixed descriptor types must fail'
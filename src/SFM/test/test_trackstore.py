@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the feature track store.
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 20:51:09 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 20:51:09 2026'
+__version__ = '0.1'
+
+import sys
+sys.path.append("..") # Access modules that are one level up
+from numpy import arange, array, isnan, c_
+from trackstore import TrackStore
+
+
+
+def keys(frame, n=6):
+    '''Key point n of a frame is at (100 * frame + n, n).'''
+    return c_[100. * frame + arange(n), arange(n)]
+
+
+def test_persistent_ids():
+    tracks = TrackStore(capacity=4)
+    ids1 = tracks.add_pair(0, 10, keys(10), 11, keys(11), [[0, 1, 2], [1, 2, 3]])
+    # KEY 1 OF FRAME 11 CONTINUES, KEY 5 STARTS A NEW TRACK
+    ids2 = tracks.add_pair(0, 11, keys(11), 12, keys(12), [[1, 5], [0, 4]])
+    ids3 = tracks.add_pair(0, 12, keys(12), 13, keys(13), [[0, 4], [2, 2]])
+    assert list(ids1) == [0, 1, 2]
+    assert list(ids2) == [0, 3]
+    assert list(ids3) == [0, 3] # BOTH MATCH KEY 2, EACH TRACK STILL CONTINUES
+    track = tracks.track(0)
+    assert list(track['frame']) == [10, 11, 12, 13]
+    assert list(track['key']) == [0, 1, 0, 2]
+    assert list(track['x']) == [1000, 1101, 1200, 1302]
+    info = tracks.info([0, 3])
+    assert list(info['length']) == [4, 3] and list(info['first']) == [10, 11]
+    assert tracks.stats()['capacity'] >= tracks.stats()['observations'] == 11
+
+
+def test_cameras_and_windows():
+    tracks = TrackStore()
+    tracks.add_pair(1, 20, keys(20), 21, keys(21), [[0, 1], [0, 1]])
+    tracks.add_pair(1, 21, keys(21), 22, keys(22), [[0], [0]])
+    # ANOTHER CAMERA ADDED LATER, WITH OLDER FRAMES
+    tracks.add_pair(3, 20, keys(20), 21, keys(21), [[4], [5]])
+    # NOT THE LAST IMAGE OF CAMERA 1, NEW TRACKS
+    ids = tracks.add_pair(1, 20, keys(20), 22, keys(22), [[0], [3]])
+    assert list(ids) == [3]
+    window = tracks.window(21, 22)
+    assert list(window['frame']) == sorted(window['frame'])
+    assert len(window['frame']) == 5
+    assert list(tracks.window(20, 20, cams=[3])['key']) == [4]
+    assert list(tracks.track_ids(20, 22, cams=[1], min_frames=3)) == [0]
+    assert list(tracks.track_ids(20, 21)) == [0, 1, 2, 3]
+
+    ids, xy = tracks.positions([20, 22], 1)
+    assert list(ids) == [0, 3]
+    assert xy.shape == (2, 2, 2)
+    assert list(xy[1, 0]) == [2200, 0] and list(xy[1, 1]) == [2203, 3]
+    ids, xy = tracks.positions([21, 22], 1, min_frames=1)
+    assert list(ids) == [0, 1, 3]
+    assert isnan(xy[1, 1]).all() and isnan(xy[0, 2]).all()
+
+
+def test_end_and_prune():
+    tracks = TrackStore(capacity=8, max_gap=1)
+    for frame in range(30):
+        # KEY 0 IS TRACKED THROUGH ALL FRAMES, KEY 1 ONLY OVER ONE PAIR
+        tracks.add_pair(2, frame, keys(frame), frame + 1, keys(frame + 1),
+                        [[0, 1], [0, 2]])
+        assert tracks.end_tracks(frame + 1) == (frame > 0)
+        tracks.prune(before=frame - 3)
+    stats = tracks.stats()
+    assert stats['next_id'] == 31
+    # THE LONG TRACK AND THE SHORT TRACKS OF THE LAST FIVE FRAMES
+    assert stats['tracks'] == 6 and stats['ended'] == 4
+    assert stats['observations'] == 31 + 10
+    assert tracks.info([0])['length'][0] == 31
+    assert list(tracks.track(30)['frame']) == [29, 30]
+    # THE LAST SHORT TRACK IS NOT ENDED YET AND CAN CONTINUE
+    ids = tracks.add_pair(2, 30, keys(30), 31, keys(31), [[0, 2], [0, 1]])
+    assert list(ids) == [0, 30]
+    assert list(tracks.track(30)['frame']) == [29, 30, 31]
+    assert tracks.prune() == 4
+    assert list(tracks.track_ids(0, 31)) == [0, 30]
+    assert tracks.info([30])['length'][0] == 3
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Feature tracks through many frames and camera units.
+
+TrackStore gives every feature track a persistent ID. Observations are kept
+as a struct of arrays, one preallocated array per column that doubles in
+size when full:
+
+    track       --- track ID.
+    frame, cam  --- frame number and camera unit of the image.
+    key         --- index of the key point in the image's key and descriptor
+                    arrays (descriptors are in the FeatureStore, see
+                    featurestore.py, under (frame, cam)).
+    x, y        --- key point position.
+
+Tracks have their own columns (id, cam, first, last, length, ended).
+Observations are kept sorted by frame (sorted again when needed after images
+are added out of order), so frame windows are found with searchsorted.
+Tracks that are no longer extended are ended and can be pruned, which keeps
+the arrays at the size of the recent frames.
+
+    tracks = TrackStore()
+    tracks.add_pair(cam, frame1, keys1, frame2, keys2, matches)
+    seen = tracks.window(k-2, k)              # COLUMNS OF THE OBSERVATIONS
+    ids, xy = tracks.positions(range(k-2, k+1), cam)
+
+:REQUIRES: numpy
+
+:AUTHOR: Ripley6811
+:ORGANIZATION: National Cheng Kung University, Department of Earth Sciences
+:CONTACT: python@boun.cr
+:SINCE: Sun Oct 18 20:51:09 2026
+:VERSION: 0.1
+"""
+#===============================================================================
+# PROGRAM METADATA
+#===============================================================================
+__author__ = 'Ripley6811'
+__contact__ = 'python@boun.cr'
+__copyright__ = ''
+__license__ = ''
+__date__ = 'Sun Oct 18 20:51:09 2026'
+__version__ = '0.1'
+
+#===============================================================================
+# IMPORT STATEMENTS
+#===============================================================================
+from numpy import (array, asarray, empty, full, zeros, arange, searchsorted,
+                   argsort, minimum, unique, where, ndim, nan, float32, int64)
+
+OBSERVATION_COLUMNS = [('track', 'i8'), ('frame', 'i4'), ('cam', 'i1'),
+                       ('key', 'i4'), ('x', 'f4'), ('y', 'f4')]
+TRACK_COLUMNS = [('id', 'i8'), ('cam', 'i1'), ('first', 'i4'), ('last', 'i4'),
+                 ('length', 'i4'), ('ended', '?')]
+
+
+
+class Columns:
+    '''Named growable arrays of equal length.
+
+    :PARAMETERS:
+        *dtypes* --- List of (name, dtype).
+        **capacity** --- Initial number of rows.
+    '''
+    def __init__(self, dtypes, capacity=1024):
+        self.dtypes = dtypes
+        self.n = 0
+        self.data = dict((name, empty(capacity, dtype)) for name, dtype in dtypes)
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, name):
+        '''View of the used rows of one column.'''
+        return self.data[name][:self.n]
+
+    def capacity(self):
+        return len(self.data[self.dtypes[0][0]])
+
+
+    def append(self, **columns):
+        '''Add rows. Columns are arrays of one length (or scalars).'''
+        m = max([len(v) for v in columns.values() if ndim(v)] or [1])
+        if not m:
+            return arange(self.n, self.n)
+        if self.n + m > self.capacity():
+            size = max(2 * self.capacity(), self.n + m)
+            for name, dtype in self.dtypes:
+                grown = empty(size, dtype)
+                grown[:self.n] = self.data[name][:self.n]
+                self.data[name] = grown
+        for name, dtype in self.dtypes:
+            self.data[name][self.n:self.n+m] = columns[name]
+        self.n += m
+        return arange(self.n - m, self.n)
+
+
+    def keep(self, mask):
+        '''Drop the rows where *mask* is False. Row order is kept.'''
+        index = where(mask)[0]
+        for name, dtype in self.dtypes:
+            self.data[name][:len(index)] = self.data[name][index]
+        self.n = len(index)
+
+
+    def table(self, rows=slice(None)):
+        '''Dict of column copies of *rows*.'''
+        return dict((name, self[name][rows].copy()) for name, dtype in self.dtypes)
+
+
+
+class TrackStore:
+    '''Tracks of key points with persistent IDs.
+
+    :PARAMETERS:
+        **capacity** --- Initial number of observations.
+        **max_gap** --- Frames a track may be unseen before end_tracks() ends it.
+    '''
+    def __init__(self, capacity=4096, max_gap=1):
+        self.obs = Columns(OBSERVATION_COLUMNS, capacity)
+        self.tracks = Columns(TRACK_COLUMNS, capacity // 2)
+        self.max_gap = max_gap
+        self.next_id = 0
+        self.unsorted = False # OBSERVATIONS NOT IN FRAME ORDER
+        # TRACK ID OF EACH KEY OF THE LAST IMAGE OF EACH CAMERA: cam: (frame, ids)
+        self.latest = {}
+
+    def __len__(self):
+        return len(self.tracks)
+
+
+    def add_pair(self, cam, frame1, keys1, frame2, keys2, matches):
+        '''Add the matches of two images of one camera.
+
+        Matched key points of image 1 on a track that is not ended continue
+        it, if image 1 is the last image added for the camera. Other matches
+        start new tracks.
+
+        :PARAMETERS:
+            *cam* --- Camera unit.
+            *frame1*, *frame2* --- Frame numbers of the images.
+            *keys1*, *keys2* --- N by 2 key point positions of the images.
+            *matches* --- 2 by N indices into keys1 and keys2.
+
+        :RETURNS:
+            Track ID of each match.
+        '''
+        a, b = [asarray(row, int) for row in asarray(matches).reshape(2, -1)]
+        keys1, keys2 = asarray(keys1), asarray(keys2)
+        ids = full(len(a), -1, int64)
+        last = self.latest.get(cam)
+        if last is not None and last[0] == frame1:
+            ids = last[1][a]
+            ids[~self._alive(ids)] = -1
+        # A TRACK CONTINUES ONCE (TWO MATCHES MAY SHARE AN IMAGE 1 KEY POINT)
+        continued = ids >= 0
+        seen = unique(ids[continued], return_index=True)[1]
+        first_use = zeros(len(a), bool)
+        first_use[where(continued)[0][seen]] = True
+        ids[~first_use] = -1
+
+        # NEW TRACKS START WITH THEIR IMAGE 1 OBSERVATION
+        new = ids < 0
+        m = int(new.sum())
+        ids[new] = arange(self.next_id, self.next_id + m)
+        self.next_id += m
+        self.tracks.append(id=ids[new], cam=cam, first=frame1, last=frame1,
+                           length=0, ended=False) # COUNTED BY _observe
+        self._observe(ids[new], frame1, cam, a[new], keys1[a[new]])
+        self._observe(ids, frame2, cam, b, keys2[b])
+
+        track_of_key = full(len(keys2), -1, int64)
+        track_of_key[b] = ids
+        self.latest[cam] = (frame2, track_of_key)
+        return ids
+
+
+    def end_tracks(self, frame):
+        '''End the tracks not seen in the max_gap frames up to *frame*.'''
+        ended = (self.tracks['last'] <= frame - self.max_gap) & ~self.tracks['ended']
+        self.tracks['ended'][ended] = True
+        return int(ended.sum())
+
+
+    def prune(self, before=None):
+        '''Remove the ended tracks last seen before frame *before* (all
+        ended tracks if None), and their observations.'''
+        drop = self.tracks['ended'].copy()
+        if before is not None:
+            drop &= self.tracks['last'] < before
+        dropped = self.tracks['id'][drop]
+        if not len(dropped):
+            return 0
+        self.tracks.keep(~drop)
+        rows = minimum(searchsorted(dropped, self.obs['track']), len(dropped) - 1)
+        self.obs.keep(dropped[rows] != self.obs['track'])
+        return len(dropped)
+
+
+    def window(self, first, last, cams=None):
+        '''Columns (dict of arrays) of the observations in frames *first* to
+        *last* (inclusive) of camera units *cams* (all if None).'''
+        if self.unsorted:
+            self._sort()
+        frames = self.obs['frame']
+        rows = slice(searchsorted(frames, first, 'left'),
+                     searchsorted(frames, last, 'right'))
+        table = self.obs.table(rows)
+        if cams is not None:
+            mask = zeros(len(table['cam']), bool)
+            for cam in cams:
+                mask |= table['cam'] == cam
+            table = dict((name, col[mask]) for name, col in table.items())
+        return table
+
+
+    def track_ids(self, first, last, cams=None, min_frames=1):
+        '''IDs of the tracks seen in at least *min_frames* frames of the
+        window (see window).'''
+        ids, counts = unique(self.window(first, last, cams)['track'],
+                             return_counts=True)
+        return ids[counts >= min_frames]
+
+
+    def track(self, tid):
+        '''Observation columns of one track.'''
+        return self.obs.table(self.obs['track'] == tid)
+
+
+    def info(self, ids):
+        '''Track columns (dict of arrays) of the tracks with IDs *ids*.'''
+        rows = searchsorted(self.tracks['id'], ids)
+        return dict((name, self.tracks[name][rows].copy())
+                    for name, dtype in TRACK_COLUMNS)
+
+
+    def positions(self, frames, cam, min_frames=2):
+        '''Key point positions of one camera's tracks in *frames*, for
+        triangulation and SLAM.
+
+        :PARAMETERS:
+            *frames* --- Frame numbers in increasing order.
+            **min_frames** --- Minimum number of *frames* a track is seen in.
+
+        :RETURNS:
+            (ids, xy) where xy is a (len(frames), len(ids), 2) float32 array,
+            NaN where the track is not seen.
+        '''
+        frames = array(frames)
+        table = self.window(frames[0], frames[-1], [cam])
+        row = minimum(searchsorted(frames, table['frame']), len(frames) - 1)
+        listed = frames[row] == table['frame']
+        ids, counts = unique(table['track'][listed], return_counts=True)
+        ids = ids[counts >= min_frames]
+        xy = full((len(frames), len(ids), 2), nan, float32)
+        if not len(ids):
+            return ids, xy
+        col = minimum(searchsorted(ids, table['track']), len(ids) - 1)
+        inside = listed & (ids[col] == table['track'])
+        xy[row[inside], col[inside], 0] = table['x'][inside]
+        xy[row[inside], col[inside], 1] = table['y'][inside]
+        return ids, xy
+
+
+    def stats(self):
+        return dict(tracks=len(self.tracks), observations=len(self.obs),
+                    ended=int(self.tracks['ended'].sum()),
+                    capacity=self.obs.capacity(), next_id=self.next_id)
+
+
+    def _observe(self, ids, frame, cam, key, xy):
+        if not len(ids):
+            return
+        if len(self.obs) and frame < self.obs['frame'][-1]:
+            self.unsorted = True
+        self.obs.append(track=ids, frame=frame, cam=cam, key=key,
+                        x=xy[:,0], y=xy[:,1])
+        rows = searchsorted(self.tracks['id'], ids)
+        self.tracks['last'][rows] = frame
+        self.tracks['length'][rows] += 1
+
+
+    def _alive(self, ids):
+        '''Mask of the IDs of tracks that are stored and not ended.'''
+        known = self.tracks['id']
+        if not len(known):
+            return zeros(len(ids), bool)
+        rows = minimum(searchsorted(known, ids), len(known) - 1)
+        return (known[rows] == ids) & ~self.tracks['ended'][rows]
+
+
+    def _sort(self):
+        order = argsort(self.obs['frame'], kind='mergesort')
+        for name, dtype in OBSERVATION_COLUMNS:
+            self.obs.data[name][:len(self.obs)] = self.obs[name][order]
+        self.unsorted = False